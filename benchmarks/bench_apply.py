@@ -0,0 +1,84 @@
+""" Measure how many row events per second SpacetimeDBClient._do_update applies.
+
+Frames are decoded up front so only the cache apply and callback dispatch are timed.
+
+Scenarios:
+    subscription : one SubscriptionUpdate inserting User and Message rows
+    inserts      : TransactionUpdates each inserting a Message row
+    updates      : TransactionUpdates each replacing a User row (primary key update)
+
+Usage:
+    python benchmarks/bench_apply.py [--rows N]
+"""
+
+import argparse
+import time
+
+import common
+from spacetimedb_sdk.spacetimedb_client import SpacetimeDBClient
+
+
+def user_update_frames(count, user_count):
+    frames = []
+    for index in range(count):
+        user_index = index % user_count
+        old_row = common.user_row(user_index, f"user {user_index}", online=index // user_count % 2 == 0)
+        new_row = common.user_row(user_index, f"user {user_index}", online=index // user_count % 2 == 1)
+        frames.append(
+            common.transaction_update_frame(
+                {
+                    "User": [
+                        common.row_operation("delete", old_row),
+                        common.row_operation("insert", new_row),
+                    ]
+                },
+                reducer="set_name",
+            )
+        )
+    return frames
+
+
+def measure(frames, user_count, with_callbacks):
+    client = SpacetimeDBClient(common.module_bindings)
+    if with_callbacks:
+        client._register_row_update("User", lambda *args: None)
+        client._register_row_update("Message", lambda *args: None)
+
+    # the User rows the update scenario replaces
+    client._on_message(common.subscription_update_frame(user_count, 0))
+    client.update()
+
+    messages = [client._decode_message(frame) for frame in frames]
+    event_count = sum(
+        len(table_events) for message in messages for table_events in message.events.values()
+    )
+    for message in messages:
+        client.message_queue.put(message)
+
+    start = time.perf_counter()
+    client.update()
+    return event_count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    user_count = 1000
+    transaction_count = max(args.rows // 10, 1)
+    scenarios = {
+        "subscription": [common.subscription_update_frame(args.rows // 10, args.rows)],
+        "inserts": common.send_message_frames(transaction_count, start=args.rows),
+        "updates": user_update_frames(transaction_count, user_count),
+    }
+
+    print(f"{'scenario':<13} {'events/s':>10} {'events/s with callbacks':>24}")
+    for name, frames in scenarios.items():
+        plain = measure(frames, user_count, False)
+        with_callbacks = measure(frames, user_count, True)
+        print(f"{name:<13} {plain:>10.0f} {with_callbacks:>24.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+""" Measure how long a decoded message waits before SpacetimeDBAsyncClient applies it.
+
+A background thread plays the role of the websocket decode worker and queues one
+TransactionUpdate at a time. The latency is the time from queueing the message to the
+Message row update callback firing on the event loop.
+
+Two designs are compared:
+    polling : the previous design, client.update() every 100 ms from a periodic task
+    wakeup  : the current design, the decode thread wakes the loop with call_soon_threadsafe
+
+Usage:
+    python benchmarks/bench_async_latency.py [--messages N]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import threading
+import time
+
+import common
+from module_bindings.message import Message
+from spacetimedb_sdk.spacetimedb_async_client import SpacetimeDBAsyncClient
+
+
+def producer(client, frames, sent_times, stop_event):
+    for index, frame in enumerate(frames):
+        if stop_event.is_set():
+            return
+        time.sleep(random.uniform(0.001, 0.02))
+        decoded = client._decode_message(frame)
+        sent_times[index] = time.perf_counter()
+        client._enqueue_message(decoded)
+
+
+async def measure(mode, message_count):
+    async_client = SpacetimeDBAsyncClient(common.module_bindings)
+    async_client._on_async_loop_start()
+    client = async_client.client
+
+    frames = common.send_message_frames(message_count)
+    sent_times = [0.0] * message_count
+    latencies = []
+    done = asyncio.Event()
+
+    def on_row_update(row_op, old_row, new_row, reducer_event):
+        index = new_row.sent - 1_700_000_000_000_000
+        latencies.append(time.perf_counter() - sent_times[index])
+        if len(latencies) == message_count:
+            done.set()
+
+    Message.register_row_update(on_row_update)
+
+    if mode == "polling":
+        # the design before the wakeup hook: update on a 100 ms timer
+        client._on_message_queued = None
+
+        async def periodic_update():
+            while True:
+                client.update()
+                await asyncio.sleep(0.1)
+
+        poll_task = asyncio.create_task(periodic_update())
+    else:
+        poll_task = None
+
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=producer, args=(client, frames, sent_times, stop_event)
+    )
+    thread.start()
+    try:
+        await asyncio.wait_for(done.wait(), timeout=message_count)
+    finally:
+        stop_event.set()
+        thread.join()
+        if poll_task is not None:
+            poll_task.cancel()
+
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} {'mean (ms)':>10} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    for mode in ("polling", "wakeup"):
+        latencies = sorted(asyncio.run(measure(mode, args.messages)))
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(
+            f"{mode:<8} {statistics.mean(latencies) * 1000:>10.2f} "
+            f"{statistics.median(latencies) * 1000:>9.2f} {p99 * 1000:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+""" Compare how long single update() calls block while a large SubscriptionUpdate is applied.
+
+Without a budget the whole update is applied by one call. With --budget-ms it is applied in steps
+over many calls, as a game loop calling update(max_seconds=...) once per frame would.
+
+Usage:
+    python benchmarks/bench_budgeted_update.py [--rows N] [--budget-ms MS]
+"""
+
+import argparse
+import statistics
+import time
+
+import common
+from spacetimedb_sdk.spacetimedb_client import SpacetimeDBClient
+
+
+def measure(frame, max_seconds):
+    client = SpacetimeDBClient(common.module_bindings)
+    client._on_message(frame)
+
+    stalls = []
+    start = time.perf_counter()
+    while client.has_pending_updates():
+        call_start = time.perf_counter()
+        client.update(max_seconds=max_seconds)
+        stalls.append(time.perf_counter() - call_start)
+    return time.perf_counter() - start, sorted(stalls)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--budget-ms", type=float, default=4.0)
+    args = parser.parse_args()
+
+    frame = common.subscription_update_frame(args.rows // 10, args.rows)
+
+    print(f"{'mode':<16} {'calls':>6} {'total (ms)':>11} {'p50 (ms)':>9} {'p99 (ms)':>9} {'max (ms)':>9}")
+    for label, max_seconds in [
+        ("unbudgeted", None),
+        (f"{args.budget_ms:g} ms budget", args.budget_ms / 1000),
+    ]:
+        total, stalls = measure(frame, max_seconds)
+        print(
+            f"{label:<16} {len(stalls):>6} {total * 1000:>11.1f}"
+            f" {statistics.median(stalls) * 1000:>9.2f}"
+            f" {stalls[int(len(stalls) * 0.99) - 1 if len(stalls) > 1 else 0] * 1000:>9.2f}"
+            f" {stalls[-1] * 1000:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+""" Compare row update callbacks doing blocking I/O with async ChangeStream consumers.
+
+Queues --transactions TransactionUpdates that rename --users users, as the websocket decode
+thread would, and processes every row change with --io seconds of simulated I/O:
+
+    callback : a row update callback that sleeps, blocking the event loop inside update()
+    block    : an async for consumer of a "block" ChangeStream that awaits the I/O
+    coalesce : the same consumer on a "coalesce" ChangeStream
+
+A 1 ms heartbeat scheduled with schedule_every measures how long the event loop was unable to
+run other tasks. Reports the wall time, the changes the consumer handled and the worst loop lag.
+
+Usage:
+    python benchmarks/bench_change_stream.py [--transactions N] [--users N] [--io SECONDS] [--maxsize N]
+"""
+
+import argparse
+import asyncio
+import time
+
+import common
+from module_bindings.user import User
+from spacetimedb_sdk.spacetimedb_async_client import SpacetimeDBAsyncClient
+
+
+def rename_frames(transaction_count, user_count):
+    frames = []
+    for index in range(transaction_count):
+        user = index % user_count
+        generation = index // user_count
+        frames.append(
+            common.transaction_update_frame(
+                {
+                    "User": [
+                        common.row_operation(
+                            "delete", common.user_row(user, f"user {user} {generation}")
+                        ),
+                        common.row_operation(
+                            "insert", common.user_row(user, f"user {user} {generation + 1}")
+                        ),
+                    ]
+                },
+                reducer="set_name",
+            )
+        )
+    return frames
+
+
+async def run(mode, frames, user_count, io_seconds, maxsize):
+    client = SpacetimeDBAsyncClient(common.module_bindings)
+    client._on_async_loop_start()
+    loop = client.loop
+
+    # seed the cache with generation 0 of every user
+    seed = common.transaction_update_frame(
+        {
+            "User": [
+                common.row_operation("insert", common.user_row(i, f"user {i} 0"))
+                for i in range(user_count)
+            ]
+        }
+    )
+    client.client._enqueue_message(client.client._decode_message(seed))
+    await asyncio.sleep(0.01)
+
+    max_lag = 0.0
+    last_beat = loop.time()
+
+    def heartbeat():
+        nonlocal max_lag, last_beat
+        now = loop.time()
+        max_lag = max(max_lag, now - last_beat)
+        last_beat = now
+
+    handled = 0
+    stream = None
+    consumer = None
+    if mode == "callback":
+
+        def on_row_update(row_op, old_value, new_value, reducer_event):
+            nonlocal handled
+            time.sleep(io_seconds)
+            handled += 1
+
+        client.client._register_row_update("User", on_row_update)
+    else:
+        stream = client.changes(User, maxsize=maxsize, policy=mode)
+
+        async def consume():
+            nonlocal handled
+            async for change in stream:
+                await asyncio.sleep(io_seconds)
+                handled += 1
+
+        consumer = asyncio.create_task(consume())
+
+    messages = [client.client._decode_message(frame) for frame in frames]
+    beat = client.schedule_every(0.001, heartbeat)
+    last_beat = loop.time()
+    start = time.perf_counter()
+    for message in messages:
+        client.client._enqueue_message(message)
+    while client.client.has_pending_updates() or (stream is not None and len(stream)):
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    beat.cancel()
+
+    max_depth = 0
+    if stream is not None:
+        max_depth = stream.max_depth
+        stream.close()
+        await consumer
+    return elapsed, handled, max_depth, max_lag
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--transactions", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--io", type=float, default=0.0005, help="Seconds of I/O per row change")
+    parser.add_argument("--maxsize", type=int, default=100)
+    args = parser.parse_args()
+
+    frames = rename_frames(args.transactions, args.users)
+
+    print(f"{'mode':<10} {'time (s)':>9} {'handled':>8} {'max depth':>10} {'max loop lag (ms)':>18}")
+    for mode in ["callback", "block", "coalesce"]:
+        elapsed, handled, max_depth, max_lag = asyncio.run(
+            run(mode, frames, args.users, args.io, args.maxsize)
+        )
+        print(f"{mode:<10} {elapsed:>9.2f} {handled:>8} {max_depth:>10} {max_lag * 1000:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+""" End-to-end benchmarks of the sync and async clients against a local mock server.
+
+Starts benchmarks/mock_server.py in-process, seeded with the requested number of rows, and
+measures for SpacetimeDBClient and SpacetimeDBAsyncClient:
+
+    connect      : from connect() until the IdentityToken has been applied
+    initial load : from sending the subscription until the SubscriptionUpdate has been applied
+    reducer RTT  : send_message round trips, one call at a time
+    sustained    : send_message calls per second with all calls in flight at once
+
+Pass --host to run against a real SpacetimeDB running the quickstart chat module instead.
+
+Usage:
+    python benchmarks/bench_end_to_end.py [--rows N] [--rtt-calls N] [--tps-calls N] [--host HOST --database NAME]
+"""
+
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+
+import common
+import module_bindings.send_message_reducer as send_message_reducer
+from mock_server import MockSpacetimeDB
+from spacetimedb_sdk.spacetimedb_async_client import SpacetimeDBAsyncClient
+from spacetimedb_sdk.spacetimedb_client import SpacetimeDBClient
+
+QUERIES = ["SELECT * FROM User", "SELECT * FROM Message"]
+
+
+class SyncHarness:
+    """
+    Drives a SpacetimeDBClient the way a game loop would, but sleeps until a message is queued instead of polling.
+    """
+
+    def __init__(self):
+        self.client = SpacetimeDBClient(common.module_bindings)
+        self.wakeup = threading.Event()
+        self.client._on_message_queued = self.wakeup.set
+        self.identity_received = False
+        self.subscription_applied = False
+        self.own_events = 0
+
+        self.client.register_on_subscription_applied(self._on_subscription_applied)
+        self.client.register_on_event(self._on_event)
+
+    def _on_subscription_applied(self):
+        self.subscription_applied = True
+
+    def _on_identity(self, auth_token, identity, address):
+        self.identity_received = True
+
+    def _on_event(self, event):
+        if event.reducer_event.caller_identity == self.client.identity:
+            self.own_events += 1
+
+    def pump_until(self, condition, timeout=60):
+        deadline = time.perf_counter() + timeout
+        while not condition():
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or not self.wakeup.wait(remaining):
+                raise TimeoutError("Timed out waiting for the server")
+            self.wakeup.clear()
+            self.client.update()
+
+
+def run_sync(host, database, rtt_calls, tps_calls):
+    harness = SyncHarness()
+    client = harness.client
+    results = {}
+
+    start = time.perf_counter()
+    client.connect(
+        None,
+        host,
+        database,
+        False,
+        None,
+        None,
+        harness._on_identity,
+        lambda error: print(f"[bench] Error, {error}"),
+    )
+    harness.pump_until(lambda: harness.identity_received)
+    results["connect"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    client.subscribe(QUERIES)
+    harness.pump_until(lambda: harness.subscription_applied)
+    results["initial load"] = time.perf_counter() - start
+
+    round_trips = []
+    for index in range(rtt_calls):
+        expected = harness.own_events + 1
+        start = time.perf_counter()
+        send_message_reducer.send_message(f"rtt {index}", client=client)
+        harness.pump_until(lambda: harness.own_events >= expected)
+        round_trips.append(time.perf_counter() - start)
+    results["reducer RTT"] = round_trips
+
+    expected = harness.own_events + tps_calls
+    start = time.perf_counter()
+    for index in range(tps_calls):
+        send_message_reducer.send_message(f"tps {index}", client=client)
+    harness.pump_until(lambda: harness.own_events >= expected)
+    results["sustained"] = tps_calls / (time.perf_counter() - start)
+
+    client.close()
+    return results
+
+
+async def run_async(host, database, rtt_calls, tps_calls):
+    client = SpacetimeDBAsyncClient(common.module_bindings)
+    subscription_applied = asyncio.Event()
+    client.register_on_subscription_applied(subscription_applied.set)
+    results = {}
+
+    start = time.perf_counter()
+    await client.connect(None, host, database, False, QUERIES)
+    connected = time.perf_counter()
+    results["connect"] = connected - start
+
+    # the async client subscribes as soon as the IdentityToken arrives
+    await subscription_applied.wait()
+    results["initial load"] = time.perf_counter() - connected
+
+    round_trips = []
+    for index in range(rtt_calls):
+        start = time.perf_counter()
+        await client.call_reducer("send_message", f"rtt {index}")
+        round_trips.append(time.perf_counter() - start)
+    results["reducer RTT"] = round_trips
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            client.send_reducer("send_message", f"tps {index}", timeout=60)
+            for index in range(tps_calls)
+        )
+    )
+    results["sustained"] = tps_calls / (time.perf_counter() - start)
+
+    await client.close()
+    return results
+
+
+def format_results(results):
+    round_trips = sorted(results["reducer RTT"])
+    return [
+        f"{results['connect'] * 1000:.1f} ms",
+        f"{results['initial load'] * 1000:.1f} ms",
+        f"{statistics.median(round_trips) * 1000:.2f} ms",
+        f"{round_trips[int(len(round_trips) * 0.99) - 1] * 1000:.2f} ms",
+        f"{results['sustained']:.0f} tx/s",
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000, help="Message rows to seed the mock server with")
+    parser.add_argument("--users", type=int, default=1000, help="User rows to seed the mock server with")
+    parser.add_argument("--rtt-calls", type=int, default=200)
+    parser.add_argument("--tps-calls", type=int, default=5000)
+    parser.add_argument("--host", help="host:port of a real SpacetimeDB, skips the mock server")
+    parser.add_argument("--database", default="chat")
+    args = parser.parse_args()
+
+    server = None
+    host = args.host
+    if host is None:
+        server = MockSpacetimeDB(users=args.users, messages=args.rows).start()
+        host = server.host
+
+    try:
+        sync_results = format_results(
+            run_sync(host, args.database, args.rtt_calls, args.tps_calls)
+        )
+        async_results = format_results(
+            asyncio.run(run_async(host, args.database, args.rtt_calls, args.tps_calls))
+        )
+    finally:
+        if server is not None:
+            server.stop()
+
+    labels = ["connect", "initial load", "reducer RTT p50", "reducer RTT p99", "sustained"]
+    print(f"{'':<16} {'sync':>12} {'async':>12}")
+    for label, sync_value, async_value in zip(labels, sync_results, async_results):
+        print(f"{label:<16} {sync_value:>12} {async_value:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+""" Compare the JSON codec backends on SpacetimeDB text frames.
+
+Measures raw parse time and the full SpacetimeDBClient message decode for every installed
+backend (json, ujson, orjson).
+
+Usage:
+    python benchmarks/bench_json_codec.py [--frames FILE] [--rows N] [--transactions N]
+
+    --frames FILE : a traffic recording or newline delimited text frames to use instead of synthetic ones
+"""
+
+import argparse
+
+import common
+from spacetimedb_sdk.json_codec import available_json_codecs, get_json_codec
+from spacetimedb_sdk.spacetimedb_client import SpacetimeDBClient
+
+
+def parse_frames(codec, frames):
+    for frame in frames:
+        codec.loads(frame)
+
+
+class RecordingSocket:
+    """
+    Stands in for the websocket connection and keeps the frames the client sends.
+    """
+
+    is_connected = True
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, data, binary=False):
+        self.sent.append(data)
+
+
+def check_round_trip(client, codec):
+    """
+    Send a reducer call and a subscription with non-ASCII text and parse the frames back.
+    """
+    text = "h\u00e9llo w\u00f6rld \u2713 \U0001f30d"
+    query = f"SELECT * FROM Message WHERE text = '{text}'"
+    socket = RecordingSocket()
+    client.wsc = socket
+    client._reducer_call("send_message", text)
+    client.subscribe([query])
+
+    call, subscribe = (codec.loads(frame.decode("utf-8")) for frame in socket.sent)
+    assert call["call"] == {"fn": "send_message", "args": [text]}, call
+    assert subscribe["subscribe"]["query_strings"] == [query], subscribe
+
+
+def decode_frames(client, frames):
+    for frame in frames:
+        client._on_message(frame)
+    client.message_queue.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", help="traffic recording or newline delimited text frames")
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--transactions", type=int, default=10_000)
+    args = parser.parse_args()
+
+    if args.frames:
+        frames = common.load_frames(args.frames)
+    else:
+        frames = [
+            common.subscription_update_frame(args.rows // 10, args.rows)
+        ] + common.send_message_frames(args.transactions)
+
+    total_bytes = sum(len(frame) for frame in frames)
+    print(f"{len(frames)} frames, {total_bytes / 1e6:.1f} MB")
+    print(f"{'codec':<8} {'parse (s)':>10} {'MB/s':>8} {'decode (s)':>11}")
+
+    for name in available_json_codecs():
+        codec = get_json_codec(name)
+        client = SpacetimeDBClient(common.module_bindings, codec)
+        check_round_trip(client, codec)
+
+        parse_time = common.timed(parse_frames, codec, frames)
+        decode_time = common.timed(decode_frames, client, frames)
+        print(
+            f"{name:<8} {parse_time:>10.3f} {total_bytes / 1e6 / parse_time:>8.1f} {decode_time:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
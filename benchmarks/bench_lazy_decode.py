@@ -0,0 +1,52 @@
+""" Compare eager and lazy row decoding (lazy_tables) for a large SubscriptionUpdate.
+
+Reports the time to decode and apply the update, and the time of the first full iter() over the
+table, which decodes the rows a lazy table kept raw.
+
+The quickstart Message table declares a sorted index on sent, which makes a lazy table decode every
+row to index it, so the index is dropped for this benchmark.
+
+Usage:
+    python benchmarks/bench_lazy_decode.py [--rows N]
+"""
+
+import argparse
+import time
+
+import common
+from module_bindings.message import Message
+from spacetimedb_sdk.spacetimedb_client import SpacetimeDBClient
+
+
+def measure(frame, lazy_tables):
+    client = SpacetimeDBClient(common.module_bindings, lazy_tables=lazy_tables)
+
+    start = time.perf_counter()
+    message = client._decode_message(frame)
+    decoded = time.perf_counter()
+    client.message_queue.put(message)
+    client.update()
+    applied = time.perf_counter()
+    row_count = sum(1 for _ in Message.iter(client=client))
+    iterated = time.perf_counter()
+
+    assert row_count > 0
+    return decoded - start, applied - decoded, iterated - applied
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    Message.sorted_columns = []
+    frame = common.subscription_update_frame(args.rows // 10, args.rows)
+
+    print(f"{'mode':<8} {'decode (ms)':>12} {'apply (ms)':>11} {'first iter (ms)':>16}")
+    for label, lazy_tables in [("eager", None), ("lazy", ["Message"])]:
+        decode, apply, first_iter = measure(frame, lazy_tables)
+        print(f"{label:<8} {decode * 1000:>12.1f} {apply * 1000:>11.1f} {first_iter * 1000:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
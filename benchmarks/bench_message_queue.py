@@ -0,0 +1,118 @@
+""" Compare the overflow policies of the message queue with a consumer that falls behind.
+
+A producer thread decodes TransactionUpdates that rename a small set of users as fast as it can
+and queues them like the websocket decode thread does, while the consumer calls update() at a
+fixed rate with a limited number of events per call. For each policy the benchmark reports the
+peak traced memory, the queue high water mark and what the policy did to keep up.
+
+Usage:
+    python benchmarks/bench_message_queue.py [--transactions N] [--users N] [--limit N]
+"""
+
+import argparse
+import threading
+import time
+import tracemalloc
+
+import common
+from spacetimedb_sdk.spacetimedb_client import SpacetimeDBClient
+
+
+def rename_frames(transaction_count, user_count):
+    frames = []
+    for index in range(transaction_count):
+        user = index % user_count
+        generation = index // user_count
+        old_row = common.user_row(user, f"user {user} {generation}")
+        new_row = common.user_row(user, f"user {user} {generation + 1}")
+        frames.append(
+            common.transaction_update_frame(
+                {
+                    "User": [
+                        common.row_operation("delete", old_row),
+                        common.row_operation("insert", new_row),
+                    ]
+                },
+                reducer="set_name",
+                args=[f"user {user} {generation + 1}"],
+            )
+        )
+    return frames
+
+
+def measure(frames, user_count, limit, policy):
+    client = SpacetimeDBClient(common.module_bindings)
+    # seed the cache with generation 0 of every user, as a SubscriptionUpdate would
+    client.message_queue.put(
+        client._decode_message(
+            common.transaction_update_frame(
+                {
+                    "User": [
+                        common.row_operation("insert", common.user_row(i, f"user {i} 0"))
+                        for i in range(user_count)
+                    ]
+                }
+            )
+        )
+    )
+    client.update()
+    client.limit_message_queue(limit, policy)
+    client.message_queue.reset_high_water()
+
+    event_count = 0
+
+    def on_event(event):
+        nonlocal event_count
+        event_count += 1
+
+    client.register_on_event(on_event)
+
+    def produce():
+        for frame in frames:
+            client._enqueue_message(client._decode_message(frame))
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    producer = threading.Thread(target=produce)
+    producer.start()
+    while producer.is_alive() or not client.message_queue.empty():
+        client.update(max_events=100)
+        time.sleep(0.005)
+    producer.join()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = client.message_queue_stats()
+    stats["events"] = event_count
+    return elapsed, peak, stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--transactions", type=int, default=20_000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=500)
+    args = parser.parse_args()
+
+    frames = rename_frames(args.transactions, args.users)
+
+    print(
+        f"{'policy':<12} {'time (s)':>9} {'peak MB':>8} {'max depth':>10} {'events':>7} "
+        f"{'blocked (s)':>12} {'coalesced':>10} {'dropped':>8}"
+    )
+    for label, limit, policy in [
+        ("unbounded", 0, "block"),
+        ("block", args.limit, "block"),
+        ("coalesce", args.limit, "coalesce"),
+        ("disconnect", args.limit, "disconnect"),
+    ]:
+        elapsed, peak, stats = measure(frames, args.users, limit, policy)
+        print(
+            f"{label:<12} {elapsed:>9.2f} {peak / 1e6:>8.1f} {stats['max_depth']:>10} {stats['events']:>7} "
+            f"{stats['blocked_seconds']:>12.2f} {stats['coalesced']:>10} {stats['dropped']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
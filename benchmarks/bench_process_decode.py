@@ -0,0 +1,62 @@
+""" Measure how the load time of a large SubscriptionUpdate scales with process decoding workers.
+
+Loads the same SubscriptionUpdate in-process and with enable_process_decoding() for 1, 2, 4, ...
+workers up to the number of cores (or --max-workers), and reports decode + apply time. Worker
+start up is excluded, enable_process_decoding() starts the workers before returning.
+
+Usage:
+    python benchmarks/bench_process_decode.py [--rows N] [--max-workers N] [--chunk-rows N]
+"""
+
+import argparse
+import os
+import time
+
+import common
+from spacetimedb_sdk.spacetimedb_client import SpacetimeDBClient
+
+
+def measure(frame, workers, chunk_rows):
+    client = SpacetimeDBClient(common.module_bindings)
+    if workers:
+        client.enable_process_decoding(workers, min_rows=0, chunk_rows=chunk_rows)
+
+    try:
+        start = time.perf_counter()
+        client._on_message(frame)
+        client.update()
+        return time.perf_counter() - start
+    finally:
+        client.disable_process_decoding()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-rows", type=int, default=5_000)
+    args = parser.parse_args()
+
+    frame = common.subscription_update_frame(args.rows // 10, args.rows)
+
+    worker_counts = [0]
+    workers = 1
+    while workers <= args.max_workers:
+        worker_counts.append(workers)
+        workers *= 2
+    if worker_counts[-1] != args.max_workers:
+        worker_counts.append(args.max_workers)
+
+    print(f"{os.cpu_count()} cores, {len(frame) / 1e6:.1f} MB frame")
+    print(f"{'workers':<12} {'load (ms)':>10} {'speedup':>8}")
+    baseline = None
+    for workers in worker_counts:
+        seconds = measure(frame, workers, args.chunk_rows)
+        if baseline is None:
+            baseline = seconds
+        label = str(workers) if workers else "in-process"
+        print(f"{label:<12} {seconds * 1000:>10.1f} {baseline / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
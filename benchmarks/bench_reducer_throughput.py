@@ -0,0 +1,109 @@
+""" Measure reducer call throughput of SpacetimeDBAsyncClient.
+
+The websocket is replaced with an in-process transport that answers every reducer call with a
+TransactionUpdate after a simulated network round trip. The benchmark compares awaiting each
+call before sending the next one against pipelining many calls with send_reducer().
+
+Usage:
+    python benchmarks/bench_reducer_throughput.py [--calls N] [--rtt-ms MS] [--in-flight N]
+"""
+
+import argparse
+import asyncio
+import json
+import queue
+import threading
+import time
+
+import common
+from spacetimedb_sdk.spacetimedb_async_client import SpacetimeDBAsyncClient
+from spacetimedb_sdk.spacetimedb_client import Address, Identity
+
+
+class LoopbackTransport:
+    """
+    Stands in for WebSocketClient: replies to each reducer call, in order, after rtt seconds.
+    """
+
+    def __init__(self, client, rtt):
+        self.client = client
+        self.rtt = rtt
+        self.is_connected = True
+        self.calls = queue.Queue()
+        self.sequence = 0
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def send(self, data, binary=False):
+        self.calls.put((time.perf_counter() + self.rtt, json.loads(data)["call"]))
+
+    def close(self):
+        self.calls.put(None)
+
+    def _serve(self):
+        while True:
+            item = self.calls.get()
+            if item is None:
+                return
+            reply_at, call = item
+            delay = reply_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self.sequence += 1
+            frame = common.transaction_update_frame(
+                {
+                    "Message": [
+                        common.row_operation("insert", common.message_row(self.sequence))
+                    ]
+                },
+                reducer=call["fn"],
+                args=call["args"],
+            )
+            self.client._on_message(frame)
+
+
+async def run_calls(call_count, rtt, in_flight):
+    async_client = SpacetimeDBAsyncClient(common.module_bindings)
+    async_client._on_async_loop_start()
+    # results are matched to calls by the caller of the TransactionUpdate
+    async_client.client.identity = Identity.from_string(common.identity_hex(0))
+    async_client.client.address = Address.from_string((1).to_bytes(16, "big").hex())
+    async_client.client.wsc = LoopbackTransport(async_client.client, rtt)
+
+    start = time.perf_counter()
+    if in_flight == 1:
+        for index in range(call_count):
+            await async_client.call_reducer("send_message", f"message {index}")
+    else:
+        semaphore = asyncio.Semaphore(in_flight)
+
+        async def call(index):
+            async with semaphore:
+                await async_client.call_reducer("send_message", f"message {index}")
+
+        await asyncio.gather(*(call(index) for index in range(call_count)))
+    elapsed = time.perf_counter() - start
+
+    async_client.client.wsc.close()
+    # event callbacks and sent calls left behind once every call completed
+    leaked = len(async_client.client._on_event) + len(async_client.client._sent_reducer_calls)
+    return elapsed, leaked
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--rtt-ms", type=float, default=2.0)
+    parser.add_argument("--in-flight", type=int, default=256)
+    args = parser.parse_args()
+
+    rtt = args.rtt_ms / 1000
+    print(f"{'in flight':>9} {'calls/s':>10} {'leaked callbacks':>17}")
+    for in_flight in (1, args.in_flight):
+        calls = args.calls if in_flight > 1 else min(args.calls, 200)
+        elapsed, leaked = asyncio.run(run_calls(calls, rtt, in_flight))
+        print(f"{in_flight:>9} {calls / elapsed:>10.0f} {leaked:>17}")
+
+
+if __name__ == "__main__":
+    main()
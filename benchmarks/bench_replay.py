@@ -0,0 +1,67 @@
+""" Replay a traffic recording through SpacetimeDBClient and report where the time goes.
+
+Without --recording a synthetic session (an IdentityToken, one SubscriptionUpdate and then
+send_message TransactionUpdates) is recorded to a temporary file first.
+
+Record a real session with:
+
+    client.start_recording("session.rec")
+
+Usage:
+    python benchmarks/bench_replay.py [--recording FILE] [--realtime] [--speed X] [--rows N] [--transactions N]
+"""
+
+import argparse
+import os
+import tempfile
+
+import common
+from spacetimedb_sdk.spacetimedb_client import SpacetimeDBClient
+from spacetimedb_sdk.traffic_recorder import TrafficRecorder, replay_recording
+
+
+def record_synthetic(path, rows, transactions):
+    recorder = TrafficRecorder(path)
+    # real recordings start with the IdentityToken of the connection
+    recorder.record(common.identity_token_frame())
+    recorder.record(common.subscription_update_frame(rows // 10, rows))
+    for frame in common.send_message_frames(transactions, start=rows):
+        recorder.record(frame)
+    recorder.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recording", help="traffic recording to replay")
+    parser.add_argument("--realtime", action="store_true", help="keep the recorded timing")
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--transactions", type=int, default=10_000)
+    args = parser.parse_args()
+
+    path = args.recording
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(), "synthetic.rec")
+        record_synthetic(path, args.rows, args.transactions)
+
+    client = SpacetimeDBClient(common.module_bindings)
+    client.enable_metrics()
+    result = replay_recording(client, path, realtime=args.realtime, speed=args.speed)
+
+    print(
+        f"{result['frames']} frames, {result['bytes'] / 1e6:.1f} MB in {result['seconds']:.3f} s"
+        f" ({result['frames_per_second']:.0f} frames/s)"
+    )
+    metrics = client.get_metrics()
+    print(f"{'stage':<32} {'count':>7} {'total (s)':>10} {'p50 (us)':>9} {'p99 (us)':>9}")
+    for stage, histogram in metrics["stages"].items():
+        print(
+            f"{stage:<32} {histogram['count']:>7} {histogram['total']:>10.3f}"
+            f" {histogram['p50'] * 1e6:>9.0f} {histogram['p99'] * 1e6:>9.0f}"
+        )
+    for table_name, counts in metrics["table_rows"].items():
+        print(f"{table_name}: {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+""" Compare the memory use and attribute access speed of generated row classes.
+
+    dict    : the previous codegen layout, fields in a per-row data dict read through __getattr__
+    slots   : the current codegen layout, fields in __slots__
+
+Usage:
+    python benchmarks/bench_row_layout.py [--rows N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+import common
+from module_bindings.user import User
+from spacetimedb_sdk.spacetimedb_client import Identity
+
+
+class DictUser:
+    # row layout generated before __slots__ support
+    is_table_class = True
+
+    primary_key = "identity"
+
+    def __init__(self, data):
+        self.data = {}
+        self.data["identity"] = Identity.from_string(data[0][0])
+        self.data["name"] = str(data[1]["0"]) if "0" in data[1] else None
+        self.data["online"] = bool(data[2])
+
+    def __getattr__(self, name):
+        return self.data.get(name)
+
+
+def build_rows(row_class, raw_rows):
+    return [row_class(raw_row) for raw_row in raw_rows]
+
+
+def measure_memory(row_class, raw_rows):
+    gc.collect()
+    tracemalloc.start()
+    rows = build_rows(row_class, raw_rows)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, current
+
+
+def read_attributes(rows):
+    count = 0
+    for row in rows:
+        if row.online and row.name is not None:
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    raw_rows = [common.user_row(i, f"user {i}") for i in range(args.rows)]
+
+    print(
+        f"{'layout':<8} {'bytes/row':>10} {'construct (s)':>14} {'2 reads/row (s)':>16}"
+    )
+    for name, row_class in (("dict", DictUser), ("slots", User)):
+        rows, memory = measure_memory(row_class, raw_rows)
+        construct_time = common.timed(build_rows, row_class, raw_rows)
+        read_time = common.timed(read_attributes, rows)
+        print(
+            f"{name:<8} {memory / args.rows:>10.0f} {construct_time:>14.3f} {read_time:>16.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
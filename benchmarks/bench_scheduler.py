@@ -0,0 +1,102 @@
+""" Compare repeating timers built on one asyncio task per firing with SpacetimeDBAsyncClient.schedule_every.
+
+Runs --timers repeating timers with an --interval period for --seconds on an otherwise idle loop
+and reports the firings per second, the CPU time per firing and how late the firings were.
+
+    tasks    : what schedule_event did before the timer heap, the callback reschedules itself
+               and every firing creates a task that sleeps until a wall clock datetime
+    heap     : schedule_every, all timers in the client's TimerScheduler
+
+Usage:
+    python benchmarks/bench_scheduler.py [--timers N] [--interval SECONDS] [--seconds SECONDS]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import common
+from spacetimedb_sdk.spacetimedb_async_client import SpacetimeDBAsyncClient
+
+
+def legacy_schedule_event(delay_secs, callback, *args):
+    fire_time = datetime.now() + timedelta(seconds=delay_secs)
+
+    async def wait_for_delay():
+        await asyncio.sleep((fire_time - datetime.now()).total_seconds())
+        callback(*args)
+
+    asyncio.create_task(wait_for_delay())
+
+
+async def run_tasks(timers, interval, seconds):
+    loop = asyncio.get_running_loop()
+    lateness = []
+
+    def tick(due):
+        now = loop.time()
+        lateness.append(now - due)
+        legacy_schedule_event(interval, tick, now + interval)
+
+    for _ in range(timers):
+        legacy_schedule_event(interval, tick, loop.time() + interval)
+    await asyncio.sleep(seconds)
+    # the tasks of the last firings are still pending, they are dropped with the loop
+    return lateness
+
+
+async def run_heap(timers, interval, seconds):
+    client = SpacetimeDBAsyncClient(common.module_bindings)
+    client._on_async_loop_start()
+    loop = client.loop
+    lateness = []
+    events = []
+    due = []
+
+    def tick(index):
+        lateness.append(loop.time() - due[index])
+        # the event was already moved to its next fire time
+        due[index] = events[index].fire_time
+
+    for index in range(timers):
+        events.append(client.schedule_every(interval, tick, index))
+        due.append(events[index].fire_time)
+    await asyncio.sleep(seconds)
+    client.scheduler.cancel_all()
+    return lateness
+
+
+def measure(run, timers, interval, seconds):
+    cpu_start = time.process_time()
+    lateness = asyncio.run(run(timers, interval, seconds))
+    cpu = time.process_time() - cpu_start
+    lateness.sort()
+    return (
+        len(lateness) / seconds,
+        cpu / max(len(lateness), 1),
+        statistics.median(lateness),
+        lateness[int(len(lateness) * 0.99) - 1],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--timers", type=int, default=2000)
+    parser.add_argument("--interval", type=float, default=0.01)
+    parser.add_argument("--seconds", type=float, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'mode':<6} {'firings/s':>10} {'CPU us/firing':>14} {'late p50 (ms)':>14} {'late p99 (ms)':>14}"
+    )
+    for label, run in [("tasks", run_tasks), ("heap", run_heap)]:
+        rate, cpu, p50, p99 = measure(run, args.timers, args.interval, args.seconds)
+        print(
+            f"{label:<6} {rate:>10.0f} {cpu * 1e6:>14.1f} {p50 * 1000:>14.2f} {p99 * 1000:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
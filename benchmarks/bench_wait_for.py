@@ -0,0 +1,106 @@
+""" Compare polling Table.iter() with SpacetimeDBAsyncClient.wait_for.
+
+Seeds --users offline users, starts --waiters tasks that each wait for a different user to come
+online, then brings those users online one TransactionUpdate at a time, --gap seconds apart.
+Reports the CPU time used while waiting and the mean and worst delay between a user's update
+being applied and its waiter resuming.
+
+    poll     : every waiter scans User.iter() every millisecond
+    wait_for : wait_for(User, lambda user: user.online)
+    keyed    : wait_for(User, lambda user: user.online, identity=...)
+
+Usage:
+    python benchmarks/bench_wait_for.py [--users N] [--waiters N] [--gap SECONDS]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import common
+from module_bindings.user import User
+from spacetimedb_sdk.spacetimedb_async_client import SpacetimeDBAsyncClient
+from spacetimedb_sdk.spacetimedb_client import Identity
+
+
+def online_frame(index, online):
+    return common.transaction_update_frame(
+        {
+            "User": [
+                common.row_operation("delete", common.user_row(index, f"user {index}", online=False)),
+                common.row_operation("insert", common.user_row(index, f"user {index}", online=online)),
+            ]
+        },
+        reducer="__identity_connected__",
+    )
+
+
+async def run(mode, user_count, waiter_count, gap):
+    client = SpacetimeDBAsyncClient(common.module_bindings)
+    client._on_async_loop_start()
+    seed = common.transaction_update_frame(
+        {
+            "User": [
+                common.row_operation("insert", common.user_row(i, f"user {i}", online=False))
+                for i in range(user_count)
+            ]
+        }
+    )
+    client.client._enqueue_message(client.client._decode_message(seed))
+    await asyncio.sleep(0.01)
+
+    identities = [Identity.from_string(common.identity_hex(i)) for i in range(waiter_count)]
+    applied_at = {}
+    delays = []
+
+    async def poll(identity):
+        while True:
+            for user in User.iter(client=client.client):
+                if user.identity == identity and user.online:
+                    return user
+            await asyncio.sleep(0.001)
+
+    async def waiter(identity):
+        if mode == "poll":
+            user = await poll(identity)
+        elif mode == "keyed":
+            user = await client.wait_for(User, lambda user: user.online, identity=identity)
+        else:
+            user = await client.wait_for(
+                User, lambda user, identity=identity: user.identity == identity and user.online
+            )
+        delays.append(time.perf_counter() - applied_at[user.identity])
+
+    def on_row_update(row_op, old_value, new_value, reducer_event):
+        applied_at[new_value.identity] = time.perf_counter()
+
+    client.client._register_row_update("User", on_row_update)
+    messages = [client.client._decode_message(online_frame(i, True)) for i in range(waiter_count)]
+
+    cpu_start = time.process_time()
+    tasks = [asyncio.create_task(waiter(identity)) for identity in identities]
+    await asyncio.sleep(0)
+    for message in messages:
+        client.client._enqueue_message(message)
+        await asyncio.sleep(gap)
+    await asyncio.gather(*tasks)
+    cpu = time.process_time() - cpu_start
+    return cpu, statistics.mean(delays), max(delays)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--waiters", type=int, default=100)
+    parser.add_argument("--gap", type=float, default=0.002)
+    args = parser.parse_args()
+
+    print(f"{'mode':<9} {'CPU (s)':>8} {'mean delay (ms)':>16} {'max delay (ms)':>15}")
+    for mode in ["poll", "wait_for", "keyed"]:
+        cpu, mean_delay, max_delay = asyncio.run(run(mode, args.users, args.waiters, args.gap))
+        print(f"{mode:<9} {cpu:>8.2f} {mean_delay * 1000:>16.2f} {max_delay * 1000:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+""" Shared helpers for the SDK benchmarks.
+
+Importing this module puts the in-tree SDK and the quickstart module bindings on sys.path,
+so the benchmarks can be run from a source checkout without installing anything:
+
+    python benchmarks/bench_json_codec.py
+
+The frame generators produce v1.text.spacetimedb messages for the quickstart chat module
+(User and Message tables, send_message and set_name reducers).
+"""
+
+import importlib
+import json
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
+sys.path.insert(0, os.path.join(ROOT_DIR, "examples", "quickstart", "client"))
+
+from spacetimedb_sdk import traffic_recorder  # noqa: E402
+
+# the quickstart bindings, found through the path above. Not used here: the benchmarks pass
+# common.module_bindings to the clients they create.
+module_bindings = importlib.import_module("module_bindings")
+
+
+def identity_hex(index):
+    return index.to_bytes(32, "big").hex()
+
+
+def user_row(index, name=None, online=True):
+    return [[identity_hex(index)], {"0": name} if name is not None else {"1": []}, online]
+
+
+def message_row(index, sender_index=0, sent=None):
+    return [
+        [identity_hex(sender_index)],
+        sent if sent is not None else 1_700_000_000_000_000 + index,
+        f"message number {index}",
+    ]
+
+
+def row_pk(row):
+    return str(hash(json.dumps(row)) & 0xFFFFFFFFFFFFFFFF)
+
+
+def row_operation(op, row):
+    return {"op": op, "row_pk": row_pk(row), "row": row}
+
+
+def identity_token_frame(index=0, token="benchmark-token"):
+    return json.dumps(
+        {
+            "IdentityToken": {
+                "identity": identity_hex(index),
+                "token": token,
+                "address": (1).to_bytes(16, "big").hex(),
+            }
+        }
+    )
+
+
+def subscription_update_frame(user_count, message_count):
+    """
+    Build a SubscriptionUpdate frame with the given number of User and Message rows.
+    """
+    users = [row_operation("insert", user_row(i, f"user {i}")) for i in range(user_count)]
+    messages = [
+        row_operation("insert", message_row(i, i % max(user_count, 1)))
+        for i in range(message_count)
+    ]
+    return json.dumps(
+        {
+            "SubscriptionUpdate": {
+                "table_updates": [
+                    {"table_id": 1, "table_name": "User", "table_row_operations": users},
+                    {
+                        "table_id": 2,
+                        "table_name": "Message",
+                        "table_row_operations": messages,
+                    },
+                ]
+            }
+        }
+    )
+
+
+def transaction_update_frame(
+    table_row_operations,
+    reducer="send_message",
+    args=None,
+    caller_index=0,
+    caller_address=None,
+    status="committed",
+    caller_identity=None,
+    message="",
+):
+    """
+    Build a TransactionUpdate frame.
+
+    Args:
+        table_row_operations: dict of table name to a list of row operations created with row_operation
+        caller_identity: identity hex of the caller, overrides caller_index
+    """
+    if args is None:
+        args = ["hello"]
+    if caller_identity is None:
+        caller_identity = identity_hex(caller_index)
+    if caller_address is None:
+        caller_address = (1).to_bytes(16, "big").hex()
+    return json.dumps(
+        {
+            "TransactionUpdate": {
+                "event": {
+                    "timestamp": 0,
+                    "status": status,
+                    "caller_identity": caller_identity,
+                    "caller_address": caller_address,
+                    "function_call": {"reducer": reducer, "args": json.dumps(args)},
+                    "energy_quanta_used": 0,
+                    "message": message,
+                },
+                "subscription_update": {
+                    "table_updates": [
+                        {
+                            "table_id": 0,
+                            "table_name": table_name,
+                            "table_row_operations": operations,
+                        }
+                        for table_name, operations in table_row_operations.items()
+                    ]
+                },
+            }
+        }
+    )
+
+
+def send_message_frames(count, start=0):
+    """
+    Build a list of TransactionUpdate frames that each insert one Message row.
+    """
+    return [
+        transaction_update_frame(
+            {"Message": [row_operation("insert", message_row(start + i))]},
+            args=[f"message number {start + i}"],
+        )
+        for i in range(count)
+    ]
+
+
+def load_frames(path):
+    """
+    Load the frames of a traffic recording (see spacetimedb_sdk.traffic_recorder) or of a file of
+    newline delimited text frames.
+    """
+    if traffic_recorder.is_recording(path):
+        _, frames = traffic_recorder.read_recording(path)
+        return [frame for _, frame in frames]
+
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+def timed(func, *args, repeat=3):
+    """
+    Run func repeat times and return the best wall clock time in seconds.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
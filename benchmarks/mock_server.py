@@ -0,0 +1,424 @@
+""" Local stand-in for a SpacetimeDB server running the quickstart chat module.
+
+Speaks the v1.text.spacetimedb websocket subprotocol well enough to exercise the SDK end to end
+without a real SpacetimeDB:
+
+    - sends an IdentityToken when a client connects (a known token keeps its identity)
+    - answers {"subscribe": ...} with a SubscriptionUpdate of the tables named in the queries
+    - runs the send_message and set_name reducers and broadcasts the TransactionUpdate
+    - runs the connect and disconnect reducers of the chat module (User.online)
+
+The websocket server is implemented directly on asyncio streams, it only needs the standard
+library. It is a test fixture, not a server: it keeps everything in memory and does no
+authentication beyond mapping tokens to identities.
+
+Example:
+
+    server = MockSpacetimeDB(messages=10_000)
+    server.start()
+    client.connect(None, server.host, "chat", False, ...)
+    ...
+    server.stop()
+
+Run it standalone with:
+
+    python benchmarks/mock_server.py [--port 3000] [--users N] [--messages N]
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import re
+import struct
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import common
+
+TEXT_PROTOCOL = "v1.text.spacetimedb"
+
+_WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_OPCODE_TEXT = 0x1
+_OPCODE_BINARY = 0x2
+_OPCODE_CLOSE = 0x8
+_OPCODE_PING = 0x9
+_OPCODE_PONG = 0xA
+_TABLE_PATTERN = re.compile(r"\bFROM\s+(\w+)", re.IGNORECASE)
+
+
+class _Connection:
+    def __init__(self, reader, writer, identity_hex, address_hex, token):
+        self.reader = reader
+        self.writer = writer
+        self.identity_hex = identity_hex
+        self.address_hex = address_hex
+        self.token = token
+        self.subscribed_tables = set()
+
+    async def send_text(self, text):
+        payload = text.encode("utf-8")
+        self.writer.write(_frame_header(_OPCODE_TEXT, len(payload)) + payload)
+        await self.writer.drain()
+
+    async def send_close(self):
+        self.writer.write(_frame_header(_OPCODE_CLOSE, 0))
+        await self.writer.drain()
+
+
+def _frame_header(opcode, length):
+    # server to client frames are never masked
+    first = 0x80 | opcode
+    if length < 126:
+        return struct.pack("!BB", first, length)
+    if length < 2**16:
+        return struct.pack("!BBH", first, 126, length)
+    return struct.pack("!BBQ", first, 127, length)
+
+
+async def _read_frame(reader):
+    first, second = await reader.readexactly(2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", await reader.readexactly(8))
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask is not None and length:
+        # unmask the whole payload at once with a big int xor
+        key = (mask * (length // 4 + 1))[:length]
+        payload = (
+            int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")
+        ).to_bytes(length, "big")
+    return first & 0x80, opcode, payload
+
+
+class MockSpacetimeDB:
+    """
+    In-memory chat module behind a websocket server.
+
+    Args:
+        host (str, optional): Interface to listen on. Default: "127.0.0.1"
+        port (int, optional): Port to listen on, 0 picks a free port. Default: 0
+        users (int, optional): User rows to seed the database with. Default: 0
+        messages (int, optional): Message rows to seed the database with. Default: 0
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, users=0, messages=0):
+        self.listen_host = host
+        self.port = port
+        self.tables = {"User": {}, "Message": {}}
+        self.users_by_identity = {}
+        self.identities_by_token = {}
+        self.connections = []
+        self.reducers = {
+            "send_message": self._send_message,
+            "set_name": self._set_name,
+        }
+        self.reducer_calls = 0
+        # row operations written by the reducer that is running
+        self._pending_operations = {}
+        self._next_identity = 1_000_000
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+        for index in range(users):
+            self._insert_user(common.user_row(index, f"user {index}", online=False))
+        for index in range(messages):
+            row = common.message_row(index, index % max(users, 1))
+            self.tables["Message"][common.row_pk(row)] = row
+
+    @property
+    def host(self):
+        """
+        host:port to pass to the client connect functions.
+        """
+        return f"{self.listen_host}:{self.port}"
+
+    def start(self):
+        """
+        Start the server on a background thread and return once it is listening.
+        """
+        started = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.serve())
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="mock-spacetimedb", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop(self):
+        """
+        Close all connections and stop the background thread started with start().
+        """
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    async def serve(self):
+        self._server = await asyncio.start_server(
+            self._handle_client, self.listen_host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def shutdown(self):
+        self._server.close()
+        for connection in list(self.connections):
+            connection.writer.close()
+        await self._server.wait_closed()
+
+    async def _handshake(self, reader, writer):
+        request = await reader.readuntil(b"\r\n\r\n")
+        lines = request.decode("latin-1").split("\r\n")
+        _, target, _ = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        protocols = [
+            protocol.strip()
+            for protocol in headers.get("sec-websocket-protocol", "").split(",")
+        ]
+        if TEXT_PROTOCOL not in protocols:
+            writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+            await writer.drain()
+            return None
+
+        accept = base64.b64encode(
+            hashlib.sha1(
+                (headers["sec-websocket-key"] + _WEBSOCKET_GUID).encode("ascii")
+            ).digest()
+        ).decode("ascii")
+        writer.write(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept}\r\n"
+                f"Sec-WebSocket-Protocol: {TEXT_PROTOCOL}\r\n\r\n"
+            ).encode("ascii")
+        )
+        await writer.drain()
+
+        token = None
+        authorization = headers.get("authorization", "")
+        if authorization.startswith("Basic "):
+            credentials = base64.b64decode(authorization[6:]).decode("utf-8")
+            if credentials.startswith("token:"):
+                token = credentials[6:]
+
+        identity_hex = self.identities_by_token.get(token)
+        if identity_hex is None:
+            identity_hex = common.identity_hex(self._next_identity)
+            token = f"mock-token-{self._next_identity}"
+            self._next_identity += 1
+            self.identities_by_token[token] = identity_hex
+
+        query = parse_qs(urlsplit(target).query)
+        address_hex = query.get("client_address", [(0).to_bytes(16, "big").hex()])[0]
+        return _Connection(reader, writer, identity_hex, address_hex, token)
+
+    async def _handle_client(self, reader, writer):
+        connection = await self._handshake(reader, writer)
+        if connection is None:
+            writer.close()
+            return
+
+        self.connections.append(connection)
+        try:
+            await connection.send_text(
+                json.dumps(
+                    {
+                        "IdentityToken": {
+                            "identity": connection.identity_hex,
+                            "token": connection.token,
+                            "address": connection.address_hex,
+                        }
+                    }
+                )
+            )
+            await self._run_reducer(connection, "__identity_connected__", [], self._connected)
+
+            fragments = []
+            while True:
+                final, opcode, payload = await _read_frame(reader)
+                if opcode == _OPCODE_CLOSE:
+                    await connection.send_close()
+                    break
+                if opcode == _OPCODE_PING:
+                    writer.write(_frame_header(_OPCODE_PONG, len(payload)) + payload)
+                    continue
+                if opcode in (_OPCODE_TEXT, _OPCODE_BINARY, 0x0):
+                    fragments.append(payload)
+                    if final:
+                        await self._handle_message(connection, b"".join(fragments))
+                        fragments = []
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.connections.remove(connection)
+            if self._server is not None and self._server.is_serving():
+                await self._run_reducer(
+                    connection, "__identity_disconnected__", [], self._disconnected
+                )
+            writer.close()
+
+    async def _handle_message(self, connection, payload):
+        message = json.loads(payload)
+        if "subscribe" in message:
+            queries = message["subscribe"]["query_strings"]
+            connection.subscribed_tables = {
+                table_name
+                for query in queries
+                for table_name in _TABLE_PATTERN.findall(query)
+                if table_name in self.tables
+            }
+            await connection.send_text(self._subscription_update(connection))
+        elif "call" in message:
+            reducer_name = message["call"]["fn"]
+            args = message["call"]["args"]
+            self.reducer_calls += 1
+            await self._run_reducer(
+                connection, reducer_name, args, self.reducers.get(reducer_name)
+            )
+
+    def _subscription_update(self, connection):
+        return json.dumps(
+            {
+                "SubscriptionUpdate": {
+                    "table_updates": [
+                        {
+                            "table_id": table_id,
+                            "table_name": table_name,
+                            "table_row_operations": [
+                                {"op": "insert", "row_pk": row_pk, "row": row}
+                                for row_pk, row in self.tables[table_name].items()
+                            ],
+                        }
+                        for table_id, table_name in enumerate(self.tables)
+                        if table_name in connection.subscribed_tables
+                    ]
+                }
+            }
+        )
+
+    async def _run_reducer(self, connection, reducer_name, args, reducer):
+        if reducer is None:
+            status, error, operations = "failed", f"No such reducer {reducer_name}", {}
+        else:
+            error = reducer(connection, *args)
+            operations = {} if error else self._pending_operations
+            status = "failed" if error else "committed"
+        self._pending_operations = {}
+
+        frame = common.transaction_update_frame(
+            operations,
+            reducer=reducer_name,
+            args=args,
+            caller_identity=connection.identity_hex,
+            caller_address=connection.address_hex,
+            status=status,
+            message=error or "",
+        )
+        for other in list(self.connections):
+            # the caller always hears about its own call, others only about tables they subscribed to
+            if other is connection or other.subscribed_tables & operations.keys():
+                try:
+                    await other.send_text(frame)
+                except ConnectionError:
+                    pass
+
+    def _write(self, table_name, op, row):
+        row_pk = common.row_pk(row)
+        if op == "insert":
+            self.tables[table_name][row_pk] = row
+        else:
+            del self.tables[table_name][row_pk]
+        self._pending_operations.setdefault(table_name, []).append(
+            {"op": op, "row_pk": row_pk, "row": row}
+        )
+
+    def _insert_user(self, row):
+        self.tables["User"][common.row_pk(row)] = row
+        self.users_by_identity[row[0][0]] = row
+
+    def _update_user(self, identity_hex, name=None, online=None):
+        old_row = self.users_by_identity[identity_hex]
+        new_row = [
+            old_row[0],
+            {"0": name} if name is not None else old_row[1],
+            old_row[2] if online is None else online,
+        ]
+        self._write("User", "delete", old_row)
+        self._write("User", "insert", new_row)
+        self.users_by_identity[identity_hex] = new_row
+
+    # reducers of the quickstart chat module, they return an error message or None
+    def _connected(self, connection):
+        if connection.identity_hex in self.users_by_identity:
+            self._update_user(connection.identity_hex, online=True)
+        else:
+            row = [[connection.identity_hex], {"1": []}, True]
+            self._write("User", "insert", row)
+            self.users_by_identity[connection.identity_hex] = row
+
+    def _disconnected(self, connection):
+        if connection.identity_hex in self.users_by_identity:
+            self._update_user(connection.identity_hex, online=False)
+
+    def _set_name(self, connection, name):
+        if not name:
+            return "Names must not be empty"
+        if connection.identity_hex not in self.users_by_identity:
+            return "Cannot set name for unknown user"
+        self._update_user(connection.identity_hex, name=name)
+
+    def _send_message(self, connection, text):
+        if not text:
+            return "Messages must not be empty"
+        self._write(
+            "Message",
+            "insert",
+            [[connection.identity_hex], time.time_ns() // 1000, text],
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--users", type=int, default=0)
+    parser.add_argument("--messages", type=int, default=0)
+    args = parser.parse_args()
+
+    server = MockSpacetimeDB(args.host, args.port, args.users, args.messages)
+
+    async def serve_forever():
+        await server.serve()
+        print(f"Mock SpacetimeDB listening on {server.host}")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
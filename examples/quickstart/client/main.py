@@ -58,12 +58,9 @@ def check_commands():
         else:
             send_message_reducer.send_message(choice[1])
 
-    spacetime_client.schedule_event(0.1, check_commands)
-
 
 def print_messages_in_order():
-    all_messages = sorted(Message.iter(), key=lambda x: x.sent)
-    for entry in all_messages:
+    for entry in Message.iter_by_sent():
         print(
             f"{user_name_or_identity(User.filter_by_identity(entry.sender))}: {entry.text}"
         )
@@ -132,7 +129,7 @@ def register_callbacks(spacetime_client):
     set_name_reducer.register_on_set_name(on_set_name_reducer)
     send_message_reducer.register_on_send_message(on_send_message_reducer)
 
-    spacetime_client.schedule_event(0.1, check_commands)
+    spacetime_client.schedule_every(0.1, check_commands)
 
 
 if __name__ == "__main__":
@@ -2,42 +2,71 @@
 # WILL NOT BE SAVED. MODIFY TABLES IN RUST INSTEAD.
 
 from __future__ import annotations
-from typing import List, Iterator, Callable
+from typing import List, Iterator, Callable, Dict, Tuple
 
 from spacetimedb_sdk.spacetimedb_client import SpacetimeDBClient, Identity, Address
 from spacetimedb_sdk.spacetimedb_client import ReducerEvent
+from spacetimedb_sdk.bsatn import BsatnReader
 
 class Message:
 	is_table_class = True
 
+	sorted_columns = ["sent"]
+
+	__slots__ = ("sender", "sent", "text")
+
+	@classmethod
+	def register_row_update(cls, callback: Callable[[str,Message,Message,ReducerEvent], None], client: SpacetimeDBClient = None):
+		SpacetimeDBClient.current(client)._register_row_update("Message",callback)
+
+	@classmethod
+	def register_table_update(cls, callback: Callable[[List[Message],List[Tuple[Message,Message]],List[Message],ReducerEvent], None], client: SpacetimeDBClient = None):
+		SpacetimeDBClient.current(client)._register_table_update("Message",callback)
+
 	@classmethod
-	def register_row_update(cls, callback: Callable[[str,Message,Message,ReducerEvent], None]):
-		SpacetimeDBClient.instance._register_row_update("Message",callback)
+	def iter(cls, client: SpacetimeDBClient = None) -> Iterator[Message]:
+		return SpacetimeDBClient.current(client)._get_table_cache("Message").values()
 
 	@classmethod
-	def iter(cls) -> Iterator[Message]:
-		return SpacetimeDBClient.instance._get_table_cache("Message").values()
+	def filter_by_sender(cls, sender, client: SpacetimeDBClient = None) -> List[Message]:
+		return SpacetimeDBClient.current(client)._get_table_cache("Message").filter_by("sender", sender)
 
 	@classmethod
-	def filter_by_sender(cls, sender) -> List[Message]:
-		return [column_value for column_value in SpacetimeDBClient.instance._get_table_cache("Message").values() if column_value.sender == sender]
+	def filter_by_sent(cls, sent, client: SpacetimeDBClient = None) -> List[Message]:
+		return SpacetimeDBClient.current(client)._get_table_cache("Message").filter_by("sent", sent)
 
 	@classmethod
-	def filter_by_sent(cls, sent) -> List[Message]:
-		return [column_value for column_value in SpacetimeDBClient.instance._get_table_cache("Message").values() if column_value.sent == sent]
+	def filter_by_text(cls, text, client: SpacetimeDBClient = None) -> List[Message]:
+		return SpacetimeDBClient.current(client)._get_table_cache("Message").filter_by("text", text)
 
 	@classmethod
-	def filter_by_text(cls, text) -> List[Message]:
-		return [column_value for column_value in SpacetimeDBClient.instance._get_table_cache("Message").values() if column_value.text == text]
+	def iter_by_sent(cls, reverse: bool = False, client: SpacetimeDBClient = None) -> Iterator[Message]:
+		return SpacetimeDBClient.current(client)._get_table_cache("Message").iter_sorted("sent", reverse)
+
+	@classmethod
+	def range_by_sent(cls, low = None, high = None, include_low: bool = True, include_high: bool = False, client: SpacetimeDBClient = None) -> List[Message]:
+		return SpacetimeDBClient.current(client)._get_table_cache("Message").range_scan("sent", low, high, include_low, include_high)
+
+	@classmethod
+	def top_by_sent(cls, k: int, largest: bool = True, client: SpacetimeDBClient = None) -> List[Message]:
+		return SpacetimeDBClient.current(client)._get_table_cache("Message").top_k("sent", k, largest)
 
 	def __init__(self, data: List[object]):
-		self.data = {}
-		self.data["sender"] = Identity.from_string(data[0][0])
-		self.data["sent"] = int(data[1])
-		self.data["text"] = str(data[2])
+		self.sender = Identity.from_string(data[0][0])
+		self.sent = int(data[1])
+		self.text = str(data[2])
+
+	@classmethod
+	def from_bsatn(cls, reader: BsatnReader) -> Message:
+		row = cls.__new__(cls)
+		row.sender = Identity.from_bytes(reader.read_bytes())
+		row.sent = reader.read_u64()
+		row.text = reader.read_string()
+		return row
 
 	def encode(self) -> List[object]:
 		return [self.sender, self.sent, self.text]
 
-	def __getattr__(self, name: str):
-		return self.data.get(name)
+	@property
+	def data(self) -> Dict[str, object]:
+		return {name: getattr(self, name) for name in self.__slots__}
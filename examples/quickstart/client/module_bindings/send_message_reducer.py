@@ -6,16 +6,23 @@ from typing import List, Callable
 from spacetimedb_sdk.spacetimedb_client import SpacetimeDBClient
 from spacetimedb_sdk.spacetimedb_client import Identity
 from spacetimedb_sdk.spacetimedb_client import Address
+from spacetimedb_sdk.bsatn import BsatnReader, BsatnWriter
 
 
 reducer_name = "send_message"
 
-def send_message(text: str):
+def send_message(text: str, client: SpacetimeDBClient = None):
 	text = text
-	SpacetimeDBClient.instance._reducer_call("send_message", text)
+	SpacetimeDBClient.current(client)._reducer_call("send_message", text)
 
-def register_on_send_message(callback: Callable[[Identity, Address, str, str, str], None]):
-	SpacetimeDBClient.instance._register_reducer("send_message", callback)
+def register_on_send_message(callback: Callable[[Identity, Address, str, str, str], None], client: SpacetimeDBClient = None):
+	SpacetimeDBClient.current(client)._register_reducer("send_message", callback)
 
 def _decode_args(data):
 	return [str(data[0])]
+
+def _decode_args_bsatn(reader: BsatnReader):
+	return [reader.read_string()]
+
+def _encode_args_bsatn(writer: BsatnWriter, text: str):
+	writer.write_string(text)
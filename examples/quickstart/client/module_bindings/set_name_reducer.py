@@ -6,16 +6,23 @@ from typing import List, Callable
 from spacetimedb_sdk.spacetimedb_client import SpacetimeDBClient
 from spacetimedb_sdk.spacetimedb_client import Identity
 from spacetimedb_sdk.spacetimedb_client import Address
+from spacetimedb_sdk.bsatn import BsatnReader, BsatnWriter
 
 
 reducer_name = "set_name"
 
-def set_name(name: str):
+def set_name(name: str, client: SpacetimeDBClient = None):
 	name = name
-	SpacetimeDBClient.instance._reducer_call("set_name", name)
+	SpacetimeDBClient.current(client)._reducer_call("set_name", name)
 
-def register_on_set_name(callback: Callable[[Identity, Address, str, str, str], None]):
-	SpacetimeDBClient.instance._register_reducer("set_name", callback)
+def register_on_set_name(callback: Callable[[Identity, Address, str, str, str], None], client: SpacetimeDBClient = None):
+	SpacetimeDBClient.current(client)._register_reducer("set_name", callback)
 
 def _decode_args(data):
 	return [str(data[0])]
+
+def _decode_args_bsatn(reader: BsatnReader):
+	return [reader.read_string()]
+
+def _encode_args_bsatn(writer: BsatnWriter, name: str):
+	writer.write_string(name)
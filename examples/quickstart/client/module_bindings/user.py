@@ -2,40 +2,55 @@
 # WILL NOT BE SAVED. MODIFY TABLES IN RUST INSTEAD.
 
 from __future__ import annotations
-from typing import List, Iterator, Callable
+from typing import List, Iterator, Callable, Dict, Tuple
 
 from spacetimedb_sdk.spacetimedb_client import SpacetimeDBClient, Identity, Address
 from spacetimedb_sdk.spacetimedb_client import ReducerEvent
+from spacetimedb_sdk.bsatn import BsatnReader
 
 class User:
 	is_table_class = True
 
 	primary_key = "identity"
 
+	__slots__ = ("identity", "name", "online")
+
+	@classmethod
+	def register_row_update(cls, callback: Callable[[str,User,User,ReducerEvent], None], client: SpacetimeDBClient = None):
+		SpacetimeDBClient.current(client)._register_row_update("User",callback)
+
 	@classmethod
-	def register_row_update(cls, callback: Callable[[str,User,User,ReducerEvent], None]):
-		SpacetimeDBClient.instance._register_row_update("User",callback)
+	def register_table_update(cls, callback: Callable[[List[User],List[Tuple[User,User]],List[User],ReducerEvent], None], client: SpacetimeDBClient = None):
+		SpacetimeDBClient.current(client)._register_table_update("User",callback)
 
 	@classmethod
-	def iter(cls) -> Iterator[User]:
-		return SpacetimeDBClient.instance._get_table_cache("User").values()
+	def iter(cls, client: SpacetimeDBClient = None) -> Iterator[User]:
+		return SpacetimeDBClient.current(client)._get_table_cache("User").values()
 
 	@classmethod
-	def filter_by_identity(cls, identity) -> User:
-		return next(iter([column_value for column_value in SpacetimeDBClient.instance._get_table_cache("User").values() if column_value.identity == identity]), None)
+	def filter_by_identity(cls, identity, client: SpacetimeDBClient = None) -> User:
+		return SpacetimeDBClient.current(client)._get_table_cache("User").get_by_pk(identity)
 
 	@classmethod
-	def filter_by_online(cls, online) -> List[User]:
-		return [column_value for column_value in SpacetimeDBClient.instance._get_table_cache("User").values() if column_value.online == online]
+	def filter_by_online(cls, online, client: SpacetimeDBClient = None) -> List[User]:
+		return SpacetimeDBClient.current(client)._get_table_cache("User").filter_by("online", online)
 
 	def __init__(self, data: List[object]):
-		self.data = {}
-		self.data["identity"] = Identity.from_string(data[0][0])
-		self.data["name"] = str(data[1]['0']) if '0' in data[1] else None
-		self.data["online"] = bool(data[2])
+		self.identity = Identity.from_string(data[0][0])
+		self.name = str(data[1]['0']) if '0' in data[1] else None
+		self.online = bool(data[2])
+
+	@classmethod
+	def from_bsatn(cls, reader: BsatnReader) -> User:
+		row = cls.__new__(cls)
+		row.identity = Identity.from_bytes(reader.read_bytes())
+		row.name = reader.read_option(reader.read_string)
+		row.online = reader.read_bool()
+		return row
 
 	def encode(self) -> List[object]:
 		return [self.identity, {'0': [self.name]}, self.online]
 
-	def __getattr__(self, name: str):
-		return self.data.get(name)
+	@property
+	def data(self) -> Dict[str, object]:
+		return {name: getattr(self, name) for name in self.__slots__}
@@ -0,0 +1,242 @@
+""" Decoding and encoding of the v1.bin.spacetimedb websocket subprotocol.
+
+The binary subprotocol wraps every message in the protobuf envelope defined by SpacetimeDB's
+client_api.proto. Row data and reducer arguments inside the envelope are BSATN encoded
+(see spacetimedb_sdk.bsatn). Only the small subset of protobuf needed for the client API
+is implemented here so the SDK does not depend on a protobuf runtime.
+
+This module is intended for internal use by SpacetimeDBClient.
+"""
+
+BINARY_PROTOCOL = "v1.bin.spacetimedb"
+TEXT_PROTOCOL = "v1.text.spacetimedb"
+
+_WIRE_VARINT = 0
+_WIRE_FIXED64 = 1
+_WIRE_LENGTH_DELIMITED = 2
+_WIRE_FIXED32 = 5
+
+# client_api.proto Message.type field numbers
+_MESSAGE_FUNCTION_CALL = 1
+_MESSAGE_SUBSCRIPTION_UPDATE = 2
+_MESSAGE_TRANSACTION_UPDATE = 4
+_MESSAGE_IDENTITY_TOKEN = 5
+_MESSAGE_SUBSCRIBE = 6
+
+_EVENT_STATUS = {0: "committed", 1: "failed", 2: "out_of_energy"}
+_ROW_OPS = {0: "delete", 1: "insert"}
+
+
+def _read_varint(data, offset):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, offset
+        shift += 7
+
+
+def _iter_fields(data):
+    # yields (field_number, value) pairs, where value is an int for varint/fixed fields
+    # and a memoryview for length delimited fields
+    view = memoryview(data)
+    offset = 0
+    end = len(view)
+    while offset < end:
+        key, offset = _read_varint(view, offset)
+        field_number = key >> 3
+        wire_type = key & 0x7
+        if wire_type == _WIRE_VARINT:
+            value, offset = _read_varint(view, offset)
+        elif wire_type == _WIRE_LENGTH_DELIMITED:
+            length, offset = _read_varint(view, offset)
+            value = view[offset : offset + length]
+            offset += length
+        elif wire_type == _WIRE_FIXED64:
+            value = int.from_bytes(view[offset : offset + 8], "little")
+            offset += 8
+        elif wire_type == _WIRE_FIXED32:
+            value = int.from_bytes(view[offset : offset + 4], "little")
+            offset += 4
+        else:
+            raise ValueError(f"Unsupported protobuf wire type {wire_type}")
+        yield field_number, value
+
+
+def _write_varint(buffer, value):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            buffer.append(byte | 0x80)
+        else:
+            buffer.append(byte)
+            return
+
+
+def _write_length_delimited(buffer, field_number, value):
+    _write_varint(buffer, (field_number << 3) | _WIRE_LENGTH_DELIMITED)
+    _write_varint(buffer, len(value))
+    buffer += value
+
+
+class BinaryTableUpdate:
+    """
+    This class is intended for internal use only and should not be used externally.
+    """
+
+    def __init__(self, table_name, row_operations):
+        self.table_name = table_name
+        # list of (row_op, row_pk, row) tuples where row_pk and row are bytes
+        self.row_operations = row_operations
+
+
+class BinaryEvent:
+    """
+    This class is intended for internal use only and should not be used externally.
+    """
+
+    def __init__(self):
+        self.caller_identity = b""
+        self.caller_address = b""
+        self.reducer = ""
+        self.arg_bytes = b""
+        self.status = "committed"
+        self.message = ""
+
+
+class BinaryServerMessage:
+    """
+    This class is intended for internal use only and should not be used externally.
+
+    Attributes:
+        message_type (str): One of "IdentityToken", "SubscriptionUpdate" or "TransactionUpdate".
+    """
+
+    def __init__(self, message_type):
+        self.message_type = message_type
+        self.token = None
+        self.identity = None
+        self.address = None
+        self.event = None
+        self.table_updates = []
+
+
+def _decode_table_row_operation(data):
+    row_op = "delete"
+    row_pk = b""
+    row = b""
+    for field_number, value in _iter_fields(data):
+        if field_number == 1:
+            row_op = _ROW_OPS.get(value, "delete")
+        elif field_number == 2:
+            row_pk = bytes(value)
+        elif field_number == 3:
+            row = bytes(value)
+    return (row_op, row_pk, row)
+
+
+def _decode_table_update(data):
+    table_name = ""
+    row_operations = []
+    for field_number, value in _iter_fields(data):
+        if field_number == 2:
+            table_name = str(value, "utf-8")
+        elif field_number == 3:
+            row_operations.append(_decode_table_row_operation(value))
+    return BinaryTableUpdate(table_name, row_operations)
+
+
+def _decode_subscription_update(data):
+    return [
+        _decode_table_update(value)
+        for field_number, value in _iter_fields(data)
+        if field_number == 1
+    ]
+
+
+def _decode_event(data):
+    event = BinaryEvent()
+    for field_number, value in _iter_fields(data):
+        if field_number == 2:
+            event.caller_identity = bytes(value)
+        elif field_number == 3:
+            for call_field, call_value in _iter_fields(value):
+                if call_field == 1:
+                    event.reducer = str(call_value, "utf-8")
+                elif call_field == 2:
+                    event.arg_bytes = bytes(call_value)
+        elif field_number == 4:
+            event.status = _EVENT_STATUS.get(value, "failed")
+        elif field_number == 5:
+            event.message = str(value, "utf-8")
+        elif field_number == 8:
+            event.caller_address = bytes(value)
+    return event
+
+
+def decode_server_message(data):
+    """
+    Decode a binary frame received from SpacetimeDB.
+
+    Args:
+        data (bytes): The raw websocket frame.
+
+    Returns:
+        BinaryServerMessage: The decoded message, or None if the message type is not handled by the SDK.
+    """
+    for field_number, value in _iter_fields(data):
+        if field_number == _MESSAGE_IDENTITY_TOKEN:
+            message = BinaryServerMessage("IdentityToken")
+            for token_field, token_value in _iter_fields(value):
+                if token_field == 1:
+                    message.identity = bytes(token_value)
+                elif token_field == 2:
+                    message.token = str(token_value, "utf-8")
+                elif token_field == 3:
+                    message.address = bytes(token_value)
+            return message
+        elif field_number == _MESSAGE_SUBSCRIPTION_UPDATE:
+            message = BinaryServerMessage("SubscriptionUpdate")
+            message.table_updates = _decode_subscription_update(value)
+            return message
+        elif field_number == _MESSAGE_TRANSACTION_UPDATE:
+            message = BinaryServerMessage("TransactionUpdate")
+            for update_field, update_value in _iter_fields(value):
+                if update_field == 1:
+                    message.event = _decode_event(update_value)
+                elif update_field == 2:
+                    message.table_updates = _decode_subscription_update(update_value)
+            if message.event is None:
+                message.event = BinaryEvent()
+            return message
+    return None
+
+
+def encode_subscribe(queries):
+    """
+    Encode a Subscribe message for the binary subprotocol.
+    """
+    subscribe = bytearray()
+    for query in queries:
+        _write_length_delimited(subscribe, 1, query.encode("utf-8"))
+
+    buffer = bytearray()
+    _write_length_delimited(buffer, _MESSAGE_SUBSCRIBE, subscribe)
+    return bytes(buffer)
+
+
+def encode_function_call(reducer, arg_bytes):
+    """
+    Encode a FunctionCall message for the binary subprotocol.
+    """
+    function_call = bytearray()
+    _write_length_delimited(function_call, 1, reducer.encode("utf-8"))
+    _write_length_delimited(function_call, 2, arg_bytes)
+
+    buffer = bytearray()
+    _write_length_delimited(buffer, _MESSAGE_FUNCTION_CALL, function_call)
+    return bytes(buffer)
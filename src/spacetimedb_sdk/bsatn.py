@@ -0,0 +1,192 @@
+""" BSATN (Binary SpacetimeDB Algebraic Type Notation) encoding helpers.
+
+BSATN is the compact binary encoding SpacetimeDB uses for row data and reducer arguments
+when a client connects with the binary subprotocol. Generated table classes use BsatnReader
+to decode rows straight from the bytes received over the websocket, and generated reducer
+modules use BsatnWriter to encode their arguments.
+
+Encoding summary:
+    - bool, u8, i8 : 1 byte
+    - integers and floats : fixed width, little endian
+    - strings and bytes : u32 length prefix followed by the data
+    - arrays : u32 element count followed by the elements
+    - products : fields encoded one after another
+    - sums (including Option) : u8 tag followed by the variant payload
+"""
+
+import struct
+
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_I16 = struct.Struct("<h")
+_I32 = struct.Struct("<i")
+_I64 = struct.Struct("<q")
+_F32 = struct.Struct("<f")
+_F64 = struct.Struct("<d")
+
+
+class BsatnReader:
+    """
+    Sequential reader over a BSATN encoded buffer.
+
+    Attributes:
+        data (bytes): The buffer being read.
+        offset (int): The current read position.
+    """
+
+    def __init__(self, data, offset=0):
+        self.data = data
+        self.offset = offset
+
+    def _unpack(self, fmt):
+        value = fmt.unpack_from(self.data, self.offset)[0]
+        self.offset += fmt.size
+        return value
+
+    def read_bool(self):
+        value = self.data[self.offset] != 0
+        self.offset += 1
+        return value
+
+    def read_u8(self):
+        value = self.data[self.offset]
+        self.offset += 1
+        return value
+
+    def read_i8(self):
+        value = self.read_u8()
+        return value - 256 if value > 127 else value
+
+    def read_u16(self):
+        return self._unpack(_U16)
+
+    def read_i16(self):
+        return self._unpack(_I16)
+
+    def read_u32(self):
+        return self._unpack(_U32)
+
+    def read_i32(self):
+        return self._unpack(_I32)
+
+    def read_u64(self):
+        return self._unpack(_U64)
+
+    def read_i64(self):
+        return self._unpack(_I64)
+
+    def read_u128(self):
+        value = int.from_bytes(self.data[self.offset : self.offset + 16], "little")
+        self.offset += 16
+        return value
+
+    def read_i128(self):
+        value = int.from_bytes(
+            self.data[self.offset : self.offset + 16], "little", signed=True
+        )
+        self.offset += 16
+        return value
+
+    def read_f32(self):
+        return self._unpack(_F32)
+
+    def read_f64(self):
+        return self._unpack(_F64)
+
+    def read_bytes(self):
+        length = self.read_u32()
+        value = bytes(self.data[self.offset : self.offset + length])
+        self.offset += length
+        return value
+
+    def read_string(self):
+        length = self.read_u32()
+        value = str(self.data[self.offset : self.offset + length], "utf-8")
+        self.offset += length
+        return value
+
+    def read_array(self, read_element):
+        return [read_element() for _ in range(self.read_u32())]
+
+    def read_option(self, read_value):
+        # Option is encoded as a sum type where tag 0 is some and tag 1 is none
+        if self.read_u8() == 0:
+            return read_value()
+        return None
+
+    def read_sum_tag(self):
+        return self.read_u8()
+
+
+class BsatnWriter:
+    """
+    Accumulates BSATN encoded values into a byte buffer.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def getvalue(self):
+        return bytes(self.buffer)
+
+    def write_bool(self, value):
+        self.buffer.append(1 if value else 0)
+
+    def write_u8(self, value):
+        self.buffer.append(value)
+
+    def write_i8(self, value):
+        self.buffer.append(value & 0xFF)
+
+    def write_u16(self, value):
+        self.buffer += _U16.pack(value)
+
+    def write_i16(self, value):
+        self.buffer += _I16.pack(value)
+
+    def write_u32(self, value):
+        self.buffer += _U32.pack(value)
+
+    def write_i32(self, value):
+        self.buffer += _I32.pack(value)
+
+    def write_u64(self, value):
+        self.buffer += _U64.pack(value)
+
+    def write_i64(self, value):
+        self.buffer += _I64.pack(value)
+
+    def write_u128(self, value):
+        self.buffer += value.to_bytes(16, "little")
+
+    def write_i128(self, value):
+        self.buffer += value.to_bytes(16, "little", signed=True)
+
+    def write_f32(self, value):
+        self.buffer += _F32.pack(value)
+
+    def write_f64(self, value):
+        self.buffer += _F64.pack(value)
+
+    def write_bytes(self, value):
+        self.write_u32(len(value))
+        self.buffer += value
+
+    def write_string(self, value):
+        self.write_bytes(value.encode("utf-8"))
+
+    def write_array(self, values, write_element):
+        self.write_u32(len(values))
+        for value in values:
+            write_element(value)
+
+    def write_option(self, value, write_value):
+        if value is None:
+            self.write_u8(1)
+        else:
+            self.write_u8(0)
+            write_value(value)
+
+    def write_sum_tag(self, tag):
+        self.write_u8(tag)
@@ -0,0 +1,130 @@
+""" On-disk snapshots of the client cache for warm restarts.
+
+A snapshot stores every cached row of every table so a restarted client can reload its cache
+instead of decoding the full initial subscription again. After loading, the client reconciles
+the snapshot against the next SubscriptionUpdate: rows that are still present are kept without
+being decoded again, and only real inserts, updates and deletes fire row update callbacks.
+
+File layout:
+
+    magic (8 bytes) | version (u32) | header length (u64) | header | table blocks...
+
+The header is a pickled dict mapping each table name to the (offset, length, row_count) of its
+block, and each block is a pickled list of (row_pk, row) tuples. Loading memory-maps the file and
+unpickles the blocks straight from the mapping.
+
+Snapshots contain pickled module binding classes, so only load snapshots you created yourself,
+with the same module bindings and wire protocol.
+
+Example:
+
+    client.load_cache_snapshot("cache.snapshot")  # before connecting
+    ...
+    client.save_cache_snapshot("cache.snapshot")  # before exiting
+"""
+
+import mmap
+import os
+import pickle
+import struct
+import time
+
+SNAPSHOT_MAGIC = b"STDBSNAP"
+SNAPSHOT_VERSION = 1
+
+_PREAMBLE = struct.Struct("<8sIQ")
+
+
+def save_snapshot(client_cache, path):
+    """
+    Write every table of a ClientCache to a snapshot file. The file is replaced atomically.
+
+    Args:
+        client_cache (ClientCache): The cache to save.
+        path (str): The snapshot file path.
+
+    Returns:
+        dict: rows_saved, bytes_written and save_seconds.
+    """
+    start = time.perf_counter()
+
+    blocks = []
+    tables = {}
+    offset = 0
+    rows_saved = 0
+    for table_name, table_cache in client_cache.tables.items():
+        rows = list(table_cache.entries.items())
+        block = pickle.dumps(rows, protocol=pickle.HIGHEST_PROTOCOL)
+        tables[table_name] = (offset, len(block), len(rows))
+        blocks.append(block)
+        offset += len(block)
+        rows_saved += len(rows)
+
+    header = pickle.dumps({"tables": tables}, protocol=pickle.HIGHEST_PROTOCOL)
+    data_start = _PREAMBLE.size + len(header)
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(header)))
+        f.write(header)
+        for block in blocks:
+            f.write(block)
+    os.replace(temp_path, path)
+
+    return {
+        "rows_saved": rows_saved,
+        "bytes_written": data_start + offset,
+        "save_seconds": time.perf_counter() - start,
+    }
+
+
+def load_snapshot(client_cache, path):
+    """
+    Load a snapshot file into a ClientCache. Rows are added directly to the table caches, no callbacks are called.
+
+    Tables in the snapshot that are not in the module bindings are skipped.
+
+    Args:
+        client_cache (ClientCache): The cache to load into.
+        path (str): The snapshot file path.
+
+    Returns:
+        dict: rows_loaded and load_seconds.
+
+    Raises:
+        ValueError: If the file is not a snapshot or has an unsupported version.
+    """
+    start = time.perf_counter()
+    rows_loaded = 0
+
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            magic, version, header_length = _PREAMBLE.unpack_from(mapped, 0)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not a SpacetimeDB cache snapshot")
+            if version != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported snapshot version {version}")
+
+            view = memoryview(mapped)
+            try:
+                header = pickle.loads(view[_PREAMBLE.size : _PREAMBLE.size + header_length])
+                data_start = _PREAMBLE.size + header_length
+
+                for table_name, (offset, length, _) in header["tables"].items():
+                    table_cache = client_cache.tables.get(table_name)
+                    if table_cache is None:
+                        print(f"[load_snapshot] Skipping unknown table. ({table_name})")
+                        continue
+
+                    block_start = data_start + offset
+                    rows = pickle.loads(view[block_start : block_start + length])
+                    for row_pk, row in rows:
+                        table_cache.set_entry_decoded(row_pk, row)
+                    rows_loaded += len(rows)
+            finally:
+                view.release()
+
+    return {
+        "rows_loaded": rows_loaded,
+        "load_seconds": time.perf_counter() - start,
+    }
@@ -0,0 +1,245 @@
+""" Async iterators over the row changes of a table, see SpacetimeDBAsyncClient.changes.
+
+Row update callbacks run inside update() on the event loop, so a callback that waits for I/O
+stalls every other message. A ChangeStream instead queues the changes of its table as update()
+applies them, and the consumer takes them with async for at its own pace:
+
+    async with spacetime_client.changes(User) as changes:
+        async for change in changes:
+            await downstream.write(change.op, change.new_value)
+
+Each stream has its own bounded queue. What happens when a consumer falls behind is set by the
+stream's policy:
+
+    block    : the client stops applying messages until the consumer has worked through half of
+               its queue. Messages wait in the client's message queue meanwhile, so a bounded
+               message queue (SpacetimeDBClient.limit_message_queue) carries the backpressure on
+               to the server. The bound is checked between messages, a single message can add
+               more changes than the bound.
+    coalesce : a change to a row that already has a queued change is merged into it (an insert
+               and a later delete cancel out, two updates become one from the first old value to
+               the last new value), so the queue is bounded by the number of changed rows.
+               Changes to other rows are queued past the bound.
+
+Rows are matched by primary key, or by the cached row object in tables without one.
+"""
+
+import asyncio
+import collections
+
+CHANGE_STREAM_POLICIES = ("block", "coalesce")
+
+
+class RowChange:
+    """
+    A change of one row, as passed to row update callbacks.
+
+    Attributes:
+        op (str): "insert", "update" or "delete".
+        old_value: The row before the change, None for inserts.
+        new_value: The row after the change, None for deletes.
+        reducer_event (ReducerEvent): The reducer event of the (last) transaction that changed the row, None for subscription updates.
+    """
+
+    __slots__ = ("op", "old_value", "new_value", "reducer_event")
+
+    def __init__(self, op, old_value, new_value, reducer_event):
+        self.op = op
+        self.old_value = old_value
+        self.new_value = new_value
+        self.reducer_event = reducer_event
+
+    def __repr__(self):
+        return f"RowChange({self.op!r}, {self.old_value!r}, {self.new_value!r})"
+
+    def merge(self, op, old_value, new_value, reducer_event):
+        """
+        Fold a later change of the same row into this one.
+
+        Returns:
+            bool: False if the two changes cancel out and the row is unchanged.
+        """
+        earlier_op = self.op
+        self.reducer_event = reducer_event
+        if earlier_op == "insert" and op == "delete":
+            return False
+        if earlier_op == "insert":
+            self.new_value = new_value
+        elif earlier_op == "delete" and op == "insert":
+            self.op = "update"
+            self.new_value = new_value
+        elif earlier_op == "update":
+            self.op = op
+            self.new_value = new_value
+        else:
+            self.op = op
+            self.old_value = old_value
+            self.new_value = new_value
+        return True
+
+
+class ChangeStream:
+    """
+    Bounded queue of the row changes of one table, consumed with async for. See the module documentation.
+
+    Created by SpacetimeDBAsyncClient.changes, which feeds it from update().
+
+    Args:
+        table_name (str): The table whose changes are queued.
+        primary_key (str, optional): The primary key column used to match changes of the same row.
+        maxsize (int, optional): Bound of the queue. Default: 1000
+        policy (str, optional): "block" or "coalesce". Default: "block"
+        on_drain (Callable[[], None], optional): Called when a blocking stream has drained to half of its bound.
+        on_close (Callable[[ChangeStream], None], optional): Called once when the stream is closed.
+    """
+
+    def __init__(
+        self,
+        table_name,
+        primary_key=None,
+        maxsize=1000,
+        policy="block",
+        on_drain=None,
+        on_close=None,
+    ):
+        if policy not in CHANGE_STREAM_POLICIES:
+            raise ValueError(
+                f"Unknown change stream policy {policy!r}, expected one of {', '.join(CHANGE_STREAM_POLICIES)}"
+            )
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+
+        self.table_name = table_name
+        self.primary_key = primary_key
+        self.maxsize = maxsize
+        self.policy = policy
+        self.closed = False
+        self.max_depth = 0
+        self.coalesced = 0
+        self._on_drain = on_drain
+        self._on_close = on_close
+
+        # (key, change), cancelled changes stay queued with op None until they are reached
+        self._changes = collections.deque()
+        self._size = 0
+        # the queued change of each row, only kept by the coalesce policy
+        self._queued_rows = {} if policy == "coalesce" else None
+        self._waiter = None
+
+    def __len__(self):
+        return self._size
+
+    def blocks_updates(self):
+        """
+        Returns True if the client should stop applying messages until the consumer catches up.
+        """
+        return self.policy == "block" and self._size >= self.maxsize
+
+    def _row_key(self, op, old_value, new_value):
+        row = new_value if op != "delete" else old_value
+        if self.primary_key is not None:
+            return getattr(row, self.primary_key)
+        return row
+
+    def _on_row_update(self, op, old_value, new_value, reducer_event):
+        # the row update callback, runs in update() on the event loop
+        if self.closed:
+            return
+
+        queued_rows = self._queued_rows
+        key = None
+        if queued_rows is not None:
+            key = self._row_key(op, old_value, new_value)
+            if self._size >= self.maxsize:
+                change = queued_rows.get(key)
+                if change is not None:
+                    self.coalesced += 1
+                    if not change.merge(op, old_value, new_value, reducer_event):
+                        change.op = None
+                        del queued_rows[key]
+                        self._size -= 1
+                    return
+
+        change = RowChange(op, old_value, new_value, reducer_event)
+        self._changes.append((key, change))
+        if queued_rows is not None:
+            queued_rows[key] = change
+        self._size += 1
+        if self._size > self.max_depth:
+            self.max_depth = self._size
+
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def get_nowait(self):
+        """
+        Remove and return the oldest queued change.
+
+        Raises:
+            asyncio.QueueEmpty: If no change is queued.
+        """
+        changes = self._changes
+        while changes:
+            key, change = changes.popleft()
+            if change.op is None:
+                continue
+            if self._queued_rows is not None and self._queued_rows.get(key) is change:
+                del self._queued_rows[key]
+            self._size -= 1
+            if (
+                self._on_drain is not None
+                and self.policy == "block"
+                and self._size == self.maxsize // 2
+            ):
+                self._on_drain()
+            return change
+        raise asyncio.QueueEmpty
+
+    async def get(self):
+        """
+        Wait for the next change.
+
+        Raises:
+            StopAsyncIteration: If the stream is closed and every queued change was taken.
+        """
+        while True:
+            try:
+                return self.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            if self.closed:
+                raise StopAsyncIteration
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+
+    def close(self):
+        """
+        Stop queueing changes. Changes that are already queued can still be taken, then iteration ends.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+        if self._on_close is not None:
+            self._on_close(self)
+
+    async def aclose(self):
+        self.close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.get()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,28 +1,364 @@
+import bisect
 import importlib
+import operator
 import pkgutil
+import time
+
+from spacetimedb_sdk.bsatn import BsatnReader
 
 
 def snake_to_camel(snake_case_string):
     return snake_case_string.replace("_", " ").title().replace(" ", "")
 
 
+class HashIndex:
+    """
+    Secondary index mapping a column value to the rows with that value.
+
+    Rows whose column value is not hashable (array and product columns decode to lists and dicts) are
+    kept aside and found by comparing their values.
+    """
+
+    def __init__(self, column):
+        self.column = column
+        # column value -> {row key: row}
+        self.buckets = {}
+        # row key -> row, for rows with unhashable column values
+        self.unhashable_rows = {}
+
+    def add(self, key, row):
+        value = getattr(row, self.column)
+        try:
+            bucket = self.buckets.get(value)
+        except TypeError:
+            self.unhashable_rows[key] = row
+            return
+        if bucket is None:
+            self.buckets[value] = {key: row}
+        else:
+            bucket[key] = row
+
+    def remove(self, key, row):
+        value = getattr(row, self.column)
+        try:
+            bucket = self.buckets.get(value)
+        except TypeError:
+            self.unhashable_rows.pop(key, None)
+            return
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self.buckets[value]
+
+    def get(self, value):
+        try:
+            bucket = self.buckets.get(value)
+        except TypeError:
+            bucket = None
+        rows = list(bucket.values()) if bucket is not None else []
+        if self.unhashable_rows:
+            column = self.column
+            rows.extend(
+                row for row in self.unhashable_rows.values() if getattr(row, column) == value
+            )
+        return rows
+
+
+class UniqueIndex:
+    """
+    Index mapping a primary key or unique column value to the single row with that value.
+    """
+
+    def __init__(self, column):
+        self.column = column
+        # column value -> (row key, row)
+        self.rows = {}
+
+    def add(self, key, row):
+        self.rows[getattr(row, self.column)] = (key, row)
+
+    def remove(self, key, row):
+        value = getattr(row, self.column)
+        entry = self.rows.get(value)
+        # a transaction can insert the replacement row before deleting the old one
+        if entry is not None and entry[0] == key:
+            del self.rows[value]
+
+    def get(self, value):
+        entry = self.rows.get(value)
+        if entry is None:
+            return None
+        return entry[1]
+
+
+class _AfterAll:
+    # sorts after every row key so (value, _AFTER_ALL) is past all rows with that value
+    def __lt__(self, other):
+        return False
+
+    def __gt__(self, other):
+        return True
+
+
+_AFTER_ALL = _AfterAll()
+
+
+class SortedIndex:
+    """
+    Ordered index over a column, supporting sorted iteration, range scans and top-k queries.
+
+    Column values must be comparable with each other. Rows with equal values are ordered by row key.
+
+    Added rows are buffered and merged into the ordered lists when the index is next read or a row is
+    removed: a few rows are inserted in place, many rows (a SubscriptionUpdate, building the index over
+    a full table) are sorted in once, so loading n rows costs O(n log n) instead of O(n^2).
+    """
+
+    def __init__(self, column):
+        self.column = column
+        # parallel lists ordered by (column value, row key)
+        self.sort_keys = []
+        self.rows = []
+        # sort keys and rows added since the last merge, parallel lists like the ordered ones
+        self._pending = []
+        self._pending_rows = []
+
+    def add(self, key, row):
+        self._pending.append((getattr(row, self.column), key))
+        self._pending_rows.append(row)
+
+    def _merge_pending(self):
+        pending, pending_rows = self._pending, self._pending_rows
+        self._pending, self._pending_rows = [], []
+        sort_keys, rows = self.sort_keys, self.rows
+        if len(pending) * 64 <= len(sort_keys):
+            for sort_key, row in zip(pending, pending_rows):
+                position = bisect.bisect_left(sort_keys, sort_key)
+                sort_keys.insert(position, sort_key)
+                rows.insert(position, row)
+            return
+
+        sort_keys = sort_keys + pending
+        rows = rows + pending_rows
+        # sort positions rather than (sort key, row) pairs, a pair per row would be another tracked
+        # object per row for the garbage collector. The ordered lists are one run for the sort, the
+        # pending rows are sorted and merged into it.
+        order = sorted(range(len(sort_keys)), key=sort_keys.__getitem__)
+        self.sort_keys = [sort_keys[position] for position in order]
+        self.rows = [rows[position] for position in order]
+
+    def remove(self, key, row):
+        if self._pending:
+            self._merge_pending()
+        sort_key = (getattr(row, self.column), key)
+        position = bisect.bisect_left(self.sort_keys, sort_key)
+        if position < len(self.sort_keys) and self.sort_keys[position] == sort_key:
+            del self.sort_keys[position]
+            del self.rows[position]
+
+    def iter(self, reverse=False):
+        if self._pending:
+            self._merge_pending()
+        if reverse:
+            return reversed(self.rows)
+        return iter(self.rows)
+
+    def range(
+        self, low=None, high=None, include_low=True, include_high=False, reverse=False
+    ):
+        if self._pending:
+            self._merge_pending()
+        if low is None:
+            start = 0
+        elif include_low:
+            start = bisect.bisect_left(self.sort_keys, (low,))
+        else:
+            start = bisect.bisect_right(self.sort_keys, (low, _AFTER_ALL))
+
+        if high is None:
+            end = len(self.sort_keys)
+        elif include_high:
+            end = bisect.bisect_right(self.sort_keys, (high, _AFTER_ALL))
+        else:
+            end = bisect.bisect_left(self.sort_keys, (high,))
+
+        rows = self.rows[start:end]
+        if reverse:
+            rows.reverse()
+        return rows
+
+    def top_k(self, k, largest=True):
+        if self._pending:
+            self._merge_pending()
+        if largest:
+            return self.rows[: -k - 1 : -1] if k > 0 else []
+        return self.rows[:k]
+
+
 class TableCache:
+    # rows are stored decoded, see LazyTableCache
+    lazy = False
+
     def __init__(self, table_class):
         self.entries = {}
         self.table_class = table_class
+        self.indexes = {}
+        self.unique_indexes = {}
+        self.sorted_indexes = {}
+        # every index that has to be updated when a row is set or deleted
+        self.index_maintainers = []
+
+        self.primary_key = getattr(table_class, "primary_key", None)
+        if self.primary_key is not None:
+            self.create_unique_index(self.primary_key)
+        for column in getattr(table_class, "unique_columns", ()):
+            self.create_unique_index(column)
+
+        # generated table classes can declare the columns to index up front
+        for column in getattr(table_class, "indexed_columns", ()):
+            self.create_index(column)
+        for column in getattr(table_class, "sorted_columns", ()):
+            self.create_sorted_index(column)
+
+    def empty_copy(self):
+        """
+        Returns an empty table cache of the same type with the same indexes.
+        """
+        table_cache = type(self)(self.table_class)
+        for column in self.unique_indexes:
+            table_cache.create_unique_index(column)
+        for column in self.indexes:
+            table_cache.create_index(column)
+        for column in self.sorted_indexes:
+            table_cache.create_sorted_index(column)
+        return table_cache
+
+    def _add_index(self, index):
+        for key, row in self.entries.items():
+            index.add(key, row)
+        self.index_maintainers.append(index)
+        return index
+
+    def create_unique_index(self, column):
+        """
+        Create a unique index on a primary key or unique column, or return the existing one.
+        """
+        index = self.unique_indexes.get(column)
+        if index is None:
+            index = self._add_index(UniqueIndex(column))
+            self.unique_indexes[column] = index
+        return index
+
+    def create_index(self, column):
+        """
+        Create a hash index on a column, or return the existing one. The index is kept up to date as rows are set and deleted.
+        """
+        index = self.indexes.get(column)
+        if index is None:
+            index = self._add_index(HashIndex(column))
+            self.indexes[column] = index
+        return index
+
+    def filter_by(self, column, value):
+        """
+        Returns a list of the rows whose column equals value, using a hash index that is created on first use.
+        """
+        index = self.indexes.get(column)
+        if index is None:
+            index = self.create_index(column)
+        return index.get(value)
+
+    def create_sorted_index(self, column):
+        """
+        Create an ordered index on a column, or return the existing one. The index is kept up to date as rows are set and deleted.
+        """
+        index = self.sorted_indexes.get(column)
+        if index is None:
+            index = self._add_index(SortedIndex(column))
+            self.sorted_indexes[column] = index
+        return index
+
+    def iter_sorted(self, column, reverse=False):
+        """
+        Returns an iterator over the rows ordered by column, using an ordered index that is created on first use.
+
+        The table must not be modified while the iterator is in use.
+        """
+        return self.create_sorted_index(column).iter(reverse)
+
+    def range_scan(
+        self,
+        column,
+        low=None,
+        high=None,
+        include_low=True,
+        include_high=False,
+        reverse=False,
+    ):
+        """
+        Returns a list of the rows whose column is between low and high, ordered by column.
+
+        Args:
+            column (str): The column to scan.
+            low (optional): Lower bound, None for no lower bound.
+            high (optional): Upper bound, None for no upper bound.
+            include_low (bool): Whether rows equal to low are included. Default: True
+            include_high (bool): Whether rows equal to high are included. Default: False
+            reverse (bool): Return the rows in descending order. Default: False
+        """
+        return self.create_sorted_index(column).range(
+            low, high, include_low, include_high, reverse
+        )
+
+    def top_k(self, column, k, largest=True):
+        """
+        Returns the k rows with the largest (or smallest) column values, in that order.
+        """
+        return self.create_sorted_index(column).top_k(k, largest)
+
+    def get_by_pk(self, value):
+        """
+        Returns the row whose declared primary key equals value, or None.
+        """
+        if self.primary_key is None:
+            print(f"[get_by_pk] Error, table has no primary key. ({self.table_class.__name__})")
+            return None
+        return self.unique_indexes[self.primary_key].get(value)
+
+    def find_by(self, column, value):
+        """
+        Returns the single row whose unique column equals value, or None.
+
+        Falls back to the first matching row of a hash index if the column was not declared unique.
+        """
+        index = self.unique_indexes.get(column)
+        if index is not None:
+            return index.get(value)
+        return next(iter(self.filter_by(column, value)), None)
 
     def decode(self, value):
         return self.table_class(value)
 
+    def decode_bsatn(self, data):
+        return self.table_class.from_bsatn(BsatnReader(data))
+
     def set_entry(self, key, value):
-        self.entries[key] = self.decode(value)
+        self.set_entry_decoded(key, self.decode(value))
 
     def set_entry_decoded(self, key, decoded_value):
+        if self.index_maintainers:
+            old_value = self.entries.get(key)
+            for index in self.index_maintainers:
+                if old_value is not None:
+                    index.remove(key, old_value)
+                index.add(key, decoded_value)
         self.entries[key] = decoded_value
 
     def delete_entry(self, key):
         if key in self.entries:
-            del self.entries[key]
+            old_value = self.entries.pop(key)
+            for index in self.index_maintainers:
+                index.remove(key, old_value)
         else:
             print(f"[delete_entry] Error, key not found. ({key})")
 
@@ -34,10 +370,340 @@ class TableCache:
         return self.entries.values()
 
 
+class LazyTableCache(TableCache):
+    """
+    TableCache that stores rows as they were received (JSON values or BSATN bytes) and decodes them on first access.
+
+    While the table has no indexes and no callbacks, applying updates stores the raw rows, so rows that are
+    never read are never decoded. get_entry(), values() and the indexes return decoded rows, and a decoded
+    row replaces the raw one in the cache. Creating an index decodes the whole table, tables with a primary
+    key or declared indexes therefore behave like a TableCache.
+    """
+
+    lazy = True
+
+    def decode_raw(self, raw_value):
+        if isinstance(raw_value, (bytes, bytearray, memoryview)):
+            return self.decode_bsatn(raw_value)
+        return self.decode(raw_value)
+
+    def decode_all(self):
+        """
+        Decode every raw row of the table.
+        """
+        table_class = self.table_class
+        entries = self.entries
+        for key, value in entries.items():
+            if type(value) is not table_class:
+                entries[key] = self.decode_raw(value)
+
+    def _add_index(self, index):
+        self.decode_all()
+        return super()._add_index(index)
+
+    def set_entry(self, key, value):
+        self.set_entry_decoded(key, value)
+
+    def set_entry_decoded(self, key, decoded_value):
+        # raw rows are accepted too, they are decoded if an index needs them
+        if self.index_maintainers and type(decoded_value) is not self.table_class:
+            decoded_value = self.decode_raw(decoded_value)
+        super().set_entry_decoded(key, decoded_value)
+
+    def get_entry(self, key):
+        value = self.entries.get(key)
+        if value is not None and type(value) is not self.table_class:
+            value = self.entries[key] = self.decode_raw(value)
+        return value
+
+    def values(self):
+        self.decode_all()
+        return self.entries.values()
+
+
+class TableApplyPlan:
+    """
+    Precomputed state used by SpacetimeDBClient._do_update to apply the events of one table.
+
+    Holds direct references to the table's entries dict, index maintainers and callback lists and a
+    compiled primary key accessor, so applying events does no per-event lookups.
+    """
+
+    def __init__(self, table_name, table_cache):
+        self.table_name = table_name
+        self.table_cache = table_cache
+        self.entries = table_cache.entries
+        # shared with TableCache, indexes created later are picked up automatically
+        self.index_maintainers = table_cache.index_maintainers
+        self.primary_key = table_cache.primary_key
+        self.primary_key_getter = (
+            operator.attrgetter(table_cache.primary_key)
+            if table_cache.primary_key is not None
+            else None
+        )
+        # plain TableCache entries can be written directly, other storage goes through its methods
+        self.direct = type(table_cache) is TableCache
+        self.lazy = table_cache.lazy
+        if self.lazy:
+            # rows are decoded before they are indexed or passed to callbacks
+            self.direct = True
+        self.set_entry = table_cache.set_entry_decoded
+        self.delete_entry = table_cache.delete_entry
+
+        # owned by the plan, SpacetimeDBClient registers callbacks into these lists
+        self.row_update_callbacks = []
+        self.table_update_callbacks = []
+
+    def apply(self, table_events):
+        """
+        Apply a table's events to the cache and return them, with matching delete/insert pairs merged into updates.
+        """
+        if self.lazy and not self.needs_decoded_rows():
+            self._apply_raw(table_events)
+            return table_events
+
+        get_old_value = self.old_value_getter()
+        for db_event in table_events:
+            # get the old value for sending callbacks
+            db_event.old_value = get_old_value(db_event.row_pk)
+
+        if self.primary_key_getter is not None:
+            table_events = self._merge_updates(table_events)
+
+        self.apply_prepared(table_events)
+        return table_events
+
+    def apply_prepared(self, table_events):
+        """
+        Apply events whose old values are already set and whose updates are already merged, see apply().
+        """
+        if self.lazy and not self.needs_decoded_rows():
+            self._apply_raw(table_events)
+        elif self.direct:
+            # same as TableCache.set_entry_decoded / delete_entry, inlined
+            entries = self.entries
+            index_maintainers = self.index_maintainers
+            for db_event in table_events:
+                row_op = db_event.row_op
+                if row_op != "insert":
+                    # deletes remove the row, updates remove the old row
+                    row_pk = db_event.row_pk if row_op == "delete" else db_event.old_pk
+                    old_value = entries.pop(row_pk, None)
+                    if old_value is None:
+                        print(f"[delete_entry] Error, key not found. ({row_pk})")
+                    else:
+                        for index in index_maintainers:
+                            index.remove(row_pk, old_value)
+                if row_op != "delete":
+                    row_pk = db_event.row_pk
+                    new_value = db_event.decoded_value
+                    if index_maintainers:
+                        replaced_value = entries.get(row_pk)
+                        for index in index_maintainers:
+                            if replaced_value is not None:
+                                index.remove(row_pk, replaced_value)
+                            index.add(row_pk, new_value)
+                    entries[row_pk] = new_value
+        else:
+            set_entry = self.set_entry
+            delete_entry = self.delete_entry
+            for db_event in table_events:
+                row_op = db_event.row_op
+                if row_op == "delete":
+                    delete_entry(db_event.row_pk)
+                else:
+                    if row_op == "update":
+                        delete_entry(db_event.old_pk)
+                    set_entry(db_event.row_pk, db_event.decoded_value)
+
+    def needs_decoded_rows(self):
+        """
+        Returns True if applying events needs decoded rows: the table is not lazy, or it has indexes or callbacks.
+        """
+        return not self.lazy or bool(
+            self.index_maintainers
+            or self.row_update_callbacks
+            or self.table_update_callbacks
+        )
+
+    def old_value_getter(self):
+        """
+        Returns a function that looks up the cached row of a row pk, decoding it if the table is lazy.
+        """
+        if self.lazy:
+            return self.table_cache.get_entry
+        return self.entries.get
+
+    def _apply_raw(self, table_events):
+        # lazy table without indexes or callbacks: store rows undecoded, there are no updates to merge
+        entries = self.entries
+        for db_event in table_events:
+            if db_event.row_op == "insert":
+                entries[db_event.row_pk] = db_event.cache_value
+            elif entries.pop(db_event.row_pk, None) is None:
+                print(f"[delete_entry] Error, key not found. ({db_event.row_pk})")
+
+    def _merge_updates(self, table_events):
+        # this table has a primary key, find table updates by looking for matching insert/delete events
+        primary_key_getter = self.primary_key_getter
+        primary_key_row_ops = {}
+
+        for db_event in table_events:
+            if db_event.row_op == "insert":
+                primary_key_value = primary_key_getter(db_event.decoded_value)
+            elif db_event.old_value is not None:
+                primary_key_value = primary_key_getter(db_event.old_value)
+            else:
+                # delete of a row that is not cached, there is nothing to pair it with
+                primary_key_row_ops[object()] = db_event
+                continue
+
+            other_db_event = primary_key_row_ops.get(primary_key_value)
+            if other_db_event is None:
+                primary_key_row_ops[primary_key_value] = db_event
+            elif db_event.row_op == "insert" and other_db_event.row_op == "delete":
+                # this is a row update so we need to replace the insert
+                db_event.row_op = "update"
+                db_event.old_pk = other_db_event.row_pk
+                db_event.old_value = other_db_event.old_value
+                primary_key_row_ops[primary_key_value] = db_event
+            elif db_event.row_op == "delete" and other_db_event.row_op == "insert":
+                # the insert was the row update so just upgrade it to update
+                other_db_event.row_op = "update"
+                other_db_event.old_pk = db_event.row_pk
+                other_db_event.old_value = db_event.old_value
+            else:
+                print(
+                    f"Error: duplicate primary key {self.table_name}:{primary_key_value}"
+                )
+
+        return list(primary_key_row_ops.values())
+
+
+class StagedSubscriptionUpdate:
+    """
+    Applies the events of a large SubscriptionUpdate in bounded steps without changing what readers see.
+
+    Every table the update touches is rebuilt in an empty copy of its TableCache: the cached rows are
+    copied over, then the events are applied to the copy in chunks. Until swap() replaces the tables of
+    the ClientCache with their copies, the cache keeps serving the state from before the update.
+
+    The ClientCache must not be changed by anything else between the first step() and swap().
+
+    Args:
+        client_cache (ClientCache): The cache to update.
+        events (Dict[str, List[DbEvent]]): The decoded events of the SubscriptionUpdate per table. The lists
+            are replaced with the applied events, with updates merged, as the tables are done.
+    """
+
+    chunk_size = 1024
+
+    def __init__(self, client_cache, events):
+        self.client_cache = client_cache
+        self.events = events
+        self.staged_tables = {}
+        self.applied = 0
+        self.total = sum(
+            len(client_cache.tables[table_name].entries) + len(table_events)
+            for table_name, table_events in events.items()
+        )
+        self.done = False
+        # time spent in step() so far
+        self.seconds = 0.0
+        # shrunk by step() when chunks of chunk_size rows would overrun a deadline
+        self._chunk_size = self.chunk_size
+        self._chunks = self._chunk_steps()
+
+    def step(self, max_events=None, deadline=None):
+        """
+        Apply chunks until max_events rows were processed, time.perf_counter() passes deadline or the update is done.
+
+        At least one chunk is applied per call, so every call makes progress.
+
+        Returns:
+            int: The number of rows processed.
+        """
+        started_at = chunk_started_at = time.perf_counter()
+        # aim for chunks of a quarter of the time budget so a slow table does not overrun it much
+        chunk_budget = (deadline - started_at) / 4 if deadline is not None else None
+        processed = 0
+        for chunk_length in self._chunks:
+            processed += chunk_length
+            if max_events is not None and processed >= max_events:
+                break
+            if deadline is not None:
+                now = time.perf_counter()
+                if chunk_length:
+                    seconds_per_row = (now - chunk_started_at) / chunk_length
+                    self._chunk_size = max(
+                        16,
+                        min(self.chunk_size, int(chunk_budget / max(seconds_per_row, 1e-9))),
+                    )
+                if now >= deadline:
+                    break
+                chunk_started_at = now
+        else:
+            self.done = True
+        self.applied += processed
+        self.seconds += time.perf_counter() - started_at
+        return processed
+
+    def _chunk_steps(self):
+        for table_name, table_events in self.events.items():
+            live_plan = self.client_cache.apply_plans[table_name]
+            staged_cache = self.client_cache.tables[table_name].empty_copy()
+            staged_plan = TableApplyPlan(table_name, staged_cache)
+
+            rows = list(live_plan.entries.items())
+            start = 0
+            while start < len(rows):
+                chunk = rows[start : start + self._chunk_size]
+                for row_pk, row in chunk:
+                    staged_cache.set_entry_decoded(row_pk, row)
+                start += len(chunk)
+                yield len(chunk)
+
+            if any(db_event.row_op == "delete" for db_event in table_events):
+                # deletes have to be paired with inserts across the whole table before applying in chunks
+                get_old_value = live_plan.old_value_getter()
+                for db_event in table_events:
+                    db_event.old_value = get_old_value(db_event.row_pk)
+                if live_plan.primary_key_getter is not None:
+                    table_events = live_plan._merge_updates(table_events)
+                apply_chunk = staged_plan.apply_prepared
+            else:
+                # nothing to pair, the copy has the same rows as the live table
+                apply_chunk = staged_plan.apply
+
+            # applying costs more per row than copying, restart small and let step() size the chunks
+            self._chunk_size = min(self._chunk_size, 64)
+            applied_events = []
+            start = 0
+            while start < len(table_events):
+                chunk = table_events[start : start + self._chunk_size]
+                applied_chunk = apply_chunk(chunk)
+                applied_events.extend(chunk if applied_chunk is None else applied_chunk)
+                start += len(chunk)
+                yield len(chunk)
+
+            self.events[table_name] = applied_events
+            self.staged_tables[table_name] = staged_cache
+
+    def swap(self):
+        """
+        Replace the tables of the ClientCache with their updated copies.
+        """
+        for table_name, staged_cache in self.staged_tables.items():
+            self.client_cache.replace_table(table_name, staged_cache)
+
+
 class ClientCache:
-    def __init__(self, autogen_package):
+    def __init__(self, autogen_package, columnar_tables=None, lazy_tables=None):
         self.tables = {}
         self.reducer_cache = {}
+        self.reducer_bsatn_decoders = {}
+        self.reducer_bsatn_encoders = {}
+        self.supports_bsatn = True
 
         for importer, module_name, is_package in pkgutil.iter_modules(
             autogen_package.__path__
@@ -52,6 +718,15 @@ class ClientCache:
                     reducer_name = getattr(module, "reducer_name")
                     args_class = getattr(module, "_decode_args")
                     self.reducer_cache[reducer_name] = args_class
+
+                    # binary protocol support is only available if every module was generated with it
+                    bsatn_decoder = getattr(module, "_decode_args_bsatn", None)
+                    bsatn_encoder = getattr(module, "_encode_args_bsatn", None)
+                    if bsatn_decoder is None or bsatn_encoder is None:
+                        self.supports_bsatn = False
+                    else:
+                        self.reducer_bsatn_decoders[reducer_name] = bsatn_decoder
+                        self.reducer_bsatn_encoders[reducer_name] = bsatn_encoder
                 else:
                     # Assuming table class name is the same as the module name
                     table_class_name = snake_to_camel(module_name)
@@ -61,11 +736,44 @@ class ClientCache:
 
                         # Check for a special property, e.g. 'is_table_class'
                         if getattr(table_class, "is_table_class", False):
-                            self.tables[table_class_name] = TableCache(table_class)
+                            if columnar_tables and table_class_name in columnar_tables:
+                                from spacetimedb_sdk.columnar_cache import (
+                                    ColumnarTableCache,
+                                )
+
+                                self.tables[table_class_name] = ColumnarTableCache(
+                                    table_class
+                                )
+                            elif lazy_tables is True or (
+                                lazy_tables and table_class_name in lazy_tables
+                            ):
+                                self.tables[table_class_name] = LazyTableCache(
+                                    table_class
+                                )
+                            else:
+                                self.tables[table_class_name] = TableCache(table_class)
+                            if not hasattr(table_class, "from_bsatn"):
+                                self.supports_bsatn = False
+
+        self.apply_plans = {
+            table_name: TableApplyPlan(table_name, table_cache)
+            for table_name, table_cache in self.tables.items()
+        }
 
     def get_table_cache(self, table_name):
         return self.tables[table_name]
 
+    def replace_table(self, table_name, table_cache):
+        """
+        Replace the cache of a table, keeping the callbacks registered on its apply plan.
+        """
+        old_plan = self.apply_plans[table_name]
+        apply_plan = TableApplyPlan(table_name, table_cache)
+        apply_plan.row_update_callbacks = old_plan.row_update_callbacks
+        apply_plan.table_update_callbacks = old_plan.table_update_callbacks
+        self.tables[table_name] = table_cache
+        self.apply_plans[table_name] = apply_plan
+
     def decode(self, table_name, value):
         if not table_name in self.tables:
             print(f"[decode] Error, table not found. ({table_name})")
@@ -73,6 +781,13 @@ class ClientCache:
 
         return self.tables[table_name].decode(value)
 
+    def decode_bsatn(self, table_name, data):
+        if not table_name in self.tables:
+            print(f"[decode_bsatn] Error, table not found. ({table_name})")
+            return
+
+        return self.tables[table_name].decode_bsatn(data)
+
     def set_entry(self, table_name, key, value):
         if not table_name in self.tables:
             print(f"[set_entry] Error, table not found. ({table_name})")
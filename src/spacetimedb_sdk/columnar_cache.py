@@ -0,0 +1,286 @@
+""" Columnar table storage backed by NumPy arrays.
+
+ColumnarTableCache stores a table as one array per column instead of one Python object per row.
+Numeric columns (bool, int, float) use NumPy arrays of that dtype, other columns (identities,
+strings, options) use object arrays. Filters, aggregates and bulk export are vectorized, while
+iter(), get_entry() and row update callbacks still receive regular table class rows, built on
+demand from the column arrays.
+
+Requires numpy:
+
+    pip install spacetimedb_sdk[columnar]
+
+Example:
+
+    spacetime_client = SpacetimeDBAsyncClient(module_bindings, columnar_tables=["Message"])
+
+    messages = spacetime_client.client._get_table_cache("Message")
+    sent = messages.column("sent")
+    print(sent.min(), sent.max(), messages.aggregate("sent", np.mean))
+"""
+
+from collections.abc import Mapping
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from spacetimedb_sdk.client_cache import TableCache
+
+_INITIAL_CAPACITY = 64
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+
+def _dtype_for(value):
+    if type(value) is bool:
+        return np.bool_
+    if type(value) is int and _INT64_MIN <= value <= _INT64_MAX:
+        return np.int64
+    if type(value) is float:
+        return np.float64
+    return object
+
+
+def _fits(dtype, value):
+    if dtype is object:
+        return True
+    if dtype is np.bool_:
+        return type(value) is bool
+    if dtype is np.int64:
+        return type(value) is int and _INT64_MIN <= value <= _INT64_MAX
+    return type(value) is float
+
+
+class _ColumnarEntries(Mapping):
+    # read-only row key -> row mapping so code reading TableCache.entries keeps working
+    def __init__(self, table_cache):
+        self._table_cache = table_cache
+
+    def __getitem__(self, key):
+        return self._table_cache._row(self._table_cache._slots[key])
+
+    def __contains__(self, key):
+        return key in self._table_cache._slots
+
+    def __iter__(self):
+        return iter(self._table_cache._slots)
+
+    def __len__(self):
+        return len(self._table_cache._slots)
+
+
+class ColumnarTableCache(TableCache):
+    """
+    TableCache that stores rows as column arrays.
+
+    Lookups through filter_by, find_by, get_by_pk and the sorted queries are answered with
+    vectorized scans instead of per-row indexes, so no per-row objects are kept alive.
+    Rows handed out by iter(), get_entry() and callbacks are snapshots built from the arrays.
+    """
+
+    def __init__(self, table_class):
+        if np is None:
+            raise ImportError(
+                "ColumnarTableCache requires numpy, install it with: pip install spacetimedb_sdk[columnar]"
+            )
+
+        self._slots = {}
+        self._free_slots = []
+        self._size = 0
+        self._capacity = 0
+        self._live = np.zeros(0, dtype=np.bool_)
+        self._arrays = {}
+        self._dtypes = {}
+        self._slotted = hasattr(table_class, "__slots__")
+        self.column_names = list(getattr(table_class, "__slots__", ()))
+
+        super().__init__(table_class)
+        self.entries = _ColumnarEntries(self)
+
+    # lookups are vectorized, so the row object indexes of TableCache are not built
+    def create_index(self, column):
+        return None
+
+    def create_unique_index(self, column):
+        return None
+
+    def create_sorted_index(self, column):
+        return None
+
+    def _ensure_columns(self, row):
+        # column dtypes are inferred from the first row
+        if not self.column_names:
+            # table classes generated before __slots__ keep their fields in a data dict
+            self.column_names = list(row.data.keys())
+        for column in self.column_names:
+            dtype = _dtype_for(getattr(row, column))
+            self._dtypes[column] = dtype
+            self._arrays[column] = np.empty(self._capacity, dtype=dtype)
+
+    def _grow(self):
+        capacity = max(_INITIAL_CAPACITY, self._capacity * 2)
+        for column, array in self._arrays.items():
+            grown = np.empty(capacity, dtype=array.dtype)
+            grown[: self._capacity] = array
+            self._arrays[column] = grown
+        live = np.zeros(capacity, dtype=np.bool_)
+        live[: self._capacity] = self._live
+        self._live = live
+        self._capacity = capacity
+
+    def _store(self, slot, row):
+        for column in self.column_names:
+            value = getattr(row, column)
+            if not _fits(self._dtypes[column], value):
+                # e.g. an int column that received a value beyond int64 or a None
+                self._arrays[column] = self._arrays[column].astype(object)
+                self._dtypes[column] = object
+            self._arrays[column][slot] = value
+
+    def _row(self, slot):
+        row = self.table_class.__new__(self.table_class)
+        data = {}
+        for column in self.column_names:
+            value = self._arrays[column][slot]
+            if self._dtypes[column] is not object:
+                value = value.item()
+            data[column] = value
+
+        if self._slotted:
+            for column, value in data.items():
+                setattr(row, column, value)
+        else:
+            row.data = data
+        return row
+
+    def _live_slots(self):
+        return np.flatnonzero(self._live[: self._size])
+
+    def set_entry_decoded(self, key, decoded_value):
+        if not self._arrays:
+            self._ensure_columns(decoded_value)
+        slot = self._slots.get(key)
+        if slot is None:
+            if self._free_slots:
+                slot = self._free_slots.pop()
+            else:
+                if self._size == self._capacity:
+                    self._grow()
+                slot = self._size
+                self._size += 1
+            self._slots[key] = slot
+            self._live[slot] = True
+        self._store(slot, decoded_value)
+
+    def delete_entry(self, key):
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            print(f"[delete_entry] Error, key not found. ({key})")
+            return
+        self._live[slot] = False
+        for column, array in self._arrays.items():
+            if array.dtype == object:
+                # drop the reference so the value can be freed
+                array[slot] = None
+        self._free_slots.append(slot)
+
+    def get_entry(self, key):
+        slot = self._slots.get(key)
+        if slot is not None:
+            return self._row(slot)
+
+    def values(self):
+        return [self._row(slot) for slot in self._live_slots()]
+
+    def column(self, name):
+        """
+        Returns a NumPy array with the values of a column for every row, in the same order as values().
+        """
+        if name not in self._arrays:
+            return np.empty(0)
+        return self._arrays[name][: self._size][self._live[: self._size]]
+
+    def to_arrays(self):
+        """
+        Bulk export of the table as a dict of column name to NumPy array, in the same order as values().
+        """
+        return {name: self.column(name) for name in self.column_names}
+
+    def where(self, mask):
+        """
+        Returns the rows selected by a boolean mask aligned with column() / values().
+        """
+        slots = self._live_slots()[np.asarray(mask, dtype=np.bool_)]
+        return [self._row(slot) for slot in slots]
+
+    def aggregate(self, name, function):
+        """
+        Apply a NumPy reduction (for example np.sum or np.mean) to a column.
+        """
+        return function(self.column(name))
+
+    def _equal_slots(self, column, value):
+        if column not in self._arrays:
+            return []
+        live = self._live_slots()
+        values = self._arrays[column][live]
+        if values.dtype == object:
+            mask = np.fromiter((item == value for item in values), np.bool_, len(values))
+        else:
+            mask = values == value
+        return live[mask]
+
+    def filter_by(self, column, value):
+        return [self._row(slot) for slot in self._equal_slots(column, value)]
+
+    def find_by(self, column, value):
+        slots = self._equal_slots(column, value)
+        if len(slots) == 0:
+            return None
+        return self._row(slots[0])
+
+    def get_by_pk(self, value):
+        if self.primary_key is None:
+            print(f"[get_by_pk] Error, table has no primary key. ({self.table_class.__name__})")
+            return None
+        return self.find_by(self.primary_key, value)
+
+    def _sorted_slots(self, column, low, high, include_low, include_high):
+        live = self._live_slots()
+        if column not in self._arrays:
+            return live
+        values = self._arrays[column][live]
+        mask = np.ones(len(live), dtype=np.bool_)
+        if low is not None:
+            mask &= values >= low if include_low else values > low
+        if high is not None:
+            mask &= values <= high if include_high else values < high
+        live = live[mask]
+        return live[np.argsort(values[mask], kind="stable")]
+
+    def iter_sorted(self, column, reverse=False):
+        slots = self._sorted_slots(column, None, None, True, False)
+        if reverse:
+            slots = slots[::-1]
+        return (self._row(slot) for slot in slots)
+
+    def range_scan(
+        self,
+        column,
+        low=None,
+        high=None,
+        include_low=True,
+        include_high=False,
+        reverse=False,
+    ):
+        slots = self._sorted_slots(column, low, high, include_low, include_high)
+        if reverse:
+            slots = slots[::-1]
+        return [self._row(slot) for slot in slots]
+
+    def top_k(self, column, k, largest=True):
+        slots = self._sorted_slots(column, None, None, True, False)
+        slots = slots[::-1][:k] if largest else slots[:k]
+        return [self._row(slot) for slot in slots]
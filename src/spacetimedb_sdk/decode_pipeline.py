@@ -0,0 +1,138 @@
+""" Bounded, ordered decode pipeline for incoming websocket frames.
+
+Frames are submitted by the websocket reader thread, decoded by a fixed pool of worker
+threads and delivered in the exact order they were received, no matter which worker
+finished first. When max_pending frames are waiting to be decoded, submit() blocks the
+reader thread, which applies backpressure to the socket instead of growing without bound.
+
+This module is intended for internal use by WebSocketClient.
+"""
+
+import queue
+import threading
+import traceback
+
+_STOP = object()
+
+
+class OrderedDecodePipeline:
+    """
+    Decodes frames on worker threads and delivers the results in submission order.
+
+    Args:
+        decode (Callable[[object], object]): Called on a worker thread with each submitted frame.
+        deliver (Callable[[object], None], optional): Called with each decode result, in submission order.
+            Results that are None are not delivered.
+        workers (int): Number of decode worker threads. Default: 1
+        max_pending (int): Maximum number of frames waiting to be decoded before submit blocks. Default: 1024
+    """
+
+    def __init__(self, decode, deliver=None, workers=1, max_pending=1024):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        self._decode = decode
+        self._deliver = deliver
+        self.workers = workers
+        self.max_pending = max_pending
+
+        self._input_queue = queue.Queue(maxsize=max_pending)
+        self._threads = []
+
+        self._lock = threading.Lock()
+        self._next_submit_seq = 0
+        self._next_deliver_seq = 0
+        self._results = {}
+
+        self._max_queue_depth = 0
+        self._max_reorder_depth = 0
+        self._delivered = 0
+        self._errors = 0
+
+    def start(self):
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker, name=f"spacetimedb-decode-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """
+        Stop the workers after all frames submitted so far have been delivered.
+        """
+        for _ in self._threads:
+            self._input_queue.put((None, _STOP))
+        self._threads = []
+
+    def submit(self, frame):
+        """
+        Queue a frame for decoding. Blocks while max_pending frames are already queued.
+
+        Must only be called from a single thread (the websocket reader).
+        """
+        seq = self._next_submit_seq
+        self._next_submit_seq += 1
+        self._input_queue.put((seq, frame))
+
+        depth = self._input_queue.qsize()
+        if depth > self._max_queue_depth:
+            self._max_queue_depth = depth
+
+    def stats(self):
+        """
+        Returns a dict with the pipeline queue depth metrics.
+
+        Keys:
+            queue_depth : frames waiting to be decoded
+            max_queue_depth : highest queue_depth seen
+            reorder_depth : decoded frames waiting for an earlier frame to finish
+            max_reorder_depth : highest reorder_depth seen
+            submitted : frames submitted
+            delivered : frames decoded and delivered
+            errors : frames whose decode raised an exception
+            workers : number of decode workers
+        """
+        # read without the lock: a delivery blocked on a full client message queue holds it
+        return {
+            "queue_depth": self._input_queue.qsize(),
+            "max_queue_depth": self._max_queue_depth,
+            "reorder_depth": len(self._results),
+            "max_reorder_depth": self._max_reorder_depth,
+            "submitted": self._next_submit_seq,
+            "delivered": self._delivered,
+            "errors": self._errors,
+            "workers": self.workers,
+        }
+
+    def _worker(self):
+        while True:
+            seq, frame = self._input_queue.get()
+            if frame is _STOP:
+                return
+
+            try:
+                result = self._decode(frame)
+                failed = False
+            except Exception:
+                traceback.print_exc()
+                result = None
+                failed = True
+
+            with self._lock:
+                if failed:
+                    self._errors += 1
+                self._results[seq] = result
+                if len(self._results) > self._max_reorder_depth:
+                    self._max_reorder_depth = len(self._results)
+
+                # deliver every result that is now contiguous with what was already delivered
+                while self._next_deliver_seq in self._results:
+                    ready = self._results.pop(self._next_deliver_seq)
+                    self._next_deliver_seq += 1
+                    self._delivered += 1
+                    if ready is not None and self._deliver is not None:
+                        try:
+                            self._deliver(ready)
+                        except Exception:
+                            traceback.print_exc()
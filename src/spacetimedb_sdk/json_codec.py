@@ -0,0 +1,154 @@
+""" Pluggable JSON codecs for the v1.text.spacetimedb protocol.
+
+The SDK decodes every text message and encodes every reducer call and subscription request
+through a JsonCodec. The default is the standard library json module. orjson and ujson parse and
+serialize text frames faster and are opt-in, by name or with "auto" for the fastest installed one:
+
+    orjson -> ujson -> json (standard library)
+
+Only the standard library handles integers wider than 64 bits. orjson parses them as floats, so
+u128, i128 and u256 column values lose precision, and both fast backends reject them when
+serializing (OrjsonCodec and UjsonCodec serialize such values with the standard library instead).
+Keep the default for modules with such columns.
+
+Example:
+
+    from spacetimedb_sdk.json_codec import get_json_codec
+
+    codec = get_json_codec("orjson")
+    spacetime_client = SpacetimeDBAsyncClient(module_bindings, json_codec=codec)
+"""
+
+import json
+
+
+class JsonCodec:
+    """
+    JSON codec backed by the standard library json module. Subclasses override loads and dumps
+    to use a faster backend.
+
+    Attributes:
+        name (str): Name of the codec backend.
+    """
+
+    name = "json"
+
+    def loads(self, data):
+        """
+        Parse a JSON document.
+
+        Args:
+            data (str | bytes): The JSON document.
+
+        Returns:
+            The parsed value.
+        """
+        return json.loads(data)
+
+    def dumps(self, value):
+        """
+        Serialize a value to a JSON string.
+
+        Args:
+            value: The value to serialize.
+
+        Returns:
+            str: The JSON document.
+        """
+        return json.dumps(value)
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._loads = orjson.loads
+        self._dumps = orjson.dumps
+
+    def loads(self, data):
+        return self._loads(data)
+
+    def dumps(self, value):
+        try:
+            # orjson returns bytes
+            return self._dumps(value).decode("utf-8")
+        except TypeError:
+            # "Integer exceeds 64-bit range", and anything else orjson can not serialize
+            return json.dumps(value)
+
+
+class UjsonCodec(JsonCodec):
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+
+        self._loads = ujson.loads
+        self._dumps = ujson.dumps
+
+    def loads(self, data):
+        return self._loads(data)
+
+    def dumps(self, value):
+        try:
+            return self._dumps(value)
+        except OverflowError:
+            # integers wider than 64 bits
+            return json.dumps(value)
+
+
+_CODECS = {
+    "orjson": OrjsonCodec,
+    "ujson": UjsonCodec,
+    "json": JsonCodec,
+}
+
+
+def available_json_codecs():
+    """
+    Returns the names of the JSON codec backends that can be used in this environment, fastest first.
+    """
+    available = []
+    for name, codec_class in _CODECS.items():
+        try:
+            codec_class()
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+
+def get_json_codec(codec=None):
+    """
+    Resolve a JSON codec.
+
+    Args:
+        codec (str | JsonCodec, optional): A codec instance, a backend name ("orjson", "ujson" or "json"),
+            or "auto" to pick the fastest installed backend. Default: the standard library json module
+
+    Returns:
+        JsonCodec: The codec instance.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+        ImportError: If the requested backend is not installed.
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+
+    if codec is None:
+        return JsonCodec()
+
+    if codec == "auto":
+        for codec_class in _CODECS.values():
+            try:
+                return codec_class()
+            except ImportError:
+                continue
+
+    if codec not in _CODECS:
+        raise ValueError(f"Unknown JSON codec: {codec}")
+
+    return _CODECS[codec]()
@@ -0,0 +1,203 @@
+""" Bounded queue of decoded messages waiting for SpacetimeDBClient.update().
+
+Without a bound, a client whose update() loop falls behind the server keeps every decoded message
+in memory until the process runs out of it. MessageQueue takes a maximum size and an overflow
+policy that decides what happens to messages arriving while it is full:
+
+    block      : put() waits until update() makes room. The decode thread stalls, the socket reader
+                 stalls behind it and TCP flow control pushes back on the server.
+    coalesce   : the message is merged into the newest queued message (see
+                 TransactionUpdateMessage.coalesce), so memory is bounded by the rows that changed
+                 instead of the number of transactions. Messages that can not be merged are queued
+                 past the bound.
+    disconnect : the message is dropped and on_overflow is called, the client closes the connection
+                 and catches up by reconnecting if it has a ReconnectPolicy.
+
+stats() reports the high water mark and how often the bound was hit, to size update loops and to
+detect slow consumers in production.
+
+Example:
+
+    client.limit_message_queue(10_000, policy="coalesce")
+    ...
+    stats = client.message_queue_stats()
+    print(stats["max_depth"], stats["coalesced"])
+"""
+
+import collections
+import queue
+import threading
+import time
+
+OVERFLOW_POLICIES = ("block", "coalesce", "disconnect")
+
+
+class MessageQueue:
+    """
+    FIFO of decoded messages with an optional bound, see the module documentation.
+
+    Args:
+        maxsize (int): Maximum number of queued messages, 0 for no limit. Default: 0
+        policy (str): Overflow policy, "block", "coalesce" or "disconnect". Default: "block"
+        on_overflow (Callable[[], None], optional): Called on the putting thread when a message is dropped by the "disconnect" policy.
+    """
+
+    def __init__(self, maxsize=0, policy="block", on_overflow=None):
+        self._items = collections.deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self.on_overflow = on_overflow
+        self.set_limit(maxsize, policy)
+
+        self._max_depth = 0
+        self._put_count = 0
+        self._full_count = 0
+        self._blocked_seconds = 0.0
+        self._coalesced = 0
+        self._dropped = 0
+
+    def set_limit(self, maxsize, policy="block"):
+        """
+        Change the bound and the overflow policy. Messages already queued are kept.
+
+        Raises:
+            ValueError: If the policy is unknown.
+        """
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy {policy!r}, expected one of {', '.join(OVERFLOW_POLICIES)}"
+            )
+        with self._lock:
+            self.maxsize = maxsize
+            self.policy = policy
+            # a larger bound or another policy can release blocked producers
+            self._not_full.notify_all()
+
+    def put(self, item, force=False):
+        """
+        Queue a message, following the overflow policy if the queue is full.
+
+        Args:
+            item: The message.
+            force (bool, optional): Queue the message past the bound instead of applying the policy. Default: False
+
+        Returns:
+            bool: False if the message was dropped.
+        """
+        with self._lock:
+            self._put_count += 1
+            items = self._items
+            if not force and self.maxsize > 0 and len(items) >= self.maxsize:
+                self._full_count += 1
+                if self.policy == "block":
+                    blocked_at = time.perf_counter()
+                    while self.policy == "block" and 0 < self.maxsize <= len(items):
+                        self._not_full.wait()
+                    self._blocked_seconds += time.perf_counter() - blocked_at
+                elif self.policy == "coalesce":
+                    coalesce = getattr(items[-1], "coalesce", None) if items else None
+                    if coalesce is not None and coalesce(item):
+                        self._coalesced += 1
+                        return True
+                else:
+                    self._dropped += 1
+                    on_overflow = self.on_overflow
+                    # called outside the lock, the handler may inspect the queue
+                    self._lock.release()
+                    try:
+                        if on_overflow is not None:
+                            on_overflow()
+                    finally:
+                        self._lock.acquire()
+                    return False
+
+            items.append(item)
+            if len(items) > self._max_depth:
+                self._max_depth = len(items)
+            self._not_empty.notify()
+            return True
+
+    def drop(self):
+        """
+        Count a message that was discarded before reaching the queue.
+        """
+        with self._lock:
+            self._dropped += 1
+
+    def get(self, block=True, timeout=None):
+        """
+        Remove and return the oldest message.
+
+        Raises:
+            queue.Empty: If no message arrived in time, or right away if block is False.
+        """
+        with self._lock:
+            if not block:
+                if not self._items:
+                    raise queue.Empty
+            elif not self._not_empty.wait_for(lambda: self._items, timeout):
+                raise queue.Empty
+            item = self._items.popleft()
+            self._not_full.notify()
+            return item
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def clear(self):
+        """
+        Discard every queued message and release producers blocked on a full queue.
+
+        Returns:
+            int: The number of discarded messages.
+        """
+        with self._lock:
+            count = len(self._items)
+            self._items.clear()
+            self._not_full.notify_all()
+            return count
+
+    def empty(self):
+        return not self._items
+
+    def qsize(self):
+        return len(self._items)
+
+    def full(self):
+        return 0 < self.maxsize <= len(self._items)
+
+    def stats(self):
+        """
+        Returns a dict with the queue metrics.
+
+        Keys:
+            depth : messages waiting for update()
+            max_depth : highest depth seen since creation or reset_high_water()
+            maxsize : the bound, 0 if unbounded
+            policy : the overflow policy
+            put : messages offered to the queue
+            full : messages that found the queue full
+            blocked_seconds : total time producers waited under the "block" policy
+            coalesced : messages merged into a queued message
+            dropped : messages discarded by the "disconnect" policy
+        """
+        with self._lock:
+            return {
+                "depth": len(self._items),
+                "max_depth": self._max_depth,
+                "maxsize": self.maxsize,
+                "policy": self.policy,
+                "put": self._put_count,
+                "full": self._full_count,
+                "blocked_seconds": self._blocked_seconds,
+                "coalesced": self._coalesced,
+                "dropped": self._dropped,
+            }
+
+    def reset_high_water(self):
+        """
+        Restart the high water mark from the current depth, e.g. at the start of each reporting interval.
+        """
+        with self._lock:
+            self._max_depth = len(self._items)
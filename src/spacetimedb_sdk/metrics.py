@@ -0,0 +1,162 @@
+""" Stage-level metrics for the incoming message pipeline.
+
+Metrics are off by default. Once enabled with SpacetimeDBClient.enable_metrics(), the client
+records how long every message spends in each stage:
+
+    parse                     : json.loads (text) or protobuf parsing (binary) of a frame
+    decode                    : parse plus decoding the rows of the frame into table classes
+    queue_wait                : from the end of decode until update() starts applying the message
+    apply                     : applying the message to the client cache
+    row_update_callbacks      : calling the row update callbacks of a message
+    table_update_callbacks    : calling the table update callbacks of a message
+    subscription_applied_callbacks, event_callbacks, reducer_callbacks : the remaining callbacks
+    total                     : from the start of decode until all callbacks returned
+
+It also counts frames and bytes received, messages per type and applied rows per table and
+operation. Queue depths are sampled when the metrics are read.
+
+Example:
+
+    metrics = client.enable_metrics()
+    metrics.add_hook(lambda stage, seconds: print(stage, seconds))
+    ...
+    print(client.get_metrics()["stages"]["apply"]["p99"])
+"""
+
+import bisect
+import threading
+
+# bucket upper bounds in seconds: 1us doubling up to ~67s
+_BUCKET_BOUNDS = [0.000001 * 2**index for index in range(27)]
+
+
+class Histogram:
+    """
+    Latency histogram with exponential buckets. Percentiles are reported as the upper bound of the
+    bucket they fall into, so they are accurate to within a factor of two.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * (len(_BUCKET_BOUNDS) + 1)
+
+    def record(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect.bisect_left(_BUCKET_BOUNDS, seconds)] += 1
+
+    def percentile(self, fraction):
+        if self.count == 0:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                if index == len(_BUCKET_BOUNDS):
+                    return self.max
+                return min(_BUCKET_BOUNDS[index], self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+        }
+
+
+class ClientMetrics:
+    """
+    Collects the pipeline metrics of one SpacetimeDBClient. Safe to record from the websocket and
+    decode threads and the thread calling update() at the same time.
+
+    Hooks are called with (stage, seconds) for every recorded stage timing, on the thread that
+    recorded it, so they should be fast.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hooks = []
+        self.reset()
+
+    def reset(self):
+        """
+        Clear all recorded values. Hooks stay registered.
+        """
+        with self._lock:
+            self.stages = {}
+            self.frames_received = 0
+            self.bytes_received = 0
+            self.messages = {}
+            self.table_rows = {}
+
+    def add_hook(self, callback):
+        """
+        Register a callback called with (stage, seconds) for every recorded stage timing.
+        """
+        self._hooks.append(callback)
+
+    def remove_hook(self, callback):
+        self._hooks.remove(callback)
+
+    def record(self, stage, seconds):
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram()
+            histogram.record(seconds)
+        for hook in self._hooks:
+            hook(stage, seconds)
+
+    def record_frame(self, size):
+        # size is in bytes for binary frames and characters for text frames
+        with self._lock:
+            self.frames_received += 1
+            self.bytes_received += size
+
+    def record_message(self, transaction_type):
+        with self._lock:
+            self.messages[transaction_type] = self.messages.get(transaction_type, 0) + 1
+
+    def record_table_events(self, table_name, table_events):
+        counts = {}
+        for db_event in table_events:
+            counts[db_event.row_op] = counts.get(db_event.row_op, 0) + 1
+        with self._lock:
+            table_counts = self.table_rows.setdefault(table_name, {})
+            for row_op, count in counts.items():
+                table_counts[row_op] = table_counts.get(row_op, 0) + count
+
+    def snapshot(self):
+        """
+        Returns the recorded metrics as a dict: stages (stage name to count, total, mean, min, max, p50, p90
+        and p99 in seconds), frames_received, bytes_received, messages (count per message type) and table_rows
+        (table name to count per row operation).
+        """
+        with self._lock:
+            return {
+                "stages": {
+                    stage: histogram.snapshot()
+                    for stage, histogram in self.stages.items()
+                },
+                "frames_received": self.frames_received,
+                "bytes_received": self.bytes_received,
+                "messages": dict(self.messages),
+                "table_rows": {
+                    table_name: dict(counts)
+                    for table_name, counts in self.table_rows.items()
+                },
+            }
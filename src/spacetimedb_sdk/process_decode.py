@@ -0,0 +1,166 @@
+""" Decode the rows of large SubscriptionUpdates in a pool of worker processes.
+
+Row decoding runs in Python and holds the GIL, so a single client decodes an initial subscription on
+one core. ProcessPoolDecoder splits the rows of a SubscriptionUpdate into chunks and decodes them in
+worker processes. The frame itself is still parsed by the client; the decoded rows are sent back and
+assigned to their events in the original order, so the cache is updated exactly as without the pool.
+
+Sending rows between processes is not free: the client still unpickles every decoded row, which
+costs a good part of decoding it directly. The pool pays off for tables whose rows are expensive to
+decode (many columns, nested types) on machines with several cores. Measure with
+benchmarks/bench_process_decode.py before enabling it.
+
+If the pool breaks (a worker process died) or is shut down while a message is decoded, the rows it
+did not decode are decoded in the client, so no message is lost.
+
+Workers are started with the "spawn" method, so the main module of the program must be importable
+without side effects (guard the entry point with if __name__ == "__main__").
+
+Example:
+
+    client = SpacetimeDBClient(module_bindings)
+    client.enable_process_decoding(workers=4)
+"""
+
+import concurrent.futures
+import importlib
+import multiprocessing
+import os
+import sys
+import threading
+
+from spacetimedb_sdk.bsatn import BsatnReader
+from spacetimedb_sdk.client_cache import ClientCache
+
+# the module bindings tables of a worker process, set by _init_worker
+_worker_tables = None
+
+
+def _init_worker(sys_path, autogen_package_name):
+    global _worker_tables
+
+    sys.path[:] = sys_path
+    autogen_package = importlib.import_module(autogen_package_name)
+    _worker_tables = ClientCache(autogen_package).tables
+
+
+def _ready():
+    return os.getpid()
+
+
+def _decode_rows(tables, table_name, rows):
+    table_class = tables[table_name].table_class
+    if rows and isinstance(rows[0], (bytes, bytearray)):
+        from_bsatn = table_class.from_bsatn
+        return [from_bsatn(BsatnReader(row)) for row in rows]
+    return [table_class(row) for row in rows]
+
+
+def _decode_chunk(table_name, rows):
+    return _decode_rows(_worker_tables, table_name, rows)
+
+
+class ProcessPoolDecoder:
+    """
+    Decodes table rows in a pool of worker processes.
+
+    Args:
+        autogen_package (ModuleType): The module bindings package, it must be importable by name in the workers.
+        workers (int, optional): Number of worker processes. Default: os.cpu_count()
+        min_rows (int, optional): SubscriptionUpdates with fewer rows to decode are decoded in the client. Default: 20000
+        chunk_rows (int, optional): Rows sent to a worker at a time. Default: 5000
+    """
+
+    def __init__(self, autogen_package, workers=None, min_rows=20_000, chunk_rows=5_000):
+        self.autogen_package_name = autogen_package.__name__
+        self.workers = workers or os.cpu_count() or 1
+        self.min_rows = min_rows
+        self.chunk_rows = chunk_rows
+        # set when a worker process died, rows are decoded in the client from then on
+        self.broken = False
+        # close() waits for the decode_events calls that use the executor
+        self._lock = threading.Condition()
+        self._active_calls = 0
+        self._closed = False
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(list(sys.path), self.autogen_package_name),
+        )
+
+    def warm_up(self):
+        """
+        Start every worker process and wait until they have imported the module bindings.
+        """
+        futures = [self._executor.submit(_ready) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def decode_events(self, pending_rows, tables):
+        """
+        Decode rows in the workers and set them as the decoded_value of their events.
+
+        Rows are decoded in this process instead if the pool is broken or closed.
+
+        Args:
+            pending_rows (Dict[str, List[Tuple[DbEvent, Any]]]): The events and raw rows (JSON values or BSATN bytes) to decode per table.
+            tables (Dict[str, TableCache]): The client's table caches, used to decode rows in this process.
+        """
+        chunks = []
+        for table_name, table_rows in pending_rows.items():
+            for start in range(0, len(table_rows), self.chunk_rows):
+                chunks.append((table_name, table_rows[start : start + self.chunk_rows]))
+
+        with self._lock:
+            executor = None if self._closed or self.broken else self._executor
+            if executor is not None:
+                self._active_calls += 1
+        try:
+            futures = []
+            if executor is not None:
+                try:
+                    for table_name, chunk in chunks:
+                        futures.append(
+                            executor.submit(_decode_chunk, table_name, [row for _, row in chunk])
+                        )
+                except (concurrent.futures.BrokenExecutor, RuntimeError) as e:
+                    self._on_pool_error(e)
+
+            # results are assigned in submission order, so events keep the order of the message
+            for index, (table_name, chunk) in enumerate(chunks):
+                decoded_values = None
+                if index < len(futures):
+                    try:
+                        decoded_values = futures[index].result()
+                    except (
+                        concurrent.futures.BrokenExecutor,
+                        concurrent.futures.CancelledError,
+                    ) as e:
+                        self._on_pool_error(e)
+                        futures = futures[:index]
+                if decoded_values is None:
+                    decoded_values = _decode_rows(tables, table_name, [row for _, row in chunk])
+                for (db_event, _), decoded_value in zip(chunk, decoded_values):
+                    db_event.decoded_value = decoded_value
+        finally:
+            if executor is not None:
+                with self._lock:
+                    self._active_calls -= 1
+                    self._lock.notify_all()
+
+    def _on_pool_error(self, error):
+        if isinstance(error, concurrent.futures.BrokenExecutor):
+            self.broken = True
+        print(
+            f"[decode_events] Error, decode worker pool failed ({error!r}), decoding the rows in this process."
+        )
+
+    def close(self):
+        """
+        Stop the worker processes, after the decode_events calls that are using them.
+        """
+        with self._lock:
+            self._closed = True
+            self._lock.wait_for(lambda: self._active_calls == 0)
+        self._executor.shutdown(wait=True, cancel_futures=True)
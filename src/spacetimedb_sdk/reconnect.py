@@ -0,0 +1,81 @@
+""" Reconnect policy for SpacetimeDBClient.
+
+When a ReconnectPolicy is passed to connect(), a dropped connection is re-opened instead of
+being reported through on_disconnect. The client waits an exponentially growing, jittered delay
+between attempts, reconnects with the same client address and auth token, re-sends the last
+subscription and reconciles the new SubscriptionUpdate against the rows that are still cached,
+so only rows that actually changed while disconnected fire row update callbacks.
+
+Example:
+
+    policy = ReconnectPolicy(max_delay=10, on_reconnected=lambda: print("reconnected"))
+    asyncio.run(spacetime_client.run(token, host, "chatqs", on_connect, queries, reconnect_policy=policy))
+"""
+
+import math
+import random
+import sys
+
+
+class ReconnectPolicy:
+    """
+    Exponential backoff with jitter.
+
+    The delay before attempt n (starting at 0) is min(max_delay, initial_delay * multiplier ** n),
+    of which a random fraction of up to `jitter` is taken off so clients that lost the same server
+    do not all come back at the same moment.
+
+    Args:
+        initial_delay (float, optional): Seconds to wait before the first attempt. Default: 0.5
+        max_delay (float, optional): Upper bound of the delay in seconds. Default: 30
+        multiplier (float, optional): Factor applied to the delay after every failed attempt. Default: 2
+        jitter (float, optional): Fraction of each delay that is randomized, 0 disables jitter. Default: 0.5
+        max_attempts (int, optional): Attempts before giving up and calling on_disconnect, None retries forever. Default: None
+        on_reconnecting (Callable[[int, float, str], None], optional): Called on the websocket thread when a
+            connection is lost or an attempt failed, with the attempt number, the delay in seconds and the reason.
+        on_reconnected (Callable[[], None], optional): Called from update() once the connection is back and the
+            subscription was re-sent.
+    """
+
+    def __init__(
+        self,
+        initial_delay=0.5,
+        max_delay=30,
+        multiplier=2,
+        jitter=0.5,
+        max_attempts=None,
+        on_reconnecting=None,
+        on_reconnected=None,
+    ):
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.max_attempts = max_attempts
+        self.on_reconnecting = on_reconnecting
+        self.on_reconnected = on_reconnected
+
+    def delay(self, attempt):
+        """
+        Returns the seconds to wait before the given attempt, starting at 0.
+        """
+        initial_delay = self.initial_delay
+        multiplier = float(self.multiplier)
+        limit = min(self.max_delay, sys.float_info.max)
+        if multiplier > 1 and initial_delay > 0:
+            # stop multiplying once max_delay is reached, multiplier ** attempt overflows after about a thousand attempts
+            max_exponent = math.ceil(
+                (math.log(limit) - math.log(initial_delay)) / math.log(multiplier)
+            )
+            attempt = min(attempt, max(0, max_exponent))
+        try:
+            delay = min(limit, initial_delay * multiplier**attempt)
+        except OverflowError:
+            delay = limit if initial_delay > 0 else 0.0
+        return delay - delay * self.jitter * random.random()
+
+    def should_retry(self, attempt):
+        """
+        Returns False once max_attempts attempts have failed.
+        """
+        return self.max_attempts is None or attempt < self.max_attempts
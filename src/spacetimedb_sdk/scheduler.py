@@ -0,0 +1,200 @@
+""" Timers of SpacetimeDBAsyncClient.schedule_event and schedule_every.
+
+All timers of a client live in one heap ordered by fire time, on the monotonic clock of the
+asyncio loop, and only the earliest one is armed with loop.call_at. Scheduling and cancelling a
+timer costs O(log n), so a client can run thousands of timers without a task or loop handle per
+timer. Repeating timers are pushed back into the heap after they fire instead of being created
+again, and their fire times advance by the interval from the previous fire time, so they do not
+drift when callbacks or the loop run late.
+
+Cancelled timers are removed lazily: they stay in the heap until they reach its top or until they
+make up more than half of it, when the heap is rebuilt without them.
+
+Example:
+
+    tick = spacetime_client.schedule_every(0.01, on_tick)
+    ...
+    tick.cancel()
+"""
+
+import heapq
+import itertools
+import traceback
+
+# rebuild the heap when more than half of it, and at least this many timers, are cancelled
+_COMPACT_MIN_CANCELLED = 64
+
+
+class SpacetimeDBScheduledEvent:
+    """
+    Handle of a scheduled event, returned by schedule_event and schedule_every.
+
+    Attributes:
+        fire_time (float): When the event fires next, in loop.time() seconds. None until the loop has started.
+        callback (Callable): The function called when the event fires.
+        args (tuple): The arguments passed to the callback.
+        interval (float): Seconds between repetitions, None for an event that fires once.
+    """
+
+    def __init__(self, fire_time, callback, args, interval=None):
+        self.fire_time = fire_time
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.cancelled = False
+        self._scheduler = None
+
+    def cancel(self):
+        """
+        Stop the event from firing. Cancelling an event that already fired or was cancelled does nothing.
+        """
+        if self.cancelled:
+            return
+        self.cancelled = True
+        if self._scheduler is not None:
+            self._scheduler._on_cancel(self)
+
+
+class TimerScheduler:
+    """
+    Heap of scheduled events that fires them on an asyncio loop, see the module documentation.
+
+    Events can be scheduled before the loop is known, their delays start counting when start() is called.
+    All methods must be called on the loop's thread.
+    """
+
+    def __init__(self):
+        self.loop = None
+        # (fire_time, sequence, event), the sequence keeps events with equal fire times in scheduling order
+        self._heap = []
+        self._sequence = itertools.count()
+        # events scheduled before start(), with their delays
+        self._pending = []
+        # cancelled events still in the heap
+        self._cancelled = 0
+        self._timer_handle = None
+        self._armed_at = None
+
+    def __len__(self):
+        pending = sum(1 for _, event in self._pending if not event.cancelled)
+        return len(self._heap) - self._cancelled + pending
+
+    def start(self, loop):
+        """
+        Start firing events on the loop, including the ones scheduled so far.
+        """
+        self.loop = loop
+        pending = self._pending
+        self._pending = []
+        for delay_secs, event in pending:
+            if event.cancelled:
+                continue
+            event.fire_time = loop.time() + delay_secs
+            self._push(event)
+        self._arm()
+
+    def schedule(self, delay_secs, callback, args, interval=None):
+        """
+        Schedule callback(*args) after delay_secs, and then every interval seconds if interval is given.
+
+        Returns:
+            SpacetimeDBScheduledEvent: The handle to cancel the event with.
+
+        Raises:
+            ValueError: If interval is not positive.
+        """
+        if interval is not None and interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+
+        event = SpacetimeDBScheduledEvent(None, callback, args, interval)
+        event._scheduler = self
+        if self.loop is None:
+            self._pending.append((delay_secs, event))
+            return event
+
+        event.fire_time = self.loop.time() + delay_secs
+        self._push(event)
+        self._arm()
+        return event
+
+    def cancel_all(self):
+        """
+        Cancel every scheduled event and disarm the loop timer.
+        """
+        for _, _, event in self._heap:
+            event.cancelled = True
+            event._scheduler = None
+        for _, event in self._pending:
+            event.cancelled = True
+            event._scheduler = None
+        self._heap = []
+        self._pending = []
+        self._cancelled = 0
+        if self._timer_handle is not None:
+            self._timer_handle.cancel()
+            self._timer_handle = None
+            self._armed_at = None
+
+    def _push(self, event):
+        heapq.heappush(self._heap, (event.fire_time, next(self._sequence), event))
+
+    def _on_cancel(self, event):
+        event._scheduler = None
+        if event.fire_time is None:
+            # not started yet, start() skips it
+            return
+        self._cancelled += 1
+        heap = self._heap
+        if self._cancelled >= _COMPACT_MIN_CANCELLED and self._cancelled * 2 > len(heap):
+            self._heap = [entry for entry in heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+        # the armed timer may belong to the cancelled event, it finds nothing to fire and re-arms
+
+    def _arm(self):
+        # arm the loop timer for the earliest event, if it is not armed for that time already
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+            self._cancelled -= 1
+        if self.loop is None or not heap:
+            return
+
+        fire_time = heap[0][0]
+        if self._armed_at is not None and self._armed_at <= fire_time:
+            return
+        if self._timer_handle is not None:
+            self._timer_handle.cancel()
+        self._timer_handle = self.loop.call_at(fire_time, self._fire)
+        self._armed_at = fire_time
+
+    def _fire(self):
+        self._timer_handle = None
+        self._armed_at = None
+        heap = self._heap
+        now = self.loop.time()
+        while heap and heap[0][0] <= now:
+            _, _, event = heapq.heappop(heap)
+            if event.cancelled:
+                self._cancelled -= 1
+                continue
+
+            if event.interval is None:
+                event._scheduler = None
+            else:
+                event.fire_time += event.interval
+                if event.fire_time <= now:
+                    # the loop fell behind by more than an interval, skip the missed repetitions
+                    event.fire_time = now + event.interval
+                self._push(event)
+
+            try:
+                event.callback(*event.args)
+            except Exception:
+                print("[scheduled_event] Error, scheduled event callback raised:")
+                traceback.print_exc()
+            if heap is not self._heap:
+                # a cancel in the callback rebuilt the heap
+                heap = self._heap
+
+        self._arm()
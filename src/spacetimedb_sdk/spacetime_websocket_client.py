@@ -3,13 +3,32 @@ import threading
 import base64
 import binascii
 
+from spacetimedb_sdk.decode_pipeline import OrderedDecodePipeline
+
 
 class WebSocketClient:
-    def __init__(self, protocol, on_connect=None, on_close=None, on_error=None, on_message=None, client_address=None):
+    """
+    Websocket connection to SpacetimeDB.
+
+    Incoming frames are passed to on_message on a pool of decode_workers threads. If on_decoded is
+    provided, every non-None value returned by on_message is passed to on_decoded in the order the
+    frames were received. At most max_pending_messages frames wait to be decoded; beyond that the
+    socket reader blocks until the workers catch up.
+    """
+
+    def __init__(self, protocol, on_connect=None, on_close=None, on_error=None, on_message=None, client_address=None, on_decoded=None, decode_workers=1, max_pending_messages=1024):
         self._on_connect = on_connect
         self._on_close = on_close
         self._on_error = on_error
         self._on_message = on_message
+        self._on_decoded = on_decoded
+        self.decode_workers = decode_workers
+        self.max_pending_messages = max_pending_messages
+        self.decode_pipeline = None
+        # ClientMetrics set by SpacetimeDBClient while metrics are enabled
+        self.metrics = None
+        # TrafficRecorder that receives every inbound frame while recording
+        self.recorder = None
 
         self.protocol = protocol
         self.ws = None
@@ -41,13 +60,26 @@ class WebSocketClient:
 
         self.ws = websocket.WebSocketApp(url,
                                          on_open=self.on_open,
-                                         on_message=self.on_message,
+                                         on_data=self.on_data,
                                          on_error=self.on_error,
                                          on_close=self.on_close, 
                                          header=headers, 
                                          subprotocols=[self.protocol])
 
-        self.message_thread = threading.Thread(target=self.ws.run_forever)
+        self.decode_pipeline = OrderedDecodePipeline(
+            self.process_message,
+            self._on_decoded,
+            workers=self.decode_workers,
+            max_pending=self.max_pending_messages,
+        )
+        self.decode_pipeline.start()
+
+        # websocket-client validates UTF-8 in pure Python, which takes seconds for a large
+        # SubscriptionUpdate; on_data decodes text frames with bytes.decode instead, which
+        # rejects invalid UTF-8 just the same
+        self.message_thread = threading.Thread(
+            target=self.ws.run_forever, kwargs={"skip_utf8_validation": True}
+        )
         self.message_thread.start()
 
     def decode_hex_string(hex_string):
@@ -56,13 +88,25 @@ class WebSocketClient:
         except binascii.Error:
             return None
 
-    def send(self, data):
+    def send(self, data, binary=False):
         if not self.is_connected:
             print("[send] Not connected")
 
-        self.ws.send(data)
+        if binary:
+            self.ws.send(data, opcode=websocket.ABNF.OPCODE_BINARY)
+        else:
+            self.ws.send(data)
 
     def close(self):
+        sock = self.ws.sock
+        if sock is not None and sock.connected:
+            # only send the close frame and let the reader thread receive the server's reply.
+            # WebSocketApp.close() reads the reply on this thread too, and when it wins that race
+            # the reader thread only notices the closed socket after its 10 second select timeout.
+            # If the server never replies, keep_running makes the reader stop after that timeout.
+            self.ws.keep_running = False
+            sock.send_close()
+            return
         self.ws.close()
 
     def on_open(self, ws):
@@ -70,20 +114,40 @@ class WebSocketClient:
         if self._on_connect:
             self._on_connect()
 
+    def decode_queue_stats(self):
+        """
+        Returns the queue depth metrics of the decode pipeline, see OrderedDecodePipeline.stats
+        """
+        if self.decode_pipeline is None:
+            return None
+        return self.decode_pipeline.stats()
+
+    def on_data(self, ws, data, opcode, fin):
+        if opcode == websocket.ABNF.OPCODE_TEXT and isinstance(data, bytes):
+            data = data.decode("utf-8")
+        self.on_message(ws, data)
+
     def on_message(self, ws, message):
-        # Process incoming message on a separate thread here
-        t = threading.Thread(target=self.process_message, args=(message,))
-        t.start()
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.record_frame(len(message))
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record(message)
+        # Decode on the pipeline workers, results are delivered in arrival order
+        self.decode_pipeline.submit(message)
 
     def process_message(self, message):
         if self._on_message:
-            self._on_message(message)
-        pass
+            return self._on_message(message)
 
     def on_error(self, ws, error):
         if self._on_error:
             self._on_error(error)
 
     def on_close(self, ws, status_code, close_msg):
+        self.is_connected = False
+        if self.decode_pipeline is not None:
+            self.decode_pipeline.stop()
         if self._on_close:
             self._on_close(close_msg)
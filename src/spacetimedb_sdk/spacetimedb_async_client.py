@@ -11,10 +11,11 @@ the examples in the examples/asyncio directory.
 
 from typing import List
 import asyncio
-from datetime import timedelta
-from datetime import datetime
+import itertools
 import traceback
 
+from spacetimedb_sdk.change_stream import ChangeStream
+from spacetimedb_sdk.scheduler import SpacetimeDBScheduledEvent, TimerScheduler
 from spacetimedb_sdk.spacetimedb_client import SpacetimeDBClient
 
 
@@ -22,64 +23,348 @@ class SpacetimeDBException(Exception):
     pass
 
 
-class SpacetimeDBScheduledEvent:
-    def __init__(self, datetime, callback, args):
-        self.fire_time = datetime
-        self.callback = callback
-        self.args = args
+class _PendingReducerCall:
+    def __init__(self, future):
+        self.future = future
+        self.timeout_handle = None
+
+    def resolve(self, event):
+        if self.timeout_handle is not None:
+            self.timeout_handle.cancel()
+        if not self.future.done():
+            self.future.set_result(event)
+
+    def fail(self, exception, retrieved=False):
+        if self.timeout_handle is not None:
+            self.timeout_handle.cancel()
+        if not self.future.done():
+            self.future.set_exception(exception)
+            if retrieved:
+                # nobody may await the future any more, don't log it as a never retrieved exception
+                self.future.exception()
+
+
+class _PendingWait:
+    def __init__(self, predicate, where, future):
+        self.predicate = predicate
+        # column values the row must have, the first one keys the wait in _TableWaits
+        self.where = where
+        self.future = future
+        self.timeout_handle = None
+
+    def matches(self, row):
+        for column, value in self.where.items():
+            if getattr(row, column) != value:
+                return False
+        return self.predicate is None or self.predicate(row)
+
+    def check(self, row):
+        # resolve with the row if it matches, returns True once the wait is done
+        if self.future.done():
+            return True
+        try:
+            if not self.matches(row):
+                return False
+        except Exception as e:
+            self.future.set_exception(e)
+            return True
+        self.future.set_result(row)
+        return True
+
+    def fail(self, exception):
+        if not self.future.done():
+            self.future.set_exception(exception)
+
+
+class _TableWaits:
+    """
+    The pending wait_for calls of one table, checked against the rows of each table update.
+
+    Waits with column values are kept per column and value, so a changed row is only checked against the
+    waits for its own value of that column.
+    """
+
+    def __init__(self):
+        # column -> value -> waits
+        self.keyed = {}
+        self.unkeyed = []
+
+    def __bool__(self):
+        # emptied keys are removed, so this is cheap even with many keyed waits
+        return bool(self.unkeyed or self.keyed)
+
+    def add(self, wait):
+        if not wait.where:
+            self.unkeyed.append(wait)
+            return
+        column, value = next(iter(wait.where.items()))
+        self.keyed.setdefault(column, {}).setdefault(value, []).append(wait)
+
+    def remove(self, wait):
+        if not wait.where:
+            self.unkeyed.remove(wait)
+            return
+        column, value = next(iter(wait.where.items()))
+        waits_by_value = self.keyed[column]
+        waits = waits_by_value[value]
+        waits.remove(wait)
+        if not waits:
+            del waits_by_value[value]
+            if not waits_by_value:
+                del self.keyed[column]
+
+    def on_table_update(self, inserts, updates, deletes, reducer_event):
+        # a table update callback, runs in update() after the rows were applied to the cache
+        for row in itertools.chain(inserts, (new_value for _, new_value in updates)):
+            for wait in self.unkeyed:
+                wait.check(row)
+            for column, waits_by_value in self.keyed.items():
+                for wait in waits_by_value.get(getattr(row, column), ()):
+                    wait.check(row)
+
+    def fail(self, exception):
+        for wait in list(self.unkeyed):
+            wait.fail(exception)
+        for waits_by_value in list(self.keyed.values()):
+            for waits in list(waits_by_value.values()):
+                for wait in list(waits):
+                    wait.fail(exception)
 
 
 class SpacetimeDBAsyncClient:
     request_timeout = 5
+    # seconds the event loop spends applying messages before it yields to other tasks, None applies everything at once
+    update_budget = None
 
     is_connected = False
     is_closing = False
     identity = None
+    address = None
 
-    def __init__(self, autogen_package):
+    def __init__(
+        self,
+        autogen_package,
+        json_codec=None,
+        columnar_tables=None,
+        lazy_tables=None,
+        decode_workers=1,
+        max_pending_messages=1024,
+    ):
         """
         Create a SpacetimeDBAsyncClient object
 
         Attributes:
             autogen_package : package folder created by running the generate command from the CLI
+            json_codec : JSON codec instance or backend name ("orjson", "ujson", "json" or "auto") used by the text protocol, Default: the standard library json module, see spacetimedb_sdk.json_codec
+            columnar_tables : names of tables to store as NumPy column arrays instead of row objects (requires numpy), see spacetimedb_sdk.columnar_cache
+            lazy_tables : names of tables whose rows are kept undecoded until they are read, or True for all tables, see spacetimedb_sdk.client_cache.LazyTableCache
+            decode_workers : number of threads decoding incoming frames, results are applied in arrival order, Default: 1
+            max_pending_messages : frames allowed to wait for a decode thread before the socket reader blocks, Default: 1024
 
         """
-        self.client = SpacetimeDBClient(autogen_package)
-        self.prescheduled_events = []
+        self.client = SpacetimeDBClient(
+            autogen_package,
+            json_codec,
+            columnar_tables,
+            lazy_tables,
+            decode_workers,
+            max_pending_messages,
+        )
+        # timers of schedule_event and schedule_every, started with the async loop
+        self.scheduler = TimerScheduler()
         self.event_queue = None
+        self.loop = None
+        self._update_scheduled = False
+        # open ChangeStreams, see changes()
+        self._change_streams = []
+        # pending wait_for calls per table name
+        self._table_waits = {}
+
+        # reducer calls whose futures are waiting for their TransactionUpdate, the client matches results to calls
+        self._pending_reducer_calls = set()
 
-    def schedule_event(self, delay_secs, callback, *args):
+    def schedule_event(self, delay_secs, callback, *args) -> SpacetimeDBScheduledEvent:
         """
         Schedule an event to be fired after a delay
 
-        To create a repeating event, call schedule_event() again from within the callback function.
+        Events scheduled before the async loop starts fire delay_secs after it started. Use schedule_every()
+        for repeating events. Must be called on the async loop's thread.
 
         Args:
             delay_secs : number of seconds to wait before firing the event
             callback : function to call when the event fires
             args (variable): arguments to pass to the callback function
+
+        Returns:
+            SpacetimeDBScheduledEvent: handle whose cancel() stops the event from firing
         """
 
-        # if this is called before we start the async loop, we need to store the event
-        if self.event_queue is None:
-            self.prescheduled_events.append((delay_secs, callback, args))
+        return self.scheduler.schedule(delay_secs, callback, args)
+
+    def schedule_every(
+        self, interval_secs, callback, *args, delay_secs=None
+    ) -> SpacetimeDBScheduledEvent:
+        """
+        Schedule an event to be fired repeatedly until it is cancelled or the client closes.
+
+        Repetitions are spaced interval_secs apart on the loop's monotonic clock. If the loop falls behind by
+        more than an interval, the missed repetitions are skipped rather than fired back to back.
+
+        Args:
+            interval_secs : number of seconds between two firings, must be positive
+            callback : function to call when the event fires
+            args (variable): arguments to pass to the callback function
+            delay_secs : number of seconds to wait before the first firing, Default: interval_secs
+
+        Returns:
+            SpacetimeDBScheduledEvent: handle whose cancel() stops the repetitions
+
+        Example:
+            tick = spacetime_client.schedule_every(0.01, on_tick)
+            ...
+            tick.cancel()
+        """
+
+        if delay_secs is None:
+            delay_secs = interval_secs
+        return self.scheduler.schedule(delay_secs, callback, args, interval_secs)
+
+    def changes(self, table, maxsize=1000, policy="block") -> ChangeStream:
+        """
+        Stream the row changes of a table as they are applied, see spacetimedb_sdk.change_stream.
+
+        The stream starts with the changes applied after this call, including the inserts of SubscriptionUpdates.
+        Leaving an `async with` block or calling close() stops it; closing the client ends every stream once its
+        queued changes have been taken.
+
+        Args:
+            table : the table class from the module bindings, or the table name
+            maxsize : number of changes queued for the consumer before the policy applies, Default: 1000
+            policy : "block" to stop applying messages until the consumer catches up, "coalesce" to merge changes
+                of the same row, Default: "block"
+
+        Returns:
+            ChangeStream: async iterator of RowChange objects
+
+        Example:
+            async with spacetime_client.changes(User) as changes:
+                async for change in changes:
+                    await downstream.write(change.op, change.new_value)
+        """
+
+        table_name = table if isinstance(table, str) else table.__name__
+        table_cache = self.client.client_cache.tables.get(table_name)
+        if table_cache is None:
+            raise ValueError(f"Unknown table {table_name}")
+
+        stream = ChangeStream(
+            table_name,
+            getattr(table_cache, "primary_key", None),
+            maxsize,
+            policy,
+            on_drain=self._on_change_stream_drained,
+            on_close=self._on_change_stream_closed,
+        )
+        self._change_streams.append(stream)
+        self.client._register_row_update(table_name, stream._on_row_update)
+        if policy == "block":
+            self.client._pause_update = self._change_streams_blocked
+        return stream
+
+    async def wait_for(self, table, predicate=None, timeout=None, **where):
+        """
+        Wait until the client cache holds a row of the table that matches.
+
+        Rows already in the cache are checked once. After that only the rows that an update inserts or changes
+        are checked, right after they are applied, with no polling. Column values given as keyword arguments
+        are looked up in the table's indexes, and a changed row is only checked by the waits for its own value
+        of the first such column, so many waits on different keys stay cheap.
+
+        Args:
+            table : the table class from the module bindings, or the table name
+            predicate : function called with a row that returns True for a matching row, Default: any row
+            timeout : seconds to wait before raising SpacetimeDBException, Default: wait until the client closes
+            where (variable) : column values the row must have, e.g. identity=some_identity
+
+        Returns:
+            the matching row
+
+        Example:
+            user = await spacetime_client.wait_for(User, lambda user: user.online, identity=identity, timeout=10)
+        """
+
+        table_name = table if isinstance(table, str) else table.__name__
+        table_cache = self.client.client_cache.tables.get(table_name)
+        if table_cache is None:
+            raise ValueError(f"Unknown table {table_name}")
+
+        # the running loop rather than self.loop, a wait can start before run() or connect() set it
+        loop = asyncio.get_running_loop()
+        wait = _PendingWait(predicate, where, loop.create_future())
+
+        if where:
+            column, value = next(iter(where.items()))
+            unique_index = getattr(table_cache, "unique_indexes", {}).get(column)
+            if unique_index is not None:
+                row = unique_index.get(value)
+                rows = [row] if row is not None else []
+            else:
+                rows = table_cache.filter_by(column, value)
         else:
-            # convert the delay to a datetime
-            fire_time = datetime.now() + timedelta(seconds=delay_secs)
-            scheduled_event = SpacetimeDBScheduledEvent(fire_time, callback, args)
-
-            # create async task
-            def on_scheduled_event():
-                self.event_queue.put_nowait(("scheduled_event", scheduled_event))
-                scheduled_event.callback(*scheduled_event.args)
-
-            async def wait_for_delay():
-                await asyncio.sleep(
-                    (scheduled_event.fire_time - datetime.now()).total_seconds()
-                )
-                on_scheduled_event()
+            rows = table_cache.values()
+        for row in rows:
+            if wait.matches(row):
+                return row
+
+        table_waits = self._table_waits.get(table_name)
+        if table_waits is None:
+            table_waits = self._table_waits[table_name] = _TableWaits()
+            self.client._register_table_update(table_name, table_waits.on_table_update)
+        table_waits.add(wait)
+        if timeout is not None:
+            wait.timeout_handle = loop.call_later(
+                timeout,
+                wait.fail,
+                SpacetimeDBException(f"Timed out waiting for {table_name}."),
+            )
 
-            asyncio.create_task(wait_for_delay())
+        try:
+            return await wait.future
+        finally:
+            if wait.timeout_handle is not None:
+                wait.timeout_handle.cancel()
+            table_waits.remove(wait)
+            if not table_waits:
+                # the callback list may be being iterated by update(), unregister after it returned
+                loop.call_soon(self._release_table_waits, table_name)
+
+    def _release_table_waits(self, table_name):
+        table_waits = self._table_waits.get(table_name)
+        if table_waits is not None and not table_waits:
+            del self._table_waits[table_name]
+            self.client._unregister_table_update(table_name, table_waits.on_table_update)
+
+    def _fail_table_waits(self, exception):
+        for table_waits in list(self._table_waits.values()):
+            table_waits.fail(exception)
+
+    def _change_streams_blocked(self):
+        for stream in self._change_streams:
+            if stream.blocks_updates():
+                return True
+        return False
+
+    def _on_change_stream_drained(self):
+        # a blocking stream has room again, apply the messages that waited for it
+        if self.loop is not None and self.client.has_pending_updates():
+            self._on_message_queued()
+
+    def _on_change_stream_closed(self, stream):
+        self._change_streams.remove(stream)
+        self.client._unregister_row_update(stream.table_name, stream._on_row_update)
+        if not any(other.policy == "block" for other in self._change_streams):
+            self.client._pause_update = None
+        self._on_change_stream_drained()
 
     def register_on_subscription_applied(self, callback):
         """
@@ -117,6 +402,42 @@ class SpacetimeDBAsyncClient:
 
         self.client.subscribe(queries)
 
+    def use(self):
+        """
+        Select this client for the generated bindings within a `with` block. Needed when a process runs more
+        than one client, see SpacetimeDBClient.use.
+
+        Example:
+            with spacetime_client.use():
+                send_message_reducer.send_message("Hello World!")
+        """
+
+        return self.client.use()
+
+    def enable_metrics(self):
+        """
+        Start recording stage timings, row counts and traffic of the incoming message pipeline, see SpacetimeDBClient.enable_metrics.
+
+        Returns:
+            ClientMetrics: The metrics object.
+        """
+
+        return self.client.enable_metrics()
+
+    def get_metrics(self):
+        """
+        Returns the recorded metrics together with the current queue depths, see SpacetimeDBClient.get_metrics.
+        """
+
+        return self.client.get_metrics()
+
+    def limit_message_queue(self, max_messages, policy="block"):
+        """
+        Bound the number of decoded messages waiting to be applied, see SpacetimeDBClient.limit_message_queue.
+        """
+
+        self.client.limit_message_queue(max_messages, policy)
+
     def force_close(self):
         """
         Signal the client to stop processing events and close the connection to the server.
@@ -125,8 +446,10 @@ class SpacetimeDBAsyncClient:
         """
 
         self.is_closing = True
-
-        # TODO Cancel all scheduled event tasks
+        self.scheduler.cancel_all()
+        for stream in list(self._change_streams):
+            stream.close()
+        self._fail_table_waits(SpacetimeDBException("Client closed."))
 
         self.event_queue.put_nowait(("force_close", None))
 
@@ -138,6 +461,8 @@ class SpacetimeDBAsyncClient:
         ssl_enabled,
         on_connect,
         subscription_queries=[],
+        protocol="text",
+        reconnect_policy=None,
     ):
         """
         Run the client. This function will not return until the client is closed.
@@ -149,13 +474,21 @@ class SpacetimeDBAsyncClient:
             ssl_enabled : True to use SSL, False to not use SSL
             on_connect : function to call when the client connects to the server
             subscription_queries : list of queries to subscribe to
+            protocol : wire protocol to use, "text" (JSON) or "binary" (BSATN), Default: "text"
+            reconnect_policy : ReconnectPolicy used to reconnect and resubscribe when the connection drops instead of raising, see spacetimedb_sdk.reconnect, Default: None
         """
 
         if not self.event_queue:
             self._on_async_loop_start()
 
         identity_result = await self.connect(
-            auth_token, host, address_or_name, ssl_enabled, subscription_queries
+            auth_token,
+            host,
+            address_or_name,
+            ssl_enabled,
+            subscription_queries,
+            protocol,
+            reconnect_policy,
         )
 
         if on_connect is not None:
@@ -173,11 +506,17 @@ class SpacetimeDBAsyncClient:
         while not self.is_closing:
             event, payload = await self._event()
             if event == "disconnected":
+                self._fail_pending_reducer_calls(
+                    SpacetimeDBException("Disconnected.")
+                )
+                self._fail_table_waits(SpacetimeDBException("Disconnected."))
                 if self.is_closing:
                     return payload
                 else:
                     raise payload
             elif event == "error":
+                self._fail_pending_reducer_calls(payload)
+                self._fail_table_waits(payload)
                 raise payload
             elif event == "force_close":
                 break
@@ -185,7 +524,14 @@ class SpacetimeDBAsyncClient:
         await self.close()
 
     async def connect(
-        self, auth_token, host, address_or_name, ssl_enabled, subscription_queries=[]
+        self,
+        auth_token,
+        host,
+        address_or_name,
+        ssl_enabled,
+        subscription_queries=[],
+        protocol="text",
+        reconnect_policy=None,
     ):
         """
         Connect to the server.
@@ -198,19 +544,22 @@ class SpacetimeDBAsyncClient:
             address_or_name : address or name of the module to connect to
             ssl_enabled : True to use SSL, False to not use SSL
             subscription_queries : list of queries to subscribe to
+            protocol : wire protocol to use, "text" (JSON) or "binary" (BSATN), Default: "text"
+            reconnect_policy : ReconnectPolicy used to reconnect and resubscribe when the connection drops instead of raising, see spacetimedb_sdk.reconnect, Default: None
         """
 
         if not self.event_queue:
             self._on_async_loop_start()
 
+        # these are called from the websocket thread
         def on_error(error):
-            self.event_queue.put_nowait(("error", SpacetimeDBException(error)))
+            self._put_event_threadsafe(("error", SpacetimeDBException(error)))
 
         def on_disconnect(close_msg):
             if self.is_closing:
-                self.event_queue.put_nowait(("disconnected", close_msg))
+                self._put_event_threadsafe(("disconnected", close_msg))
             else:
-                self.event_queue.put_nowait(("error", SpacetimeDBException(close_msg)))
+                self._put_event_threadsafe(("error", SpacetimeDBException(close_msg)))
 
         def on_identity_received(auth_token, identity, address):
             self.identity = identity
@@ -218,6 +567,15 @@ class SpacetimeDBAsyncClient:
             self.client.subscribe(subscription_queries)
             self.event_queue.put_nowait(("connected", (auth_token, identity)))
 
+        def on_connection_lost():
+            # results of calls sent on the lost connection will never arrive
+            self.loop.call_soon_threadsafe(
+                self._fail_pending_reducer_calls,
+                SpacetimeDBException("Connection lost."),
+            )
+
+        self.client._on_connection_lost = on_connection_lost
+
         self.client.connect(
             auth_token,
             host,
@@ -227,6 +585,8 @@ class SpacetimeDBAsyncClient:
             on_error=on_error,
             on_disconnect=on_disconnect,
             on_identity=on_identity_received,
+            protocol=protocol,
+            reconnect_policy=reconnect_policy,
         )
 
         while True:
@@ -237,37 +597,83 @@ class SpacetimeDBAsyncClient:
                 self.is_connected = True
                 return payload
 
-    async def call_reducer(self, reducer_name, *reducer_args):
+    async def call_reducer(self, reducer_name, *reducer_args, timeout=None):
         """
         Call a reducer on the async loop. This function will not return until the reducer call completes.
 
-        NOTE: DO NOT call this function if you are using the run() function. You should use the
-        auto-generated reducer functions instead.
+        Many calls can be in flight at once, for example with asyncio.gather(). Use send_reducer() to
+        get the future without awaiting it.
 
         Args:
             reducer_name : name of the reducer to call
             reducer_args (variable) : arguments to pass to the reducer
+            timeout : seconds to wait for the result, Default: request_timeout
+
+        Returns:
+            TransactionUpdateMessage: the transaction update for this call
 
         """
 
-        def on_reducer_result(event):
-            if event.reducer == reducer_name and event.caller_identity == self.identity:
-                self.event_queue.put_nowait(("reducer_result", event))
+        return await self.send_reducer(reducer_name, *reducer_args, timeout=timeout)
 
-        self.client.register_on_event(on_reducer_result)
+    def send_reducer(self, reducer_name, *reducer_args, timeout=None):
+        """
+        Send a reducer call without waiting for it to complete.
 
-        timeout_task = asyncio.create_task(self._timeout_task(self.request_timeout))
+        Results are correlated with calls by order: SpacetimeDB runs the reducer calls of a connection
+        in the order they were sent, and the client keeps every call it sent, including the ones made
+        through the generated reducer functions, until its TransactionUpdate arrives. A result that
+        arrives after the timeout is discarded.
 
-        self.client._reducer_call(reducer_name, *reducer_args)
+        Args:
+            reducer_name : name of the reducer to call
+            reducer_args (variable) : arguments to pass to the reducer
+            timeout : seconds to wait for the result before the future fails with SpacetimeDBException, Default: request_timeout
 
-        while True:
-            event, payload = await self._event()
-            if event == "reducer_result":
-                if not timeout_task.done():
-                    timeout_task.cancel()
-                return payload
-            elif event == "timeout":
-                raise SpacetimeDBException("Reducer call timed out.")
+        Returns:
+            asyncio.Future: resolves to the TransactionUpdateMessage for this call
+
+        Example:
+            futures = [spacetime_client.send_reducer("send_message", f"hello {i}") for i in range(100)]
+            results = await asyncio.gather(*futures)
+        """
+
+        if timeout is None:
+            timeout = self.request_timeout
+
+        call = _PendingReducerCall(self.loop.create_future())
+        # a failed send raises here, before the call waits for a result.
+        # Results are applied on the loop, so none can arrive before the call is pending.
+        self.client._reducer_call(
+            reducer_name,
+            *reducer_args,
+            on_result=lambda event: self._on_reducer_call_result(call, event),
+        )
+        if timeout:
+            call.timeout_handle = self.loop.call_later(
+                timeout, self._on_reducer_call_timeout, call
+            )
+        self._pending_reducer_calls.add(call)
+
+        return call.future
+
+    def _on_reducer_call_timeout(self, call):
+        self._pending_reducer_calls.discard(call)
+        call.fail(SpacetimeDBException("Reducer call timed out."))
+
+    def _on_reducer_call_result(self, call, event):
+        # called by the client in update() with the TransactionUpdate of the call, or None if it got none
+        self._pending_reducer_calls.discard(call)
+        if event is None:
+            call.fail(SpacetimeDBException("Reducer call got no result."))
+        else:
+            call.resolve(event)
+
+    def _fail_pending_reducer_calls(self, exception):
+        calls = self._pending_reducer_calls
+        self._pending_reducer_calls = set()
+        for call in calls:
+            call.fail(exception, retrieved=True)
 
     async def close(self):
         """
@@ -276,6 +682,11 @@ class SpacetimeDBAsyncClient:
         NOTE: DO NOT call this function if you are using the run() function. It will close for you.
         """
         self.is_closing = True
+        self.scheduler.cancel_all()
+        for stream in list(self._change_streams):
+            stream.close()
+        self._fail_pending_reducer_calls(SpacetimeDBException("Client closed."))
+        self._fail_table_waits(SpacetimeDBException("Client closed."))
 
         timeout_task = asyncio.create_task(self._timeout_task(self.request_timeout))
 
@@ -291,32 +702,38 @@ class SpacetimeDBAsyncClient:
                 raise SpacetimeDBException("Close time out.")
 
     def _on_async_loop_start(self):
+        self.loop = asyncio.get_running_loop()
         self.event_queue = asyncio.Queue()
-        for event in self.prescheduled_events:
-            self.schedule_event(event[0], event[1], *event[2])
+        self.client._on_message_queued = self._on_message_queued
+        self.scheduler.start(self.loop)
 
-    async def _timeout_task(self, timeout):
-        await asyncio.sleep(timeout)
-        self.event_queue.put_nowait(("timeout",))
+    def _put_event_threadsafe(self, event):
+        self.loop.call_soon_threadsafe(self.event_queue.put_nowait, event)
 
-    # TODO: Replace this with a proper async queue
-    async def _event(self):
-        update_task = asyncio.create_task(self._periodic_update())
+    def _on_message_queued(self):
+        # called on the websocket decode thread, wake the loop up to apply the message right away
+        if not self._update_scheduled:
+            self._update_scheduled = True
+            self.loop.call_soon_threadsafe(self._apply_updates)
+
+    def _apply_updates(self):
+        # clear the flag first so a message queued while we are applying schedules another pass
+        self._update_scheduled = False
         try:
-            result = await self.event_queue.get()
-            update_task.cancel()
-            return result
+            self.client.update(max_seconds=self.update_budget)
         except Exception as e:
-            update_task.cancel()
             print(f"Exception: {e}")
-            raise e
+            self.event_queue.put_nowait(("error", e))
+            return
 
-    async def _periodic_update(self):
-        while True:
-            try:
-                self.client.update()
-            except Exception as e:
-                print(f"Exception: {e}")
-                self.event_queue.put_nowait(("error", e))
-                return
-            await asyncio.sleep(0.1)
+        if self.update_budget is not None and not self._update_scheduled and self.client.has_pending_updates():
+            # out of budget, continue after the other ready tasks had their turn
+            self._update_scheduled = True
+            self.loop.call_soon(self._apply_updates)
+
+    async def _timeout_task(self, timeout):
+        await asyncio.sleep(timeout)
+        self.event_queue.put_nowait(("timeout", None))
+
+    async def _event(self):
+        return await self.event_queue.get()
@@ -1,12 +1,28 @@
 from typing import List, Dict, Callable
 from types import ModuleType
 
-import json
+import collections
+import contextlib
+import contextvars
 import queue
 import random
+import threading
+import time
 
 from spacetimedb_sdk.spacetime_websocket_client import WebSocketClient
-from spacetimedb_sdk.client_cache import ClientCache
+from spacetimedb_sdk.client_cache import ClientCache, StagedSubscriptionUpdate
+from spacetimedb_sdk.bsatn import BsatnReader, BsatnWriter
+from spacetimedb_sdk.json_codec import JsonCodec, get_json_codec
+from spacetimedb_sdk import binary_protocol
+from spacetimedb_sdk import cache_snapshot
+from spacetimedb_sdk.reconnect import ReconnectPolicy
+from spacetimedb_sdk.metrics import ClientMetrics
+from spacetimedb_sdk.traffic_recorder import TrafficRecorder
+from spacetimedb_sdk.process_decode import ProcessPoolDecoder
+from spacetimedb_sdk.message_queue import MessageQueue
+
+# client used by the generated bindings when no client is passed explicitly, see SpacetimeDBClient.current
+_current_client = contextvars.ContextVar("spacetimedb_current_client", default=None)
 
 
 class Identity:
@@ -57,6 +73,10 @@ class Identity:
     def __hash__(self):
         return hash(self.data)
 
+    # pickle as the bytes only, rows are pickled by cache snapshots and process decoding
+    def __reduce__(self):
+        return (Identity, (self.data,))
+
 class Address:
     """
     Represents a user address. This is a wrapper around the Uint8Array that is recieved from SpacetimeDB.
@@ -97,7 +117,7 @@ class Address:
         Returns:
             Address: The Address object.
         """
-        if all(byte == 0 for byte in address_bytes):
+        if all(byte == 0 for byte in data):
             return None
         else:
             return Address(data)
@@ -120,6 +140,10 @@ class Address:
     def __hash__(self):
         return hash(self.data)
 
+    # pickle as the bytes only, rows are pickled by cache snapshots and process decoding
+    def __reduce__(self):
+        return (Address, (self.data,))
+
 
 class DbEvent:
     """
@@ -138,12 +162,53 @@ class DbEvent:
         self.row_op = row_op
         self.decoded_value = decoded_value
 
+    @property
+    def cache_value(self):
+        # the value stored by a LazyTableCache
+        return self.decoded_value
+
+
+class _LazyDbEvent(DbEvent):
+    """
+    Insert event of a LazyTableCache table. The row is decoded on first access of decoded_value.
+
+    This class is intended for internal use only and should not be used externally.
+    """
+
+    def __init__(self, table_name, row_pk, raw_value, table_cache):
+        self.table_name = table_name
+        self.row_pk = row_pk
+        self.row_op = "insert"
+        self.raw_value = raw_value
+        self._table_cache = table_cache
+        self._decoded_value = None
+
+    @property
+    def decoded_value(self):
+        if self._decoded_value is None:
+            self._decoded_value = self._table_cache.decode_raw(self.raw_value)
+        return self._decoded_value
+
+    @decoded_value.setter
+    def decoded_value(self, decoded_value):
+        self._decoded_value = decoded_value
+
+    @property
+    def cache_value(self):
+        if self._decoded_value is not None:
+            return self._decoded_value
+        return self.raw_value
+
 
 class _ClientApiMessage:
     """
     This class is intended for internal use only and should not be used externally.
     """
 
+    # perf_counter timestamps of the decode stage, only set while metrics are enabled
+    decode_started_at = None
+    decode_finished_at = None
+
     def __init__(self, transaction_type):
         self.transaction_type = transaction_type
         self.events = {}
@@ -165,6 +230,19 @@ class _IdentityReceivedMessage(_ClientApiMessage):
         self.address = address
 
 
+class _SentReducerCall:
+    """
+    This class is intended for internal use only and should not be used externally.
+    """
+
+    __slots__ = ("connection", "reducer_name", "on_result")
+
+    def __init__(self, connection, reducer_name, on_result):
+        self.connection = connection
+        self.reducer_name = reducer_name
+        self.on_result = on_result
+
+
 class _SubscriptionUpdateMessage(_ClientApiMessage):
     """
     This class is intended for internal use only and should not be used externally.
@@ -179,13 +257,31 @@ class ReducerEvent:
     This class contains the information about a reducer event to be passed to row update callbacks.
     """
 
-    def __init__(self, caller_identity, caller_address, reducer_name, status, message, args):
+    def __init__(
+        self,
+        caller_identity,
+        caller_address,
+        reducer_name,
+        status,
+        message,
+        args,
+        args_codec=None,
+    ):
         self.caller_identity = caller_identity
         self.caller_address = caller_address
         self.reducer_name = reducer_name
         self.status = status
         self.message = message
-        self.args = args
+        self._args = args
+        self._args_codec = args_codec
+
+    @property
+    def args(self):
+        # in the text protocol the args arrive as a nested JSON string, only parse them when requested
+        if self._args_codec is not None:
+            self._args = self._args_codec.loads(self._args)
+            self._args_codec = None
+        return self._args
 
 
 class TransactionUpdateMessage(_ClientApiMessage):
@@ -212,21 +308,128 @@ class TransactionUpdateMessage(_ClientApiMessage):
         message: str,
         reducer_name: str,
         args: Dict,
+        args_codec: JsonCodec = None,
     ):
         super().__init__("TransactionUpdate")
         self.reducer_event = ReducerEvent(
-            caller_identity, caller_address, reducer_name, status, message, args
+            caller_identity,
+            caller_address,
+            reducer_name,
+            status,
+            message,
+            args,
+            args_codec,
         )
 
+    # later TransactionUpdateMessages whose row changes were merged into this one, see coalesce
+    coalesced = ()
+    # row_pk -> DbEvent per table while the message is being coalesced, turned back into events on first read
+    _coalesced_rows = None
+
+    @property
+    def events(self):
+        if self._coalesced_rows is not None:
+            self._events = {
+                table_name: list(table_rows.values())
+                for table_name, table_rows in self._coalesced_rows.items()
+                if table_rows
+            }
+            self._coalesced_rows = None
+        return self._events
+
+    @events.setter
+    def events(self, events):
+        self._events = events
+
+    def coalesce(self, later):
+        """
+        Merge the row changes of a later TransactionUpdateMessage into this one, used by a coalescing MessageQueue.
+
+        A row inserted by one transaction and deleted by the other (or the reverse) cancels out. The later
+        message keeps its reducer event but loses its row events; it is added to `coalesced` so its event and
+        reducer callbacks still run, after this message's.
+
+        Returns:
+            bool: False if later is not a TransactionUpdateMessage and was not merged.
+        """
+        if not isinstance(later, TransactionUpdateMessage):
+            return False
+
+        coalesced_rows = self._coalesced_rows
+        if coalesced_rows is None:
+            coalesced_rows = self._coalesced_rows = {
+                table_name: {db_event.row_pk: db_event for db_event in table_events}
+                for table_name, table_events in self._events.items()
+            }
+
+        for table_name, table_events in later.events.items():
+            table_rows = coalesced_rows.setdefault(table_name, {})
+            for db_event in table_events:
+                earlier_event = table_rows.pop(db_event.row_pk, None)
+                if earlier_event is None or earlier_event.row_op == db_event.row_op:
+                    table_rows[db_event.row_pk] = db_event
+
+        later.events = {}
+        if not self.coalesced:
+            self.coalesced = []
+        self.coalesced.append(later)
+        return True
+
 
 class SpacetimeDBClient:
     """
     The SpacetimeDBClient class is the primary interface for communication with the SpacetimeDB Module in the SDK, facilitating interaction with the database.
+
+    Every client has its own connection and cache, so one process can hold many clients connected to different
+    databases or with different identities. The generated bindings take an optional `client` argument and otherwise
+    use `SpacetimeDBClient.current()`.
     """
 
+    # the most recently created client, used by the bindings when no other client is selected
     instance = None
     client_cache = None
 
+    @classmethod
+    def current(cls, client=None):
+        """
+        Returns the client the generated bindings should use.
+
+        In order of precedence: the `client` argument, the client selected with `use()` in the current context
+        (row, table and reducer callbacks run with their own client selected), then `SpacetimeDBClient.instance`.
+
+        Args:
+            client (SpacetimeDBClient | SpacetimeDBAsyncClient, optional): An explicitly selected client.
+
+        Returns:
+            SpacetimeDBClient: The client.
+        """
+        if client is None:
+            client = _current_client.get()
+            if client is None:
+                return cls.instance
+        if not isinstance(client, SpacetimeDBClient):
+            # SpacetimeDBAsyncClient wraps a SpacetimeDBClient
+            client = client.client
+        return client
+
+    @contextlib.contextmanager
+    def use(self):
+        """
+        Select this client for the generated bindings within a `with` block. The selection is stored in a context
+        variable, so it is local to the current thread or asyncio task.
+
+        Example:
+            with chat_client.use():
+                for user in User.iter():
+                    print(user.name)
+                send_message_reducer.send_message("Hello World!")
+        """
+        token = _current_client.set(self)
+        try:
+            yield self
+        finally:
+            _current_client.reset(token)
+
     @classmethod
     def init(
         cls,
@@ -239,6 +442,13 @@ class SpacetimeDBClient:
         on_disconnect: Callable[[str], None] = None,
         on_identity: Callable[[str, Identity, Address], None] = None,
         on_error: Callable[[str], None] = None,
+        protocol: str = "text",
+        json_codec=None,
+        columnar_tables: List[str] = None,
+        reconnect_policy: ReconnectPolicy = None,
+        lazy_tables: List[str] = None,
+        decode_workers: int = 1,
+        max_pending_messages: int = 1024,
     ):
         """
         Create a network manager instance.
@@ -252,11 +462,28 @@ class SpacetimeDBClient:
             on_disconnect (Callable[[str], None], optional): Optional callback called when the Python client is disconnected from the SpacetimeDB module. The argument is the close message.
             on_identity (Callable[[str, Identity, Address], None], optional): Called when the user identity is recieved from SpacetimeDB. First argument is the auth token used to login in future sessions.
             on_error (Callable[[str], None], optional): Optional callback called when the Python client connection encounters an error. The argument is the error message.
+            protocol (str, optional): Wire protocol to use, either "text" (JSON) or "binary" (BSATN). Binary falls back to text if the module bindings were generated without binary decoders. Default: "text"
+            json_codec (str | JsonCodec, optional): JSON codec used by the text protocol. Either a codec instance or a backend name ("orjson", "ujson", "json" or "auto"). Default: the standard library json module, see spacetimedb_sdk.json_codec
+            columnar_tables (List[str], optional): Names of tables to store as NumPy column arrays instead of row objects, see spacetimedb_sdk.columnar_cache. Requires numpy.
+            reconnect_policy (ReconnectPolicy, optional): Reconnect with backoff when the connection drops instead of calling on_disconnect, see spacetimedb_sdk.reconnect. Default: None (no reconnect)
+            lazy_tables (List[str] | bool, optional): Names of tables whose rows are kept undecoded until they are read, or True for all tables. See spacetimedb_sdk.client_cache.LazyTableCache.
+            decode_workers (int, optional): Number of threads decoding incoming frames, results are applied in arrival order. Default: 1
+            max_pending_messages (int, optional): Frames allowed to wait for a decode thread before the socket reader blocks. Default: 1024
+
+        Returns:
+            SpacetimeDBClient: The new client. It also becomes `SpacetimeDBClient.instance`.
 
         Example:
             SpacetimeDBClient.init(autogen, on_connect=self.on_connect)
         """
-        client = SpacetimeDBClient(autogen_package)
+        client = SpacetimeDBClient(
+            autogen_package,
+            json_codec,
+            columnar_tables,
+            lazy_tables,
+            decode_workers,
+            max_pending_messages,
+        )
         client.connect(
             auth_token,
             host,
@@ -266,22 +493,95 @@ class SpacetimeDBClient:
             on_disconnect,
             on_identity,
             on_error,
+            protocol,
+            reconnect_policy,
         )
+        return client
 
     # Do not call this directly. Use init to instantiate the instance.
-    def __init__(self, autogen_package):
+    def __init__(
+        self,
+        autogen_package,
+        json_codec=None,
+        columnar_tables=None,
+        lazy_tables=None,
+        decode_workers=1,
+        max_pending_messages=1024,
+    ):
         SpacetimeDBClient.instance = self
 
         self._row_update_callbacks = {}
+        self._table_update_callbacks = {}
         self._reducer_callbacks = {}
         self._on_subscription_applied = []
+        self._on_subscription_progress = []
         self._on_event = []
 
+        # a SubscriptionUpdate being applied over several budgeted update() calls
+        self._staged_update = None
+        self._staged_message = None
+
         self.identity = None
         self.address = Address.random()
-
-        self.client_cache = ClientCache(autogen_package)
-        self.message_queue = queue.Queue()
+        self.protocol = "text"
+        self.json_codec = get_json_codec(json_codec)
+
+        # incoming frames are decoded by this many worker threads, results are applied in arrival order
+        self.decode_workers = decode_workers
+        # frames allowed to wait for a decode worker before the socket reader blocks
+        self.max_pending_messages = max_pending_messages
+
+        self.autogen_package = autogen_package
+        self.client_cache = ClientCache(autogen_package, columnar_tables, lazy_tables)
+        # callback lists are owned by the table apply plans so _do_update reaches them directly
+        for table_name, apply_plan in self.client_cache.apply_plans.items():
+            self._row_update_callbacks[table_name] = apply_plan.row_update_callbacks
+            self._table_update_callbacks[table_name] = (
+                apply_plan.table_update_callbacks
+            )
+        # decoded messages waiting for update(), unbounded until limit_message_queue is called
+        self.message_queue = MessageQueue(on_overflow=self._on_message_queue_overflow)
+        # set when the "disconnect" overflow policy gave up on the connection, messages are dropped until the next one
+        self._dropping_messages = False
+        # called from the decode thread after a message is queued, lets event loops wake up instead of polling
+        self._on_message_queued = None
+        # returns True while update() should leave the remaining messages queued, see SpacetimeDBAsyncClient.changes
+        self._pause_update = None
+
+        # row keys per table that are already cached when the next SubscriptionUpdate arrives, see _reconcile_subscription_update
+        self._reconcile_row_pks = None
+        self.snapshot_stats = {}
+
+        # user callbacks, set by connect(). A client that only replays a recording never connects.
+        self._on_connect = None
+        self._on_disconnect = None
+        self._on_identity = None
+        self._on_error = None
+
+        # connection state kept so a dropped connection can be re-opened, see _on_socket_close
+        self.reconnect_policy = None
+        # counts the sockets opened, tells reducer calls of a dropped connection from the current ones
+        self._connection_number = 0
+        # every reducer call sent, oldest first, until its TransactionUpdate arrives, see _match_reducer_call
+        self._sent_reducer_calls = collections.deque()
+        self._auth_token = None
+        self._connect_args = None
+        self._subscription_queries = None
+        self._closing = False
+        self._reconnecting = False
+        self._reconnect_attempt = 0
+        self._reconnect_timer = None
+        self._reconnect_lock = threading.Lock()
+        self._last_socket_error = None
+        # called on the websocket thread when the connection drops and a reconnect is scheduled
+        self._on_connection_lost = None
+
+        # ClientMetrics while metrics are enabled, see enable_metrics
+        self.metrics = None
+        # TrafficRecorder while recording, see start_recording
+        self.recorder = None
+        # ProcessPoolDecoder while process decoding is enabled, see enable_process_decoding
+        self.process_decoder = None
 
         self.processed_message_queue = queue.Queue()
 
@@ -295,41 +595,164 @@ class SpacetimeDBClient:
         on_disconnect,
         on_identity,
         on_error,
+        protocol="text",
+        reconnect_policy=None,
     ):
         self._on_connect = on_connect
         self._on_disconnect = on_disconnect
         self._on_identity = on_identity
         self._on_error = on_error
-
+        self.reconnect_policy = reconnect_policy
+        self._auth_token = auth_token
+        self._connect_args = (host, address_or_name, ssl_enabled)
+        self._closing = False
+        self._reconnecting = False
+        self._reconnect_attempt = 0
+
+        if protocol == "binary" and not self.client_cache.supports_bsatn:
+            print(
+                "[connect] Module bindings do not support the binary protocol, falling back to text"
+            )
+            protocol = "text"
+        self.protocol = protocol
+
+        self._open_socket()
+
+    def _open_socket(self):
+        host, address_or_name, ssl_enabled = self._connect_args
+        self._connection_number += 1
         self.wsc = WebSocketClient(
-            "v1.text.spacetimedb",
-            on_connect=on_connect,
-            on_error=on_error,
-            on_close=on_disconnect,
-            on_message=self._on_message,
+            binary_protocol.BINARY_PROTOCOL
+            if self.protocol == "binary"
+            else binary_protocol.TEXT_PROTOCOL,
+            on_connect=self._on_socket_open,
+            on_error=self._on_socket_error,
+            on_close=self._on_socket_close,
+            on_message=self._decode_message,
+            on_decoded=self._enqueue_message,
             client_address=self.address,
+            decode_workers=self.decode_workers,
+            max_pending_messages=self.max_pending_messages,
         )
+        self.wsc.metrics = self.metrics
+        self.wsc.recorder = self.recorder
         # print("CONNECTING " + host + " " + address_or_name)
         self.wsc.connect(
-            auth_token,
+            self._auth_token,
             host,
             address_or_name,
             ssl_enabled,
         )
 
-    def update(self):
+    # the socket callbacks below run on the websocket thread
+    def _on_socket_open(self):
+        if not self._reconnecting and self._on_connect:
+            self._on_connect()
+
+    def _on_socket_error(self, error):
+        if self.reconnect_policy is None or self._closing:
+            if self._on_error:
+                self._on_error(error)
+            return
+        # the socket closes after an error, the reconnect is scheduled from _on_socket_close
+        self._last_socket_error = error
+
+    def _on_socket_close(self, close_msg):
+        policy = self.reconnect_policy
+        if policy is None or self._closing:
+            if self._on_disconnect:
+                self._on_disconnect(close_msg)
+            return
+
+        reason = self._last_socket_error or close_msg
+        self._last_socket_error = None
+        attempt = self._reconnect_attempt
+        if not policy.should_retry(attempt):
+            print(f"[reconnect] Giving up after {attempt} attempts. ({reason})")
+            if self._on_disconnect:
+                self._on_disconnect(close_msg)
+            return
+
+        delay = policy.delay(attempt)
+        self._reconnect_attempt = attempt + 1
+        if self._on_connection_lost is not None:
+            self._on_connection_lost()
+        if policy.on_reconnecting:
+            policy.on_reconnecting(attempt + 1, delay, reason)
+
+        with self._reconnect_lock:
+            if self._closing:
+                return
+            self._reconnect_timer = threading.Timer(delay, self._reconnect)
+            self._reconnect_timer.daemon = True
+            self._reconnect_timer.start()
+
+    def _reconnect(self):
+        with self._reconnect_lock:
+            if self._closing or self._reconnect_timer is None:
+                return
+            if self.message_queue.full():
+                # closed by the "disconnect" overflow policy, a new connection would overflow again
+                # until update() has worked through the messages that are still queued
+                self._reconnect_timer = threading.Timer(
+                    self._reconnect_timer.interval, self._reconnect
+                )
+                self._reconnect_timer.daemon = True
+                self._reconnect_timer.start()
+                return
+            self._reconnect_timer = None
+            self._reconnecting = True
+            self._open_socket()
+
+    def _on_reconnected(self):
+        # called from _do_update when the IdentityToken of a re-opened connection is applied
+        self._reconnecting = False
+        self._reconnect_attempt = 0
+        if self._subscription_queries is not None:
+            # diff the coming SubscriptionUpdate against the rows we still have
+            self._prepare_reconcile()
+            self.subscribe(self._subscription_queries)
+        if self.reconnect_policy is not None and self.reconnect_policy.on_reconnected:
+            self.reconnect_policy.on_reconnected()
+
+    def update(self, max_seconds: float = None, max_events: int = None):
         """
         Process all pending incoming messages from the SpacetimeDB module.
 
         NOTE: This function must be called on a regular interval to process incoming messages.
 
+        With max_seconds or max_events the call returns once the budget is used up and the remaining
+        messages are processed by the next calls. A SubscriptionUpdate is then applied in chunks to copies
+        of the tables it touches: the cache keeps showing the previous state until the whole update is
+        applied, then the copies replace the tables and the callbacks run. Progress is reported to the
+        callbacks registered with `register_on_subscription_progress`. Messages that arrive later wait
+        until the SubscriptionUpdate is done. A call without a budget finishes all pending work.
+
+        Args:
+            max_seconds (float, optional): Stop after about this much time. Default: None (no limit)
+            max_events (int, optional): Stop after about this many rows were applied. Default: None (no limit)
+
         Example:
             SpacetimeDBClient.init(autogen, on_connect=self.on_connect)
             while True:
                 SpacetimeDBClient.instance.update()  # Call the update function in a loop to process incoming messages
                 # Additional logic or code can be added here
+
+            # in a 60 fps game loop, spend at most 4 ms per frame on incoming messages
+            SpacetimeDBClient.instance.update(max_seconds=0.004)
+        """
+        # bindings used inside callbacks resolve to this client
+        token = _current_client.set(self)
+        try:
+            self._do_update(max_seconds, max_events)
+        finally:
+            _current_client.reset(token)
+
+    def has_pending_updates(self):
         """
-        self._do_update()
+        Returns True if update() has work left: received messages or a partly applied SubscriptionUpdate.
+        """
+        return self._staged_update is not None or not self.message_queue.empty()
 
     def close(self):
         """
@@ -344,8 +767,314 @@ class SpacetimeDBClient:
             SpacetimeDBClient.instance.close()
         """
 
+        with self._reconnect_lock:
+            self._closing = True
+            reconnect_timer = self._reconnect_timer
+            self._reconnect_timer = None
+
+        if reconnect_timer is not None:
+            # waiting to reconnect, there is no open socket to close
+            reconnect_timer.cancel()
+            if self._on_disconnect:
+                self._on_disconnect("Client closed.")
+            return
+
         self.wsc.close()
 
+    def save_cache_snapshot(self, path: str):
+        """
+        Save the client cache to a snapshot file so it can be reloaded on the next start with `load_cache_snapshot`.
+
+        Args:
+            path (str): The snapshot file path.
+
+        Returns:
+            dict: rows_saved, bytes_written and save_seconds.
+
+        Example:
+            SpacetimeDBClient.instance.save_cache_snapshot("cache.snapshot")
+        """
+        return cache_snapshot.save_snapshot(self.client_cache, path)
+
+    def load_cache_snapshot(self, path: str):
+        """
+        Load a snapshot saved with `save_cache_snapshot` into the client cache. Call this before connecting.
+
+        The next SubscriptionUpdate is reconciled against the loaded rows instead of being applied to an empty cache:
+        rows that are still present are not decoded again, and row update callbacks are only called for rows that
+        were inserted, updated or deleted since the snapshot was taken. Timings for the load and the reconcile are
+        available in `snapshot_stats`.
+
+        Args:
+            path (str): The snapshot file path.
+
+        Returns:
+            dict: rows_loaded and load_seconds.
+
+        Example:
+            client = SpacetimeDBClient(module_bindings)
+            if os.path.exists("cache.snapshot"):
+                client.load_cache_snapshot("cache.snapshot")
+        """
+        stats = cache_snapshot.load_snapshot(self.client_cache, path)
+        self.snapshot_stats = dict(stats)
+        self._prepare_reconcile()
+        return stats
+
+    def _prepare_reconcile(self):
+        # the decode workers read this to skip decoding rows that are already cached
+        self._reconcile_row_pks = {
+            table_name: frozenset(table_cache.entries.keys())
+            for table_name, table_cache in self.client_cache.tables.items()
+        }
+
+    def _process_decoder_for(self, table_row_counts):
+        # the process decoder if a SubscriptionUpdate with these row counts per table is large enough for it
+        process_decoder = self.process_decoder
+        if process_decoder is None or sum(table_row_counts) < process_decoder.min_rows:
+            return None
+        return process_decoder
+
+    def _lazy_table_cache(self, table_name):
+        # the table cache of a lazy table whose rows can be applied undecoded, None if rows have to be decoded.
+        # Called on the decode workers: a callback or index added after this check makes apply decode the row.
+        apply_plan = self.client_cache.apply_plans.get(table_name)
+        if apply_plan is None or apply_plan.needs_decoded_rows():
+            return None
+        return apply_plan.table_cache
+
+    def _decode_row(self, table_name, row):
+        if isinstance(row, (bytes, bytearray)):
+            return self.client_cache.decode_bsatn(table_name, row)
+        return self.client_cache.decode(table_name, row)
+
+    def _reconcile_subscription_update(self, subscription_message):
+        # turn a full SubscriptionUpdate into the difference against what is already cached
+        start = time.perf_counter()
+        rows_kept = 0
+        rows_inserted = 0
+        rows_deleted = 0
+
+        for table_name, table_cache in self.client_cache.tables.items():
+            entries = table_cache.entries
+            subscribed_row_pks = set()
+            table_events = []
+
+            for db_event in subscription_message.events.get(table_name, ()):
+                subscribed_row_pks.add(db_event.row_pk)
+                if db_event.row_pk in entries:
+                    rows_kept += 1
+                    continue
+                if db_event.decoded_value is None:
+                    db_event.decoded_value = self._decode_row(
+                        table_name, db_event.raw_value
+                    )
+                table_events.append(db_event)
+                rows_inserted += 1
+
+            for row_pk in list(entries.keys()):
+                if row_pk not in subscribed_row_pks:
+                    table_events.append(DbEvent(table_name, row_pk, "delete"))
+                    rows_deleted += 1
+
+            if table_events:
+                subscription_message.events[table_name] = table_events
+            else:
+                subscription_message.events.pop(table_name, None)
+
+        self._reconcile_row_pks = None
+        self.snapshot_stats.update(
+            {
+                "reconcile_seconds": time.perf_counter() - start,
+                "rows_kept": rows_kept,
+                "rows_inserted": rows_inserted,
+                "rows_deleted": rows_deleted,
+            }
+        )
+
+    def decode_queue_stats(self):
+        """
+        Returns the queue depth metrics of the incoming message decode pipeline.
+
+        Returns:
+            dict: queue_depth, max_queue_depth, reorder_depth, max_reorder_depth, submitted, delivered, errors and workers.
+                None if the client has not connected yet.
+
+        Example:
+            stats = SpacetimeDBClient.instance.decode_queue_stats()
+            print(stats["queue_depth"], stats["max_queue_depth"])
+        """
+        wsc = getattr(self, "wsc", None)
+        if wsc is None:
+            return None
+        return wsc.decode_queue_stats()
+
+    def limit_message_queue(self, max_messages: int, policy: str = "block"):
+        """
+        Bound the number of decoded messages waiting for update(), see spacetimedb_sdk.message_queue.
+
+        Args:
+            max_messages (int): Maximum number of queued messages, 0 for no limit.
+            policy (str, optional): What happens to messages arriving while the queue is full. Default: "block"
+                "block" stalls the socket reader until update() catches up.
+                "coalesce" merges TransactionUpdates into the newest queued one; event and reducer callbacks still
+                run for every transaction, row callbacks see the merged changes.
+                "disconnect" closes the connection and drops messages until the next connection (see ReconnectPolicy).
+
+        Raises:
+            ValueError: If the policy is unknown.
+
+        Example:
+            SpacetimeDBClient.instance.limit_message_queue(10_000, policy="coalesce")
+        """
+        self.message_queue.set_limit(max_messages, policy)
+
+    def message_queue_stats(self):
+        """
+        Returns the metrics of the queue of decoded messages waiting for update().
+
+        Returns:
+            dict: depth, max_depth (high water mark), maxsize, policy, put, full, blocked_seconds, coalesced and dropped.
+
+        Example:
+            stats = SpacetimeDBClient.instance.message_queue_stats()
+            if stats["max_depth"] > 1000:
+                print("update() is falling behind")
+            SpacetimeDBClient.instance.message_queue.reset_high_water()
+        """
+        return self.message_queue.stats()
+
+    def enable_metrics(self):
+        """
+        Start recording stage timings, row counts and traffic of the incoming message pipeline, see spacetimedb_sdk.metrics.
+
+        While metrics are disabled (the default) the pipeline only checks a single attribute per message.
+
+        Returns:
+            ClientMetrics: The metrics object, use add_hook() on it to be notified of every stage timing.
+
+        Example:
+            metrics = SpacetimeDBClient.instance.enable_metrics()
+            metrics.add_hook(lambda stage, seconds: statsd.timing(stage, seconds * 1000))
+        """
+        if self.metrics is None:
+            self.metrics = ClientMetrics()
+        wsc = getattr(self, "wsc", None)
+        if wsc is not None:
+            wsc.metrics = self.metrics
+        return self.metrics
+
+    def disable_metrics(self):
+        """
+        Stop recording metrics. The recorded values are discarded.
+        """
+        self.metrics = None
+        wsc = getattr(self, "wsc", None)
+        if wsc is not None:
+            wsc.metrics = None
+
+    def get_metrics(self):
+        """
+        Returns the recorded metrics together with the current queue depths.
+
+        Returns:
+            dict: The ClientMetrics.snapshot() values plus message_queue_depth (messages decoded but not yet
+                applied by update()), message_queue (see message_queue_stats) and decode_queue (see
+                decode_queue_stats). None if metrics are disabled.
+
+        Example:
+            metrics = SpacetimeDBClient.instance.get_metrics()
+            print(metrics["stages"]["decode"]["p99"], metrics["table_rows"])
+        """
+        if self.metrics is None:
+            return None
+        snapshot = self.metrics.snapshot()
+        snapshot["message_queue_depth"] = self.message_queue.qsize()
+        snapshot["message_queue"] = self.message_queue_stats()
+        snapshot["decode_queue"] = self.decode_queue_stats()
+        return snapshot
+
+    def enable_process_decoding(
+        self, workers: int = None, min_rows: int = 20_000, chunk_rows: int = 5_000
+    ):
+        """
+        Decode the rows of large SubscriptionUpdates in a pool of worker processes, see spacetimedb_sdk.process_decode.
+
+        The workers are started before this returns, so the first subscription does not wait for them.
+        Only pays off for expensive rows on machines with several cores, measure with
+        benchmarks/bench_process_decode.py.
+
+        Args:
+            workers (int, optional): Number of worker processes. Default: os.cpu_count()
+            min_rows (int, optional): SubscriptionUpdates with fewer rows to decode are decoded in this process. Default: 20000
+            chunk_rows (int, optional): Rows sent to a worker at a time. Default: 5000
+
+        Returns:
+            ProcessPoolDecoder: The decoder.
+
+        Example:
+            if __name__ == "__main__":
+                SpacetimeDBClient.instance.enable_process_decoding(workers=4)
+        """
+        self.disable_process_decoding()
+        process_decoder = ProcessPoolDecoder(
+            self.autogen_package, workers, min_rows, chunk_rows
+        )
+        process_decoder.warm_up()
+        self.process_decoder = process_decoder
+        return process_decoder
+
+    def disable_process_decoding(self):
+        """
+        Decode all rows in this process again and stop the worker processes.
+        """
+        process_decoder = self.process_decoder
+        self.process_decoder = None
+        if process_decoder is not None:
+            process_decoder.close()
+
+    def start_recording(self, path: str):
+        """
+        Write every inbound frame with its arrival time to a recording file, including frames of later reconnects.
+        Replay the file offline with `spacetimedb_sdk.traffic_recorder.replay_recording`.
+
+        Args:
+            path (str): The recording file path. An existing file is overwritten.
+
+        Example:
+            SpacetimeDBClient.instance.start_recording("session.rec")
+        """
+        self.stop_recording()
+        self.recorder = TrafficRecorder(
+            path,
+            binary_protocol.BINARY_PROTOCOL
+            if self.protocol == "binary"
+            else binary_protocol.TEXT_PROTOCOL,
+        )
+        wsc = getattr(self, "wsc", None)
+        if wsc is not None:
+            wsc.recorder = self.recorder
+
+    def stop_recording(self):
+        """
+        Stop recording and close the recording file.
+
+        Returns:
+            dict: frames_recorded and bytes_recorded. None if the client was not recording.
+        """
+        recorder = self.recorder
+        if recorder is None:
+            return None
+        self.recorder = None
+        wsc = getattr(self, "wsc", None)
+        if wsc is not None:
+            wsc.recorder = None
+        recorder.close()
+        return {
+            "frames_recorded": recorder.frames_recorded,
+            "bytes_recorded": recorder.bytes_recorded,
+        }
+
     def subscribe(self, queries: List[str]):
         """
         Subscribe to receive data and transaction updates for the provided queries.
@@ -361,9 +1090,17 @@ class SpacetimeDBClient:
             queries = ["SELECT * FROM table1", "SELECT * FROM table2 WHERE col2 = 0"]
             SpacetimeDBClient.instance.subscribe(queries)
         """
-        json_data = json.dumps(queries)
+        # re-sent after a reconnect
+        self._subscription_queries = list(queries)
+
+        if self.protocol == "binary":
+            self.wsc.send(binary_protocol.encode_subscribe(queries), binary=True)
+            return
+
+        # orjson does not escape non-ASCII characters, text frames are UTF-8
+        json_data = self.json_codec.dumps(queries)
         self.wsc.send(
-            bytes(f'{{"subscribe": {{ "query_strings": {json_data}}}}}', "ascii")
+            bytes(f'{{"subscribe": {{ "query_strings": {json_data}}}}}', "utf-8")
         )
 
     def register_on_subscription_applied(self, callback: Callable[[], None]):
@@ -402,6 +1139,32 @@ class SpacetimeDBClient:
         if self._on_subscription_applied is not None:
             self._on_subscription_applied.remove(callback)
 
+    def register_on_subscription_progress(self, callback: Callable[[int, int], None]):
+        """
+        Register a callback function to be executed after each step of a SubscriptionUpdate applied by budgeted update() calls.
+
+        Args:
+            callback (Callable[[int, int], None]): A callback function that will be invoked with the number of
+                rows processed so far and the total number of rows to process. The total includes the rows
+                already cached for the tables of the update, as they are copied too.
+
+        Example:
+            def progress_callback(applied, total):
+                loading_bar.set(applied / total)
+
+            SpacetimeDBClient.instance.register_on_subscription_progress(progress_callback)
+        """
+        self._on_subscription_progress.append(callback)
+
+    def unregister_on_subscription_progress(self, callback: Callable[[int, int], None]):
+        """
+        Unregister a callback function registered with `register_on_subscription_progress`.
+
+        Args:
+            callback (Callable[[int, int], None]): The callback function to remove.
+        """
+        self._on_subscription_progress.remove(callback)
+
     def register_on_event(self, callback: Callable[[TransactionUpdateMessage], None]):
         """
         Register a callback function to handle transaction update events.
@@ -460,6 +1223,24 @@ class SpacetimeDBClient:
         if table_name in self._row_update_callbacks:
             self._row_update_callbacks[table_name].remove(callback)
 
+    def _register_table_update(
+        self,
+        table_name: str,
+        callback: Callable[[list, list, list, ReducerEvent], None],
+    ):
+        if table_name not in self._table_update_callbacks:
+            self._table_update_callbacks[table_name] = []
+
+        self._table_update_callbacks[table_name].append(callback)
+
+    def _unregister_table_update(
+        self,
+        table_name: str,
+        callback: Callable[[list, list, list, ReducerEvent], None],
+    ):
+        if table_name in self._table_update_callbacks:
+            self._table_update_callbacks[table_name].remove(callback)
+
     def _register_reducer(self, reducer_name, callback):
         if reducer_name not in self._reducer_callbacks:
             self._reducer_callbacks[reducer_name] = []
@@ -470,34 +1251,150 @@ class SpacetimeDBClient:
         if reducer_name in self._reducer_callbacks:
             self._reducer_callbacks[reducer_name].remove(callback)
 
-    def _reducer_call(self, reducer, *args):
+    def _reducer_call(self, reducer, *args, on_result=None):
+        """
+        Send a reducer call.
+
+        Args:
+            reducer (str): The name of the reducer.
+            args (variable): The reducer arguments.
+            on_result (Callable[[TransactionUpdateMessage], None], optional): Called in update() with the
+                TransactionUpdate of this call, or with None if the connection dropped or the server
+                answered a later call first.
+        """
         if not self.wsc.is_connected:
             print("[reducer_call] Not connected")
 
-        message = {
-            "fn": reducer,
-            "args": args,
-        }
-
-        json_data = json.dumps(message)
-        # print("_reducer_call(JSON): " + json_data)
-        self.wsc.send(bytes(f'{{"call": {json_data}}}', "ascii"))
+        if self.protocol == "binary":
+            writer = BsatnWriter()
+            self.client_cache.reducer_bsatn_encoders[reducer](writer, *args)
+            data = binary_protocol.encode_function_call(reducer, writer.getvalue())
+        else:
+            message = {
+                "fn": reducer,
+                "args": args,
+            }
+
+            json_data = self.json_codec.dumps(message)
+            # print("_reducer_call(JSON): " + json_data)
+            data = bytes(f'{{"call": {json_data}}}', "utf-8")
+
+        # every call is recorded, also the ones of the generated reducer functions, so results are matched
+        # to calls by their order. It is recorded before sending, update() may run on another thread.
+        call = _SentReducerCall(self._connection_number, reducer, on_result)
+        self._sent_reducer_calls.append(call)
+        try:
+            self.wsc.send(data, binary=self.protocol == "binary")
+        except Exception:
+            self._sent_reducer_calls.remove(call)
+            raise
+
+    def _match_reducer_call(self, transaction):
+        # SpacetimeDB runs the reducer calls of a connection in the order they were sent and answers each
+        # with a TransactionUpdate, so the result belongs to the oldest sent call of the reducer. Calls sent
+        # before it got no result.
+        reducer_name = transaction.reducer_event.reducer_name
+        calls = self._sent_reducer_calls
+        if not any(call.reducer_name == reducer_name for call in calls):
+            return
+        while True:
+            call = calls.popleft()
+            if call.reducer_name == reducer_name:
+                if call.on_result is not None:
+                    call.on_result(transaction)
+                return
+            if call.on_result is not None:
+                call.on_result(None)
+
+    def _drop_reducer_calls(self, connection_number):
+        # calls sent on earlier connections will not get their result
+        calls = self._sent_reducer_calls
+        while calls and calls[0].connection < connection_number:
+            call = calls.popleft()
+            if call.on_result is not None:
+                call.on_result(None)
 
     def _on_message(self, data):
+        clientapi_message = self._decode_message(data)
+        if clientapi_message is not None:
+            self._enqueue_message(clientapi_message)
+
+    def _enqueue_message(self, clientapi_message):
+        # the first message of a connection, always queued so reconnects are handled
+        identity_received = clientapi_message.transaction_type == "IdentityReceived"
+        if self._dropping_messages:
+            if not identity_received:
+                self.message_queue.drop()
+                return
+            self._dropping_messages = False
+
+        if (
+            self.message_queue.put(clientapi_message, force=identity_received)
+            and self._on_message_queued is not None
+        ):
+            self._on_message_queued()
+
+    def _on_message_queue_overflow(self):
+        # runs on the decode thread when the message queue is full under the "disconnect" policy
+        if self._dropping_messages:
+            return
+        self._dropping_messages = True
+        print(
+            f"[_on_message_queue_overflow] Error, message queue full ({self.message_queue.maxsize} messages), closing the connection."
+        )
+        if self._on_error:
+            self._on_error("Message queue full.")
+        wsc = getattr(self, "wsc", None)
+        if wsc is not None:
+            wsc.close()
+
+    def _decode_message(self, data):
+        # runs on the websocket decode workers, must not touch the client cache
+        metrics = self.metrics
+        if metrics is None:
+            return self._decode_frame(data)
+
+        decode_started_at = time.perf_counter()
+        clientapi_message = self._decode_frame(data)
+        decode_finished_at = time.perf_counter()
+        metrics.record("decode", decode_finished_at - decode_started_at)
+        if clientapi_message is not None:
+            clientapi_message.decode_started_at = decode_started_at
+            clientapi_message.decode_finished_at = decode_finished_at
+        return clientapi_message
+
+    def _decode_frame(self, data):
+        if isinstance(data, (bytes, bytearray)) and self.protocol == "binary":
+            return self._decode_binary_message(data)
+
         # print("_on_message data: " + data)
-        message = json.loads(data)
+        metrics = self.metrics
+        if metrics is not None:
+            parse_started_at = time.perf_counter()
+        message = self.json_codec.loads(data)
+        if metrics is not None:
+            metrics.record("parse", time.perf_counter() - parse_started_at)
         if "IdentityToken" in message:
             # is this safe to do in the message thread?
             token = message["IdentityToken"]["token"]
             identity = Identity.from_string(message["IdentityToken"]["identity"])
             address = Address.from_string(message["IdentityToken"]["address"])
-            self.message_queue.put(_IdentityReceivedMessage(token, identity, address))
+            return _IdentityReceivedMessage(token, identity, address)
         elif "SubscriptionUpdate" in message or "TransactionUpdate" in message:
             clientapi_message = None
             table_updates = None
+            reconcile_row_pks = None
+            process_decoder = None
             if "SubscriptionUpdate" in message:
                 clientapi_message = _SubscriptionUpdateMessage()
                 table_updates = message["SubscriptionUpdate"]["table_updates"]
+                reconcile_row_pks = self._reconcile_row_pks
+                process_decoder = self._process_decoder_for(
+                    len(table_update["table_row_operations"])
+                    for table_update in table_updates
+                )
+            # rows to decode in the worker processes, per table
+            pending_rows = {} if process_decoder is not None else None
             if "TransactionUpdate" in message:
                 spacetime_message = message["TransactionUpdate"]
                 # DAB Todo: We need reducer codegen to parse the args
@@ -507,7 +1404,8 @@ class SpacetimeDBClient:
                     spacetime_message["event"]["status"],
                     spacetime_message["event"]["message"],
                     spacetime_message["event"]["function_call"]["reducer"],
-                    json.loads(spacetime_message["event"]["function_call"]["args"]),
+                    spacetime_message["event"]["function_call"]["args"],
+                    self.json_codec,
                 )
                 table_updates = message["TransactionUpdate"]["subscription_update"][
                     "table_updates"
@@ -515,10 +1413,41 @@ class SpacetimeDBClient:
 
             for table_update in table_updates:
                 table_name = table_update["table_name"]
+                cached_row_pks = (
+                    reconcile_row_pks.get(table_name, ())
+                    if reconcile_row_pks is not None
+                    else ()
+                )
+                lazy_table_cache = self._lazy_table_cache(table_name)
 
                 for table_row_op in table_update["table_row_operations"]:
                     row_op = table_row_op["op"]
-                    if row_op == "insert":
+                    if row_op == "insert" and table_row_op["row_pk"] in cached_row_pks:
+                        # already cached, decoding is deferred to _reconcile_subscription_update
+                        db_event = DbEvent(table_name, table_row_op["row_pk"], row_op)
+                        db_event.raw_value = table_row_op["row"]
+                        clientapi_message.append_event(table_name, db_event)
+                    elif row_op == "insert" and lazy_table_cache is not None:
+                        clientapi_message.append_event(
+                            table_name,
+                            _LazyDbEvent(
+                                table_name,
+                                table_row_op["row_pk"],
+                                table_row_op["row"],
+                                lazy_table_cache,
+                            ),
+                        )
+                    elif (
+                        row_op == "insert"
+                        and pending_rows is not None
+                        and table_name in self.client_cache.tables
+                    ):
+                        db_event = DbEvent(table_name, table_row_op["row_pk"], row_op)
+                        pending_rows.setdefault(table_name, []).append(
+                            (db_event, table_row_op["row"])
+                        )
+                        clientapi_message.append_event(table_name, db_event)
+                    elif row_op == "insert":
                         decoded_value = self.client_cache.decode(
                             table_name, table_row_op["row"]
                         )
@@ -537,148 +1466,313 @@ class SpacetimeDBClient:
                             DbEvent(table_name, table_row_op["row_pk"], row_op),
                         )
 
-            self.message_queue.put(clientapi_message)
+            if pending_rows:
+                process_decoder.decode_events(pending_rows, self.client_cache.tables)
+
+            return clientapi_message
+
+    def _decode_binary_message(self, data):
+        metrics = self.metrics
+        if metrics is not None:
+            parse_started_at = time.perf_counter()
+        message = binary_protocol.decode_server_message(data)
+        if metrics is not None:
+            metrics.record("parse", time.perf_counter() - parse_started_at)
+        if message is None:
+            return None
+
+        if message.message_type == "IdentityToken":
+            identity = Identity.from_bytes(message.identity)
+            address = Address.from_bytes(message.address)
+            return _IdentityReceivedMessage(message.token, identity, address)
+
+        reconcile_row_pks = None
+        process_decoder = None
+        if message.message_type == "SubscriptionUpdate":
+            clientapi_message = _SubscriptionUpdateMessage()
+            reconcile_row_pks = self._reconcile_row_pks
+            process_decoder = self._process_decoder_for(
+                len(table_update.row_operations) for table_update in message.table_updates
+            )
+        else:
+            event = message.event
+            args = event.arg_bytes
+            args_decoder = self.client_cache.reducer_bsatn_decoders.get(event.reducer)
+            if args_decoder is not None and len(args) > 0:
+                args = args_decoder(BsatnReader(args))
+            clientapi_message = TransactionUpdateMessage(
+                Identity.from_bytes(event.caller_identity),
+                Address.from_bytes(event.caller_address),
+                event.status,
+                event.message,
+                event.reducer,
+                args,
+            )
+
+        # rows to decode in the worker processes, per table
+        pending_rows = {} if process_decoder is not None else None
+        for table_update in message.table_updates:
+            table_name = table_update.table_name
+            cached_row_pks = (
+                reconcile_row_pks.get(table_name, ())
+                if reconcile_row_pks is not None
+                else ()
+            )
+            lazy_table_cache = self._lazy_table_cache(table_name)
+
+            for row_op, row_pk, row in table_update.row_operations:
+                if row_op == "insert" and row_pk in cached_row_pks:
+                    # already cached, decoding is deferred to _reconcile_subscription_update
+                    db_event = DbEvent(table_name, row_pk, row_op)
+                    db_event.raw_value = row
+                    clientapi_message.append_event(table_name, db_event)
+                elif row_op == "insert" and lazy_table_cache is not None:
+                    clientapi_message.append_event(
+                        table_name, _LazyDbEvent(table_name, row_pk, row, lazy_table_cache)
+                    )
+                elif (
+                    row_op == "insert"
+                    and pending_rows is not None
+                    and table_name in self.client_cache.tables
+                ):
+                    db_event = DbEvent(table_name, row_pk, row_op)
+                    pending_rows.setdefault(table_name, []).append((db_event, row))
+                    clientapi_message.append_event(table_name, db_event)
+                elif row_op == "insert":
+                    decoded_value = self.client_cache.decode_bsatn(table_name, row)
+                    clientapi_message.append_event(
+                        table_name,
+                        DbEvent(table_name, row_pk, row_op, decoded_value),
+                    )
+                else:
+                    clientapi_message.append_event(
+                        table_name, DbEvent(table_name, row_pk, row_op)
+                    )
+
+        if pending_rows:
+            process_decoder.decode_events(pending_rows, self.client_cache.tables)
+
+        return clientapi_message
+
+    def _do_update(self, max_seconds=None, max_events=None):
+        deadline = (
+            time.perf_counter() + max_seconds if max_seconds is not None else None
+        )
+        events_left = max_events
+
+        while True:
+            staged_update = self._staged_update
+            if staged_update is not None:
+                # a large SubscriptionUpdate is being applied, later messages wait until it is done
+                processed = staged_update.step(events_left, deadline)
+                if events_left is not None:
+                    events_left -= processed
+                for on_subscription_progress in self._on_subscription_progress:
+                    on_subscription_progress(staged_update.applied, staged_update.total)
+                if not staged_update.done:
+                    return
+
+                staged_update.swap()
+                self._staged_update = None
+                next_message = self._staged_message
+                self._staged_message = None
+
+                metrics = self.metrics
+                if metrics is not None:
+                    metrics.record("apply", staged_update.seconds)
+                    for table_name, table_events in next_message.events.items():
+                        metrics.record_table_events(table_name, table_events)
+                self._dispatch_callbacks(next_message, metrics, time.perf_counter())
+
+            if self.message_queue.empty():
+                return
+            if (deadline is not None and time.perf_counter() >= deadline) or (
+                events_left is not None and events_left <= 0
+            ):
+                return
+            if self._pause_update is not None and self._pause_update():
+                return
 
-    def _do_update(self):
-        while not self.message_queue.empty():
             next_message = self.message_queue.get()
 
+            metrics = self.metrics
+            if metrics is not None:
+                stage_started_at = time.perf_counter()
+                metrics.record_message(next_message.transaction_type)
+                if next_message.decode_finished_at is not None:
+                    metrics.record(
+                        "queue_wait", stage_started_at - next_message.decode_finished_at
+                    )
+
             if next_message.transaction_type == "IdentityReceived":
                 self.identity = next_message.identity
                 self.address = next_message.address
-                if self._on_identity:
+                # reconnects log in with the token the server issued
+                self._auth_token = next_message.auth_token
+                self._drop_reducer_calls(self._connection_number)
+                if self._reconnecting:
+                    self._on_reconnected()
+                elif self._on_identity:
                     self._on_identity(next_message.auth_token, self.identity, self.address)
-            else:
-                # print(f"next_message: {next_message.transaction_type}")
-                # apply all the event state before calling callbacks
-                for table_name, table_events in next_message.events.items():
-                    # first retrieve the old values for all events
-                    for db_event in table_events:
-                        # get the old value for sending callbacks
-                        db_event.old_value = self.client_cache.get_entry(
-                            db_event.table_name, db_event.row_pk
+                self._record_total(metrics, next_message)
+                continue
+
+            if (
+                next_message.transaction_type == "SubscriptionUpdate"
+                and self._reconcile_row_pks is not None
+            ):
+                self._reconcile_subscription_update(next_message)
+
+            apply_plans = self.client_cache.apply_plans
+            events = next_message.events
+            for table_name in list(events):
+                if table_name not in apply_plans:
+                    print(f"[_do_update] Error, table not found. ({table_name})")
+                    del events[table_name]
+
+            if next_message.transaction_type == "SubscriptionUpdate" and (
+                deadline is not None or events_left is not None
+            ):
+                # apply it in steps to copies of the tables, readers keep seeing the previous state
+                self._staged_update = StagedSubscriptionUpdate(self.client_cache, events)
+                self._staged_message = next_message
+                continue
+
+            # apply all the event state before calling callbacks
+            for table_name, table_events in events.items():
+                if events_left is not None:
+                    events_left -= len(table_events)
+                events[table_name] = apply_plans[table_name].apply(table_events)
+
+            if metrics is not None:
+                self._record_stage(metrics, "apply", stage_started_at)
+                for table_name, table_events in events.items():
+                    metrics.record_table_events(table_name, table_events)
+                stage_started_at = time.perf_counter()
+
+            self._dispatch_callbacks(next_message, metrics, stage_started_at if metrics is not None else None)
+
+    def _dispatch_callbacks(self, next_message, metrics, stage_started_at):
+        apply_plans = self.client_cache.apply_plans
+        events = next_message.events
+        transactions = ()
+        reducer_event = None
+        if next_message.transaction_type == "TransactionUpdate":
+            transactions = (next_message, *next_message.coalesced)
+            # row changes of coalesced transactions are reported with the last transaction's reducer event
+            reducer_event = transactions[-1].reducer_event
+
+        # now that we have applied the state we can call the callbacks
+        for table_name, table_events in events.items():
+            row_update_callbacks = apply_plans[table_name].row_update_callbacks
+            if row_update_callbacks:
+                for db_event in table_events:
+                    for row_update_callback in row_update_callbacks:
+                        row_update_callback(
+                            db_event.row_op,
+                            db_event.old_value,
+                            db_event.decoded_value,
+                            reducer_event,
                         )
 
-                    # if this table has a primary key, find table updates by looking for matching insert/delete events
-                    primary_key = getattr(
-                        self.client_cache.get_table_cache(table_name).table_class,
-                        "primary_key",
-                        None,
+        if metrics is not None:
+            stage_started_at = self._record_stage(
+                metrics, "row_update_callbacks", stage_started_at
+            )
+
+        # call table update callbacks once per table with all of the table's changes
+        for table_name, table_events in events.items():
+            table_update_callbacks = apply_plans[
+                table_name
+            ].table_update_callbacks
+            if table_update_callbacks:
+                inserts = []
+                updates = []
+                deletes = []
+                for db_event in table_events:
+                    if db_event.row_op == "insert":
+                        inserts.append(db_event.decoded_value)
+                    elif db_event.row_op == "update":
+                        updates.append(
+                            (db_event.old_value, db_event.decoded_value)
+                        )
+                    else:
+                        deletes.append(db_event.old_value)
+
+                for table_update_callback in table_update_callbacks:
+                    table_update_callback(
+                        inserts, updates, deletes, reducer_event
                     )
-                    # print(f"Primary key: {primary_key}")
-                    if primary_key is not None:
-                        primary_key_row_ops = {}
-
-                        for db_event in table_events:
-                            if db_event.row_op == "insert":
-                                # NOTE: we have to do look up in actual data dict because primary_key is a property of the table class
-                                primary_key_value = db_event.decoded_value.data[
-                                    primary_key
-                                ]
-                            else:
-                                primary_key_value = db_event.old_value.data[primary_key]
-
-                            if primary_key_value in primary_key_row_ops:
-                                other_db_event = primary_key_row_ops[primary_key_value]
-                                if (
-                                    db_event.row_op == "insert"
-                                    and other_db_event.row_op == "delete"
-                                ):
-                                    # this is a row update so we need to replace the insert
-                                    db_event.row_op = "update"
-                                    db_event.old_pk = other_db_event.row_pk
-                                    db_event.old_value = other_db_event.old_value
-                                    primary_key_row_ops[primary_key_value] = db_event
-                                elif (
-                                    db_event.row_op == "delete"
-                                    and other_db_event.row_op == "insert"
-                                ):
-                                    # the insert was the row update so just upgrade it to update
-                                    primary_key_row_ops[
-                                        primary_key_value
-                                    ].row_op = "update"
-                                    primary_key_row_ops[
-                                        primary_key_value
-                                    ].old_pk = db_event.row_pk
-                                    primary_key_row_ops[
-                                        primary_key_value
-                                    ].old_value = db_event.old_value
-                                else:
-                                    print(
-                                        f"Error: duplicate primary key {table_name}:{primary_key_value}"
-                                    )
-                            else:
-                                primary_key_row_ops[primary_key_value] = db_event
-
-                        table_events = primary_key_row_ops.values()
-                        next_message.events[table_name] = table_events
-
-                    # now we can apply the events to the cache
-                    for db_event in table_events:
-                        # print(f"db_event: {db_event.row_op} {table_name}")
-                        if db_event.row_op == "insert" or db_event.row_op == "update":
-                            # in the case of updates we need to delete the old entry
-                            if db_event.row_op == "update":
-                                self.client_cache.delete_entry(
-                                    db_event.table_name, db_event.old_pk
-                                )
-                            self.client_cache.set_entry_decoded(
-                                db_event.table_name,
-                                db_event.row_pk,
-                                db_event.decoded_value,
-                            )
-                        elif db_event.row_op == "delete":
-                            self.client_cache.delete_entry(
-                                db_event.table_name, db_event.row_pk
-                            )
-
-                # now that we have applied the state we can call the callbacks
-                for table_events in next_message.events.values():
-                    for db_event in table_events:
-                        # call row update callback
-                        if db_event.table_name in self._row_update_callbacks:
-                            reducer_event = (
-                                next_message.reducer_event
-                                if next_message.transaction_type == "TransactionUpdate"
-                                else None
-                            )
-                            for row_update_callback in self._row_update_callbacks[
-                                db_event.table_name
-                            ]:
-                                row_update_callback(
-                                    db_event.row_op,
-                                    db_event.old_value,
-                                    db_event.decoded_value,
-                                    reducer_event,
-                                )
-
-                if next_message.transaction_type == "SubscriptionUpdate":
-                    # call ontransaction callback
-                    for on_subscription_applied in self._on_subscription_applied:
-                        on_subscription_applied()
-
-                if next_message.transaction_type == "TransactionUpdate":
-                    # call on event callback
-                    for event_callback in self._on_event:
-                        event_callback(next_message)
-
-                    # call reducer callback
-                    reducer_event = next_message.reducer_event
-                    if reducer_event.reducer_name in self._reducer_callbacks:
-                        args = []
-                        decode_func = self.client_cache.reducer_cache[
-                            reducer_event.reducer_name
-                        ]
-
-                        args = decode_func(reducer_event.args)
-
-                        for reducer_callback in self._reducer_callbacks[
-                            reducer_event.reducer_name
-                        ]:
-                            reducer_callback(
-                                reducer_event.caller_identity,
-                                reducer_event.caller_address,
-                                reducer_event.status,
-                                reducer_event.message,
-                                *args,
-                            )
+
+        if metrics is not None:
+            stage_started_at = self._record_stage(
+                metrics, "table_update_callbacks", stage_started_at
+            )
+
+        if next_message.transaction_type == "SubscriptionUpdate":
+            # call ontransaction callback
+            for on_subscription_applied in self._on_subscription_applied:
+                on_subscription_applied()
+
+            if metrics is not None:
+                stage_started_at = self._record_stage(
+                    metrics, "subscription_applied_callbacks", stage_started_at
+                )
+
+        for transaction in transactions:
+            if (
+                self._sent_reducer_calls
+                and transaction.reducer_event.caller_identity == self.identity
+                and transaction.reducer_event.caller_address == self.address
+            ):
+                self._match_reducer_call(transaction)
+
+            # call on event callback
+            for event_callback in self._on_event:
+                event_callback(transaction)
+
+            if metrics is not None:
+                stage_started_at = self._record_stage(
+                    metrics, "event_callbacks", stage_started_at
+                )
+
+            # call reducer callback
+            reducer_event = transaction.reducer_event
+            if reducer_event.reducer_name in self._reducer_callbacks:
+                args = []
+                if self.protocol == "binary":
+                    # binary reducer args are decoded with the message
+                    args = reducer_event.args
+                else:
+                    decode_func = self.client_cache.reducer_cache[
+                        reducer_event.reducer_name
+                    ]
+
+                    args = decode_func(reducer_event.args)
+
+                for reducer_callback in self._reducer_callbacks[
+                    reducer_event.reducer_name
+                ]:
+                    reducer_callback(
+                        reducer_event.caller_identity,
+                        reducer_event.caller_address,
+                        reducer_event.status,
+                        reducer_event.message,
+                        *args,
+                    )
+
+                if metrics is not None:
+                    stage_started_at = self._record_stage(
+                        metrics, "reducer_callbacks", stage_started_at
+                    )
+
+        self._record_total(metrics, next_message)
+
+    def _record_total(self, metrics, next_message):
+        if metrics is not None and next_message.decode_started_at is not None:
+            metrics.record("total", time.perf_counter() - next_message.decode_started_at)
+
+    def _record_stage(self, metrics, stage, stage_started_at):
+        now = time.perf_counter()
+        metrics.record(stage, now - stage_started_at)
+        return now
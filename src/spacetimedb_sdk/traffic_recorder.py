@@ -0,0 +1,184 @@
+""" Record inbound websocket traffic and replay it offline.
+
+A recording holds every raw frame the server sent, with the time it arrived, so a production
+session can be fed through the SDK again without a network: to reproduce a slowdown, or to
+compare SDK changes on a real workload.
+
+File layout:
+
+    magic (8 bytes) | header length (u32) | header (JSON) | frames...
+
+The header holds the websocket subprotocol and the wall clock start time. Each frame is
+stored as: seconds since the start of the recording (f64) | opcode (u8, 1 text, 2 binary) |
+payload length (u32) | payload, with text frames encoded as UTF-8.
+
+Recordings contain everything the server sent, including the auth token of the session.
+
+Example:
+
+    client.start_recording("session.rec")
+    ...
+    client.stop_recording()
+
+    client = SpacetimeDBClient(module_bindings)
+    print(replay_recording(client, "session.rec"))
+"""
+
+import json
+import struct
+import threading
+import time
+
+from spacetimedb_sdk.binary_protocol import BINARY_PROTOCOL
+
+RECORDING_MAGIC = b"STDBREC1"
+
+_HEADER_LENGTH = struct.Struct("<I")
+_FRAME = struct.Struct("<dBI")
+_OPCODE_TEXT = 1
+_OPCODE_BINARY = 2
+
+
+class TrafficRecorder:
+    """
+    Appends inbound frames to a recording file.
+
+    Args:
+        path (str): The recording file path. An existing file is overwritten.
+        protocol (str, optional): The websocket subprotocol of the recorded connection.
+    """
+
+    def __init__(self, path, protocol=None):
+        self.path = path
+        self.frames_recorded = 0
+        self.bytes_recorded = 0
+        self._lock = threading.Lock()
+        self._started_at = time.perf_counter()
+
+        header = json.dumps({"protocol": protocol, "started_at": time.time()}).encode(
+            "utf-8"
+        )
+        self._file = open(path, "wb")
+        self._file.write(RECORDING_MAGIC)
+        self._file.write(_HEADER_LENGTH.pack(len(header)))
+        self._file.write(header)
+
+    def record(self, frame):
+        """
+        Append a frame, as received from the socket (str for text, bytes for binary frames).
+        """
+        timestamp = time.perf_counter() - self._started_at
+        if isinstance(frame, str):
+            opcode = _OPCODE_TEXT
+            payload = frame.encode("utf-8")
+        else:
+            opcode = _OPCODE_BINARY
+            payload = bytes(frame)
+
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(_FRAME.pack(timestamp, opcode, len(payload)))
+            self._file.write(payload)
+            self.frames_recorded += 1
+            self.bytes_recorded += len(payload)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def is_recording(path):
+    """
+    Returns True if the file starts with the recording magic.
+    """
+    with open(path, "rb") as f:
+        return f.read(len(RECORDING_MAGIC)) == RECORDING_MAGIC
+
+
+def read_recording(path):
+    """
+    Read a recording file.
+
+    Args:
+        path (str): The recording file path.
+
+    Returns:
+        Tuple[dict, List[Tuple[float, str | bytes]]]: The header and the (timestamp, frame) tuples in arrival order.
+
+    Raises:
+        ValueError: If the file is not a recording.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if data[: len(RECORDING_MAGIC)] != RECORDING_MAGIC:
+        raise ValueError(f"{path} is not a SpacetimeDB traffic recording")
+
+    offset = len(RECORDING_MAGIC)
+    (header_length,) = _HEADER_LENGTH.unpack_from(data, offset)
+    offset += _HEADER_LENGTH.size
+    header = json.loads(data[offset : offset + header_length])
+    offset += header_length
+
+    frames = []
+    while offset + _FRAME.size <= len(data):
+        timestamp, opcode, length = _FRAME.unpack_from(data, offset)
+        offset += _FRAME.size
+        payload = data[offset : offset + length]
+        if len(payload) < length:
+            # the recording was cut off mid frame
+            break
+        offset += length
+        frame = payload.decode("utf-8") if opcode == _OPCODE_TEXT else payload
+        frames.append((timestamp, frame))
+
+    return header, frames
+
+
+def replay_recording(client, path, realtime=False, speed=1.0, apply=True):
+    """
+    Feed a recording through a SpacetimeDBClient without a network connection.
+
+    Frames are decoded with client._on_message and, if apply is True, applied to the cache with
+    update() after each frame so row update callbacks run as they would live. The client
+    protocol is switched to the protocol of the recording.
+
+    Args:
+        client (SpacetimeDBClient): The client to replay into. It should not be connected.
+        path (str): The recording file path.
+        realtime (bool, optional): Wait between frames as long as the recorded connection did, divided by speed.
+            Default: False (as fast as possible)
+        speed (float, optional): Replay speed multiplier when realtime is True. Default: 1.0
+        apply (bool, optional): Apply the decoded messages to the client cache. Default: True
+
+    Returns:
+        dict: frames, bytes, seconds and frames_per_second of the replay.
+    """
+    header, frames = read_recording(path)
+    binary = header.get("protocol") == BINARY_PROTOCOL or (
+        frames and isinstance(frames[0][1], bytes)
+    )
+    client.protocol = "binary" if binary else "text"
+
+    total_bytes = 0
+    start = time.perf_counter()
+    for timestamp, frame in frames:
+        if realtime:
+            delay = timestamp / speed - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        client._on_message(frame)
+        if apply:
+            client.update()
+        total_bytes += len(frame)
+    seconds = time.perf_counter() - start
+
+    return {
+        "frames": len(frames),
+        "bytes": total_bytes,
+        "seconds": seconds,
+        "frames_per_second": len(frames) / seconds if seconds > 0 else None,
+    }